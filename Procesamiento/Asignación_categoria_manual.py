@@ -1,7 +1,7 @@
 import pandas as pd
 
 # Cargar tu archivo
-df = pd.read_csv("./Datos_extraidos\Datos_procesados/amazon_con_categorias.csv")  # Cambia por tu archivo
+df = pd.read_csv("./Datos_extraidos/Datos_procesados/amazon_con_categorias.csv")  # Cambia por tu archivo
 
 # Lista de categorías generales a asignar (puedes ampliar)
 categorias = [
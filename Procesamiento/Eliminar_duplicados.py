@@ -1,4 +1,5 @@
 import pandas as pd
+from duplicados import agrupar_duplicados
 
 # Carga ambos CSV
 df1 = pd.read_csv('./Datos_extraidos/aliexpress_productos.csv')
@@ -7,15 +8,18 @@ df2 = pd.read_csv('./Datos_extraidos/merged_unique.csv')
 # Concatena
 df = pd.concat([df1, df2], ignore_index=True)
 
-# Elimina duplicados. 
-# Por defecto comprueba todas las columnas:
-df_unique = df.drop_duplicates()
+# Elimina duplicados exactos (todas las columnas iguales)
+df = df.drop_duplicates(ignore_index=True)
 
-# Si prefieres usar solo ciertas columnas como clave,
-# usa e.g. subset=['asin'] o subset=['title', 'price']:
-# df_unique = df.drop_duplicates(subset=['asin'])
+# Casi duplicados: mismo producto con otro precio o con el título retocado.
+# Se comparan los títulos dentro de cada categoría y marketplace (si existen esas columnas)
+columna_titulo = 'title' if 'title' in df.columns else 'name'
+grupos = agrupar_duplicados(df, columna_titulo, umbral=0.8)
+df_unique = df[grupos['canonica'] == df.index]
 
-# Guarda el resultado
+# Guarda el resultado y, para revisarlos, los grupos con más de una fila
 df_unique.to_csv('merged_unique.csv', index=False)
+df.join(grupos)[grupos['tamano'] > 1].sort_values('grupo').to_csv('merged_duplicados.csv', index=False)
 
-print(f"Total original: {len(df)}, tras eliminar duplicados: {len(df_unique)}")
+print(f"Total original: {len(df1) + len(df2)}, sin duplicados exactos: {len(df)}, "
+      f"tras eliminar casi duplicados: {len(df_unique)}")
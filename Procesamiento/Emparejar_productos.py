@@ -0,0 +1,16 @@
+import pandas as pd
+from emparejamiento import emparejar
+
+df = pd.read_csv("./dataset_competencia.csv")
+
+# Para cada producto, los 3 más parecidos de cada otro marketplace de su misma categoría
+matches = emparejar(df, columna='title', bloque='category', k=3, umbral=0.3)
+
+# Títulos y precios de ambos lados, para comparar precios entre marketplaces
+matches = matches.merge(df[['title', 'price']], left_on='indice', right_index=True)
+matches = matches.merge(df[['title', 'price']].add_suffix('_match'), left_on='indice_match', right_index=True)
+matches = matches.sort_values(['indice', 'marketplace_match', 'rango'])
+
+matches.to_csv("./emparejamientos.csv", index=False)
+
+print(f"Productos: {len(df)}, con algún match: {matches['indice'].nunique()}, pares: {len(matches)}")
@@ -1,49 +1,164 @@
+import argparse
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-
-# Leer los datos
-df = pd.read_csv("./Datos_extraidos/Datos_procesados/mercado_libre_con_categorias.csv")
-
-# 1. Limpieza de datos - Convertir precios a numéricos
-def limpiar_precio(precio):
-    if pd.isna(precio):
-        return None
-    try:
-        # Reemplazar puntos y comas según el formato
-        if isinstance(precio, str):
-            precio = precio.replace('.', '').replace(',', '.')
-        return float(precio)
-    except:
-        return None
-
-df['price'] = df['price'].apply(limpiar_precio)
-
-# 2. Función mejorada para estimar ventas
-def estimar_ventas(row):
-    try:
-        # Base: inversamente proporcional a la posición
-        ventas_base = 1000 / row['position']
-        
-        # Ajustar por reseñas si están disponibles
-        if pd.notna(row['reviews_count']):
-            ventas_base *= (1 + row['reviews_count'] / 100)
+from scipy.optimize import minimize_scalar
+from parseo_valores import LOCALES, parsear_conteo, parsear_precio, parsear_vendidos
+
+# Mercado Libre no publica cuántas unidades vende cada producto, solo su
+# posición en la lista de más vendidos y el número de reseñas. Las ventas se
+# estiman con
+#
+#     ventas = base / posición * (1 + reseñas / escala_resenas)    con reseñas
+#     ventas = base / posición * factor_sin_resenas                sin reseñas
+#
+# redondeado al entero más cercano (a par en los empates, como round), y 0 si
+# el resultado no es un número finito (posición 0 o faltante, reseñas no
+# numéricas...). Los parámetros por defecto son los que se usaron siempre y se
+# pueden ajustar con los marketplaces que sí muestran ventas (calibrar).
+
+# Tope de escala_resenas al calibrar: si las reseñas no explican las ventas la
+# escala se va al tope, es decir, las reseñas casi no cuentan
+MAX_ESCALA_RESENAS = 1e7
+
+
+class ModeloVentas:
+    """Estimador de ventas a partir de la posición en el ranking y las reseñas.
+
+        modelo = ModeloVentas()
+        df['sold'] = modelo.score(df)          # columnas 'position' y 'reviews_count'
+        modelo.calibrar(observadas)            # ajusta los factores con ventas conocidas
+    """
+
+    def __init__(self, base=1000, escala_resenas=100, factor_sin_resenas=0.7,
+                 posicion='position', resenas='reviews_count'):
+        self.base = base
+        self.escala_resenas = escala_resenas
+        self.factor_sin_resenas = factor_sin_resenas
+        self.posicion = posicion
+        self.resenas = resenas
+
+    def __repr__(self):
+        return (f'ModeloVentas(base={self.base:.6g}, escala_resenas={self.escala_resenas:.6g}, '
+                f'factor_sin_resenas={self.factor_sin_resenas:.6g})')
+
+    def _columnas(self, df):
+        posicion = pd.to_numeric(df[self.posicion], errors='coerce').to_numpy(dtype=float)
+        resenas = pd.to_numeric(df[self.resenas], errors='coerce').to_numpy(dtype=float)
+        con_resenas = df[self.resenas].notna().to_numpy()
+        # Reseñas presentes pero no numéricas: la fórmula no se puede aplicar
+        posicion[con_resenas & np.isnan(resenas)] = np.nan
+        return posicion, resenas, con_resenas
+
+    def estimar(self, df):
+        """Ventas estimadas sin redondear (float; NaN o inf donde la fórmula no da un número)."""
+        posicion, resenas, con_resenas = self._columnas(df)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # Mismo orden de operaciones que la versión fila por fila, para dar los mismos floats
+            ventas = self.base / posicion
+            ventas *= np.where(con_resenas, 1 + resenas / self.escala_resenas, self.factor_sin_resenas)
+        return ventas
+
+    def score(self, df):
+        """Ventas estimadas de cada fila como enteros (int64), con el mismo índice que `df`."""
+        ventas = np.rint(self.estimar(df))
+        validas = np.isfinite(ventas) & (np.abs(ventas) < 2.0 ** 63)
+        return pd.Series(np.where(validas, ventas, 0).astype(np.int64), index=df.index, name='sold')
+
+    def calibrar(self, df, ventas='sold'):
+        """Ajusta los parámetros a las ventas observadas de `df` y devuelve el propio modelo.
+
+        El ajuste es por mínimos cuadrados en escala logarítmica (errores
+        relativos), con las filas de ventas y posición positivas: base y
+        escala_resenas con las filas que tienen reseñas, factor_sin_resenas
+        con las que no. Si no hay filas de un tipo, esos parámetros quedan
+        como estaban.
+        """
+        posicion, resenas, con_resenas = self._columnas(df)
+        observadas = pd.to_numeric(df[ventas], errors='coerce').to_numpy(dtype=float)
+        utiles = (observadas > 0) & (posicion > 0) & np.isfinite(observadas) & np.isfinite(posicion)
+        # log(ventas * posición) = log(base) + log(factor de reseñas)
+        objetivo = np.log(observadas[utiles]) + np.log(posicion[utiles])
+        con_resenas = con_resenas[utiles]
+        resenas = resenas[utiles]
+
+        y, r = objetivo[con_resenas], resenas[con_resenas]
+        if len(y) and (r > 0).any():
+            def error(log_escala):
+                x = np.log1p(r / np.exp(log_escala))
+                return np.square(y - x - np.mean(y - x)).sum()
+            # Para cada escala, la mejor base es la media de los residuos: se busca solo la escala
+            log_escala = minimize_scalar(error, bounds=(0, np.log(MAX_ESCALA_RESENAS)), method='bounded').x
+            self.escala_resenas = float(np.exp(log_escala))
+            self.base = float(np.exp(np.mean(y - np.log1p(r / self.escala_resenas))))
+        elif len(y):
+            self.base = float(np.exp(np.mean(y - np.log1p(r / self.escala_resenas))))
+
+        y = objetivo[~con_resenas]
+        if len(y):
+            self.factor_sin_resenas = float(np.exp(np.mean(y)) / self.base)
+        return self
+
+
+def ventas_observadas(aliexpress, amazon):
+    """Ventas conocidas para calibrar: AliExpress ("325 sold") y Amazon ("8 K+ comprados el mes pasado").
+
+    Las listas están ordenadas de más a menos vendido, así que la posición es el orden en el archivo.
+    AliExpress no tiene reseñas. Los productos sin dato de ventas se descartan.
+    """
+    partes = []
+    for ruta, columna, locale in [(aliexpress, 'sold', 'AliExpress'), (amazon, 'sales', 'Amazon')]:
+        # Como texto, para que los separadores de miles lleguen al parseo
+        df = pd.read_csv(ruta, dtype={'reviews': str, columna: str})
+        obs = pd.DataFrame({'position': np.arange(1, len(df) + 1)}, index=df.index)
+        if 'reviews' in df.columns:
+            obs['reviews_count'] = parsear_conteo(df['reviews'], miles=LOCALES[locale]['miles'])
         else:
-            ventas_base *= 0.7  # Factor para productos sin reseñas
-        
-        return round(ventas_base)
-    except:
-        return 0  # Valor por defecto si hay error
+            obs['reviews_count'] = np.nan
+        obs['sold'] = parsear_vendidos(df[columna])
+        obs['marketplace'] = locale
+        partes.append(obs[df[columna].notna()])
+    return pd.concat(partes, ignore_index=True)
+
+
+def inferir_ventas(entrada, salida, modelo=None):
+    """Agrega a los productos de Mercado Libre la columna 'sold' estimada con `modelo`."""
+    modelo = modelo or ModeloVentas()
+
+    # Leer los datos. Precio y reseñas como texto: si no, pandas lee "84.900" como 84.9
+    # (cuando ningún valor tiene dos separadores) y el separador de miles se pierde
+    df = pd.read_csv(entrada, dtype={'price': str, 'reviews_count': str})
+
+    # 1. Limpieza de datos - Convertir precios ("84.900") y reseñas a numéricos
+    df['price'] = parsear_precio(df['price'], **LOCALES['Mercado Libre'])
+    df['reviews_count'] = parsear_conteo(df['reviews_count'], miles=LOCALES['Mercado Libre']['miles'])
+
+    # 2. Ventas estimadas, todas las filas de una vez
+    df['sold'] = modelo.score(df)
+
+    # Renombrar columnas para coincidir con tu estructura deseada
+    df = df.rename(columns={
+        'reviews_count': 'reviews'
+    })
+
+    # Filtrar y reordenar columnas como lo necesitas
+    df_transformado = df[["title", "price", "reviews", "sold", "rating", "category"]]
+
+    # Exportar a nuevo CSV
+    df_transformado.to_csv(salida, index=False)
 
-# Agregar columna de ventas estimadas
-df['sold'] = df.apply(estimar_ventas, axis=1)
 
-# Renombrar columnas para coincidir con tu estructura deseada
-df = df.rename(columns={
-    'reviews_count': 'reviews'
-})
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Estima las ventas de los productos de Mercado Libre')
+    parser.add_argument('--calibrar', action='store_true',
+                        help='Ajusta los factores con las ventas de AliExpress y Amazon en vez de usar los de siempre')
+    args = parser.parse_args()
 
-# Filtrar y reordenar columnas como lo necesitas
-df_transformado = df[["title", "price", "reviews", "sold", "rating", "category"]]
+    modelo = ModeloVentas()
+    if args.calibrar:
+        modelo.calibrar(ventas_observadas('./Datos_extraidos/aliexpress_productos_mas_vendidos.csv',
+                                          './Datos_extraidos/amazon_productos_mas_vendidos.csv'))
+    print(modelo)
 
-# Exportar a nuevo CSV
-df_transformado.to_csv("mercado_libre_con_categorias_y_ventas.csv", index=False)
\ No newline at end of file
+    # Lista cruda de Mercado Libre: trae la posición en el ranking y las reseñas
+    inferir_ventas('./Datos_extraidos/mercado_libre_productos_mas_vendidos.csv',
+                   'mercado_libre_con_categorias_y_ventas.csv', modelo)
@@ -1,15 +1,31 @@
 import pandas as pd
 
-# Cargar el dataset (ajusta el nombre del archivo según corresponda)
-df = pd.read_csv("./Datos_extraidos\Datos_procesados\mercado_libre_con_categorias.csv")
+# Columnas de los datasets por marketplace, en orden (las que existan)
+COLUMNAS = ['title', 'price', 'discount', 'reviews', 'sold', 'rating', 'category']
 
-# Eliminar la columna original 'name' y renombrar 'name_es' como 'name'
-df = df.drop(columns=['category']).rename(columns={'categoria_ml': 'category'})
-df = df.drop(columns={'asin'})
-df = df.rename(columns={'sales': 'sold'})
 
-# Reordenar columnas si lo deseas
-df = df[['title', 'price', 'reviews', 'sold', 'rating', 'category']]
+def reasignar_nombres(entrada, salida):
+    """Lleva un dataset a los nombres de columna comunes (title, sold, category, ...)."""
+    df = pd.read_csv(entrada)
 
-# Guardar el resultado
-df.to_csv("aliexpress_con_categorias.csv", index=False)
+    # Eliminar la columna original 'name' y usar el título traducido 'name_es'
+    if 'name_es' in df.columns:
+        df = df.drop(columns=[c for c in ('name', 'title') if c in df.columns]).rename(columns={'name_es': 'title'})
+    df = df.rename(columns={'name': 'title', 'sales': 'sold'})
+
+    # La categoría corregida a mano ('categoria_ml') reemplaza a la asignada automáticamente
+    if 'categoria_ml' in df.columns:
+        df = df.drop(columns=['category']).rename(columns={'categoria_ml': 'category'})
+    df = df.drop(columns=['asin'], errors='ignore')
+
+    # Reordenar columnas
+    df = df[[c for c in COLUMNAS if c in df.columns]]
+
+    # Guardar el resultado
+    df.to_csv(salida, index=False)
+
+
+if __name__ == '__main__':
+    # Ajusta el nombre de los archivos según corresponda
+    reasignar_nombres("./Datos_extraidos/Datos_procesados/mercado_libre_con_categorias.csv",
+                      "aliexpress_con_categorias.csv")
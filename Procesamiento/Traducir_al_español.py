@@ -1,11 +1,31 @@
-from deep_translator import GoogleTranslator
+import argparse
 import pandas as pd
+from traduccion import BACKENDS, RUTA_CACHE, CacheTraducciones, traducir
 
-# Cargar tus datasets
-aliexpress = pd.read_csv('./Datos_extraidos/aliexpress_productos_mas_vendidos.csv')
 
-# Traducir los títulos al español
-aliexpress['name_es'] = aliexpress['name'].astype(str).apply(lambda x: GoogleTranslator(source='auto', target='es').translate(x))
+def traducir_titulos(entrada, salida, backend='google', cache=RUTA_CACHE, workers=4, por_segundo=5):
+    """Agrega la columna name_es con los títulos de AliExpress traducidos al español."""
+    # Cargar tus datasets
+    aliexpress = pd.read_csv(entrada)
 
-# Guardar el resultado en un nuevo CSV
-aliexpress.to_csv('aliexpress_traducido.csv', index=False)
\ No newline at end of file
+    # Traducir los títulos al español (solo los que no están en el caché)
+    traductor = BACKENDS[backend](origen='auto', destino='es')
+    with CacheTraducciones(cache) as c:
+        aliexpress['name_es'] = traducir(aliexpress['name'].astype(str), traductor, c,
+                                         workers=workers, por_segundo=por_segundo)
+
+    # Guardar el resultado en un nuevo CSV
+    aliexpress.to_csv(salida, index=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Traduce al español los títulos de AliExpress')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='google',
+                        help='offline: sin red, para pruebas')
+    parser.add_argument('--cache', default=RUTA_CACHE, help='Archivo SQLite con las traducciones ya hechas')
+    parser.add_argument('--workers', type=int, default=4, help='Lotes traducidos en paralelo')
+    parser.add_argument('--por-segundo', type=float, default=5, help='Máximo de solicitudes por segundo')
+    args = parser.parse_args()
+
+    traducir_titulos('./Datos_extraidos/aliexpress_productos_mas_vendidos.csv', 'aliexpress_traducido.csv',
+                     args.backend, args.cache, args.workers, args.por_segundo)
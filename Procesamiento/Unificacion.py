@@ -1,26 +1,43 @@
 import pandas as pd
+from datasets import COMPETENCIA, FILAS_POR_LOTE, MODELO, Escritor, lotes
 
-df = pd.read_csv("./dataset_competencia.csv")
 
-# --- Limpieza y transformación ---
+def transformar(df):
+    """Columnas del modelo para un lote; cada fila se transforma por separado, así que da igual cómo se parta el dataset."""
+    # --- Limpieza y transformación ---
 
-# 1. Quitar símbolo de moneda y convertir a numérico (COP ya convertido)
-df['price'] = df['price'].astype(float)
+    # 1. Quitar símbolo de moneda y convertir a numérico (COP ya convertido)
+    df['price'] = df['price'].astype(float)
 
-# 2. Asegurar que las columnas numéricas estén bien formateadas
-df['sold'] = df['sold'].astype(int)
+    # 2. Asegurar que las columnas numéricas estén bien formateadas
+    df['sold'] = df['sold'].astype(int)
 
-# 3. Discretización (crear nuevas columnas categóricas)
+    # 3. Discretización (crear nuevas columnas categóricas)
 
-# Ventas
-df['sold_level'] = pd.cut(df['sold'], 
-    bins=[-1, 103, 1000, float('inf')], 
-    labels=['Bajo', 'Medio', 'Alto'])
+    # Ventas
+    df['sold_level'] = pd.cut(df['sold'], 
+        bins=[-1, 103, 1000, float('inf')], 
+        labels=['Bajo', 'Medio', 'Alto'])
 
 
-df_modelo = df[['price', 'rating', 'discount', 'category', 'marketplace', 'sold_level']]
+    df_modelo = df[['price', 'rating', 'discount', 'category', 'marketplace', 'sold_level']]
 
-# Eliminar filas con valores faltantes (por cortesía de discretización)
-df_modelo = df_modelo.dropna()
+    # Eliminar filas con valores faltantes (por cortesía de discretización)
+    df_modelo = df_modelo.dropna()
+    return df_modelo
 
-df_modelo.to_csv("./dataset_competencia_modelo2.csv", index=False)
\ No newline at end of file
+
+def preparar_modelo(entrada, salida, filas_por_lote=FILAS_POR_LOTE):
+    """Dataset para el modelo: precio, rating, descuento, categoría, marketplace y nivel de ventas.
+
+    Se lee, transforma y escribe por lotes de `filas_por_lote` filas, sin cargar el dataset completo.
+    """
+    # Solo las columnas que se usan, ya con sus tipos
+    columnas = ['price', 'rating', 'discount', 'sold', 'category', 'marketplace']
+    with Escritor(salida, MODELO) as escritor:
+        for df in lotes(entrada, columnas=columnas, esquema=COMPETENCIA, filas_por_lote=filas_por_lote):
+            escritor.escribir(transformar(df))
+
+
+if __name__ == '__main__':
+    preparar_modelo("./dataset_competencia.csv", "./dataset_competencia_modelo2.csv")
@@ -0,0 +1,117 @@
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Asignación de categoría por palabras clave para columnas completas de títulos.
+#
+# Las palabras clave (los nombres de las categorías y sus sinónimos) se unen en
+# una sola expresión regular que Arrow evalúa con RE2, un autómata que recorre
+# cada título una vez sin importar cuántas palabras haya. Para respetar la
+# prioridad se busca, por bisección, la mejor categoría que aparece en cada
+# título: "¿aparece alguna palabra de las k mejores categorías?" se pregunta con
+# una sola expresión, así que hacen falta unas log2(categorías) pasadas sobre la
+# columna. Por defecto el resultado es el mismo que el del bucle original: la
+# primera categoría de la lista cuyo nombre (en minúsculas) aparece como
+# subcadena del título, u 'otros'.
+
+# Carácter que no es de palabra (como \W de Python: letras, números y _ son de palabra)
+NO_PALABRA = r'[^\pL\pN_]'
+
+
+def plegar_acentos(texto):
+    """'Pájaros Pequeños' -> 'Pajaros Pequenos'."""
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+class Categorizador:
+    """Asigna a cada texto la categoría de mayor prioridad cuyas palabras clave aparecen en él.
+
+    - categorias: nombres en orden de prioridad (la primera gana); cada nombre es
+      también su propia palabra clave.
+    - sinonimos: {categoria: [palabras clave adicionales]}.
+    - prioridades: {categoria: número}; menor gana. Las que no figuran usan su
+      posición en `categorias`, y los empates se resuelven por esa posición.
+    - plegar_acentos: comparar sin tildes ("pajaro" encuentra "pájaro").
+    - limites_palabra: exigir palabras completas ("aves" ya no coincide en "llaves").
+    """
+
+    def __init__(self, categorias, sinonimos=None, prioridades=None, plegar_acentos=False,
+                 limites_palabra=False, defecto='otros'):
+        self.categorias = list(categorias)
+        self.plegar = plegar_acentos
+        self.limites_palabra = limites_palabra
+        self.defecto = defecto
+        prioridades = prioridades or {}
+        sinonimos = sinonimos or {}
+        orden = sorted(range(len(self.categorias)),
+                       key=lambda i: (prioridades.get(self.categorias[i], i), i))
+        # Un nivel por categoría, de mayor a menor prioridad, con sus palabras normalizadas
+        self._niveles = []
+        self._categoria_nivel = []
+        for i in orden:
+            categoria = self.categorias[i]
+            palabras = {self._normalizar(p) for p in [categoria] + list(sinonimos.get(categoria, []))}
+            palabras.discard('')
+            if palabras:
+                self._niveles.append(sorted(palabras))
+                self._categoria_nivel.append(categoria)
+        self._patrones = {}
+
+    def _normalizar(self, texto):
+        texto = texto.lower()
+        return plegar_acentos(texto) if self.plegar else texto
+
+    def _patron(self, nivel):
+        """Expresión RE2 que encuentra cualquier palabra de los niveles 0..nivel."""
+        if nivel not in self._patrones:
+            alternativas = '|'.join(re.escape(p) for palabras in self._niveles[:nivel + 1] for p in palabras)
+            if self.limites_palabra:
+                # Solo se pregunta si hay coincidencia, así que los vecinos se pueden consumir
+                self._patrones[nivel] = f'(?:^|{NO_PALABRA})(?:{alternativas})(?:$|{NO_PALABRA})'
+            else:
+                self._patrones[nivel] = alternativas
+        return self._patrones[nivel]
+
+    def _aparece(self, textos, nivel):
+        return pc.match_substring_regex(textos, self._patron(nivel)).to_numpy(zero_copy_only=False)
+
+    def _mejores_niveles(self, textos):
+        """Nivel de la mejor categoría presente en cada texto (len(niveles) si no hay ninguna)."""
+        total = len(self._niveles)
+        bajo = np.zeros(len(textos), dtype=np.int64)
+        alto = np.full(len(textos), total, dtype=np.int64)
+        if total == 0:
+            return alto
+        # El mejor nivel de cada fila está en [bajo, alto]; alto == total: ninguno
+        pendientes = np.nonzero(self._aparece(textos, total - 1))[0]
+        alto[pendientes] = total - 1
+        pendientes = pendientes[bajo[pendientes] < alto[pendientes]]
+        while len(pendientes):
+            medios = (bajo[pendientes] + alto[pendientes]) // 2
+            for medio in np.unique(medios):
+                filas = pendientes[medios == medio]
+                aparece = self._aparece(textos.take(pa.array(filas)), medio)
+                alto[filas[aparece]] = medio
+                bajo[filas[~aparece]] = medio + 1
+            pendientes = pendientes[bajo[pendientes] < alto[pendientes]]
+        return alto
+
+    def asignar(self, serie):
+        """Categoría de cada texto de una columna (`defecto` si no es texto o no coincide ninguna)."""
+        textos = serie.astype(object).str.lower()
+        if self.plegar:
+            textos = textos.map(plegar_acentos, na_action='ignore')
+        son_texto = textos.notna().to_numpy()
+        niveles = self._mejores_niveles(pa.array(textos[son_texto].tolist(), type=pa.string()))
+        categorias = np.array(self._categoria_nivel + [self.defecto], dtype=object)
+        salida = np.full(len(serie), self.defecto, dtype=object)
+        salida[son_texto] = categorias[niveles]
+        return pd.Series(salida, index=serie.index, name=serie.name, dtype=object)
+
+    def categoria(self, texto):
+        """Categoría de un texto."""
+        return self.asignar(pd.Series([texto], dtype=object)).iloc[0]
@@ -0,0 +1,144 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+# Lectura y escritura de los datasets intermedios del procesamiento.
+#
+# Los intermedios se guardan en Parquet con un esquema explícito (precio
+# float, vendidos y descuento enteros, categoría y marketplace como
+# diccionario), así la etapa siguiente no vuelve a parsear texto ni a adivinar
+# tipos y puede leer solo las columnas que usa. La extensión decide el
+# formato: .parquet o .csv (para los entregables y los archivos de siempre).
+#
+# Se lee con lotes() y se escribe con Escritor, por partes de tamaño acotado:
+# nunca está el archivo completo en memoria, así que la memoria no crece con
+# el catálogo.
+
+CATEGORICA = pa.dictionary(pa.int32(), pa.string())
+# Niveles con orden (Bajo < Medio < Alto), como los que arma pd.cut
+NIVELES = pa.dictionary(pa.int32(), pa.string(), ordered=True)
+
+# Un producto limpio de cualquier marketplace (salida de limpieza.py)
+COMPETENCIA = pa.schema([
+    ('title', pa.string()),
+    ('price', pa.float64()),
+    ('discount', pa.int64()),
+    ('sold', pa.int64()),
+    ('rating', pa.float64()),
+    ('category', CATEGORICA),
+    ('marketplace', CATEGORICA),
+])
+
+# Dataset del modelo (salida de Unificacion.py)
+MODELO = pa.schema([
+    ('price', pa.float64()),
+    ('rating', pa.float64()),
+    ('discount', pa.int64()),
+    ('category', CATEGORICA),
+    ('marketplace', CATEGORICA),
+    ('sold_level', NIVELES),
+])
+
+ESQUEMAS = {'competencia': COMPETENCIA, 'modelo': MODELO}
+
+FILAS_POR_LOTE = 100_000
+# Para leer CSV con Arrow el tamaño de bloque va en bytes: se estima por fila
+BYTES_POR_FILA = 256
+
+
+def es_parquet(ruta):
+    return os.path.splitext(ruta)[1].lower() == '.parquet'
+
+
+def _opciones_csv(columnas, esquema):
+    tipos = {campo.name: campo.type for campo in esquema} if esquema is not None else None
+    # Celdas vacías como faltantes, igual que pd.read_csv
+    return pv.ConvertOptions(column_types=tipos, include_columns=columnas, strings_can_be_null=True)
+
+
+def lotes(ruta, columnas=None, esquema=None, filas_por_lote=FILAS_POR_LOTE):
+    """Genera el dataset como DataFrames de unas `filas_por_lote` filas.
+
+    Parquet se lee por lotes con sus tipos. Un CSV con esquema se lee con el
+    lector incremental de Arrow (bloques de tamaño aproximado); sin esquema, con
+    pd.read_csv por partes, así cada lote se interpreta igual que con pd.read_csv.
+    """
+    if es_parquet(ruta):
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=filas_por_lote, columns=columnas):
+            yield lote.to_pandas()
+    elif esquema is None:
+        with pd.read_csv(ruta, usecols=columnas, chunksize=filas_por_lote) as lector:
+            yield from lector
+    else:
+        lector = pv.open_csv(ruta, read_options=pv.ReadOptions(block_size=BYTES_POR_FILA * filas_por_lote),
+                             convert_options=_opciones_csv(columnas, esquema))
+        for lote in lector:
+            yield lote.to_pandas()
+
+
+class Escritor:
+    """Escribe un dataset lote a lote (Parquet o CSV según la extensión), con el esquema dado.
+
+        with Escritor('salida.parquet', COMPETENCIA) as escritor:
+            for df in lotes(...):
+                escritor.escribir(df)
+    """
+
+    def __init__(self, ruta, esquema):
+        self.ruta = ruta
+        self.esquema = esquema
+        self.filas = 0
+        self._parquet = None
+        self._csv = None
+
+    def __enter__(self):
+        if es_parquet(self.ruta):
+            self._parquet = pq.ParquetWriter(self.ruta, self.esquema, compression='zstd')
+        else:
+            self._csv = open(self.ruta, 'w', encoding='utf-8', newline='')
+            self._csv.write(','.join(self.esquema.names) + '\n')
+        return self
+
+    def _tabla(self, df):
+        """El lote convertido al esquema, para que la salida no dependa de cómo se partió la entrada.
+
+        pd.read_csv infiere los tipos en cada parte: un lote puede traer los
+        precios como int y otro como float, o un título "2024" como número.
+        """
+        columnas = {}
+        for campo in self.esquema:
+            serie = df[campo.name]
+            if pa.types.is_string(campo.type) or pa.types.is_dictionary(campo.type):
+                if not (pd.api.types.is_object_dtype(serie) or isinstance(serie.dtype, pd.CategoricalDtype)):
+                    serie = serie.astype(str).where(serie.notna(), None)
+            columnas[campo.name] = serie
+        return pa.Table.from_pandas(pd.DataFrame(columnas), schema=self.esquema, preserve_index=False)
+
+    def escribir(self, df):
+        faltantes = [c for c in self.esquema.names if c not in df.columns]
+        if faltantes:
+            raise KeyError(f"Faltan columnas del esquema: {', '.join(faltantes)}")
+        tabla = self._tabla(df)
+        if self._parquet is not None:
+            self._parquet.write_table(tabla)
+        else:
+            # Enteros nullable: un int con faltantes no pasa a float ("5.0")
+            enteros = {campo.type: pd.Int64Dtype() for campo in self.esquema if pa.types.is_integer(campo.type)}
+            tabla.to_pandas(types_mapper=enteros.get).to_csv(self._csv, header=False, index=False)
+        self.filas += len(df)
+
+    def __exit__(self, *exc):
+        if self._parquet is not None:
+            self._parquet.close()
+        else:
+            self._csv.close()
+
+
+def convertir(entrada, salida, esquema, filas_por_lote=FILAS_POR_LOTE):
+    """Copia un dataset entre formatos (p. ej. el Parquet intermedio al CSV entregable), lote a lote."""
+    esquema = ESQUEMAS[esquema]
+    with Escritor(salida, esquema) as escritor:
+        for df in lotes(entrada, esquema=esquema, filas_por_lote=filas_por_lote):
+            escritor.escribir(df)
@@ -0,0 +1,195 @@
+import itertools
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from categorizador import plegar_acentos
+
+# Detección de casi duplicados en catálogos unidos: el mismo producto scrapeado
+# dos veces con otro precio, o una publicación a la que le cambiaron el título.
+#
+# Cada título se normaliza (minúsculas, sin tildes ni signos) y se reduce a su
+# conjunto de palabras; MinHash resume ese conjunto en una firma de números
+# cuya coincidencia posición a posición estima la similitud de Jaccard. Con LSH
+# la firma se corta en bandas y solo se comparan las filas que comparten una
+# banda completa dentro del mismo bloque (categoría y marketplace), así que el
+# costo crece casi linealmente con el número de filas en vez de comparar todos
+# los pares. Los candidatos cuya firma coincide en al menos `umbral` se unen en
+# grupos, y de cada grupo se queda una fila canónica.
+
+PERMUTACIONES = 64
+UMBRAL = 0.8
+BLOQUES = ('category', 'marketplace')
+# Cada fila se compara con hasta esta cantidad de filas siguientes de su cubeta:
+# en cubetas chicas son todos los pares; en las enormes (títulos genéricos
+# repetidos) el costo queda acotado y los grupos se cierran por transitividad
+VECINOS_POR_CUBETA = 32
+# Probabilidad mínima de que un par justo en el umbral llegue a compararse
+RECALL_BANDAS = 0.99
+# Lo que no es letra ni número separa palabras
+NO_PALABRA = re.compile(r'[\W_]+')
+_MEZCLA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def palabras_normalizadas(serie):
+    """(filas, palabras, total): cada palabra distinta de cada título como un id de 0 a total - 1.
+
+    Los títulos se cortan en los espacios y la normalización (minúsculas, sin
+    tildes, signos como separadores) se hace una sola vez por cada trozo
+    distinto, que luego puede dar cero, una o varias palabras. Los valores que
+    no son texto no tienen palabras.
+    """
+    textos = pa.array([t if isinstance(t, str) else None for t in serie], type=pa.string())
+    listas = pc.split_pattern(textos, ' ')
+    filas = pc.list_parent_indices(listas).to_numpy()
+    trozos = pc.dictionary_encode(pc.list_flatten(listas))
+    vocabulario = {}
+    partes = [[vocabulario.setdefault(p, len(vocabulario)) for p in NO_PALABRA.sub(' ', plegar_acentos(t.lower())).split()]
+              for t in trozos.dictionary.to_pylist()]
+    largos = np.array([len(p) for p in partes], dtype=np.int64)
+    planas = np.fromiter(itertools.chain.from_iterable(partes), dtype=np.int64, count=largos.sum())
+    # Cada (fila, trozo) se expande a (fila, palabra) por cada palabra del trozo
+    ids = trozos.indices.to_numpy()
+    repeticiones = largos[ids]
+    desplazamiento = np.repeat(np.cumsum(largos)[ids] - largos[ids] - (np.cumsum(repeticiones) - repeticiones),
+                               repeticiones)
+    palabras = planas[desplazamiento + np.arange(repeticiones.sum())]
+    total = max(len(vocabulario), 1)
+    # Cada palabra una vez por fila, ordenadas por fila
+    pares = np.unique(np.repeat(filas, repeticiones).astype(np.int64) * total + palabras)
+    return pares // total, pares % total, len(vocabulario)
+
+
+def firmas_minhash(filas, palabras, total, n, permutaciones=PERMUTACIONES, semilla=1):
+    """Matriz n x permutaciones (uint32) con la firma MinHash de cada fila.
+
+    Cada permutación es un hash multiplicativo (a * x + b) >> 32 sobre el id de
+    la palabra. Las filas sin palabras quedan con la firma máxima.
+    """
+    rng = np.random.default_rng(semilla)
+    a = rng.integers(1, 2 ** 63, size=permutaciones, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=permutaciones, dtype=np.uint64)
+    ids = np.arange(1, total + 1, dtype=np.uint64)
+    firmas = np.full((n, permutaciones), np.iinfo(np.uint32).max, dtype=np.uint32)
+    if len(filas) == 0:
+        return firmas
+    inicios = np.flatnonzero(np.r_[True, filas[1:] != filas[:-1]])
+    # Una permutación por vez, en filas contiguas; se traspone al final
+    minimos = np.empty((permutaciones, len(inicios)), dtype=np.uint32)
+    valores = np.empty(len(palabras), dtype=np.uint32)
+    for p in range(permutaciones):
+        hashes = ((ids * a[p] + b[p]) >> np.uint64(32)).astype(np.uint32)  # Los productos se desbordan a propósito
+        np.take(hashes, palabras, out=valores)
+        minimos[p] = np.minimum.reduceat(valores, inicios)
+    firmas[filas[inicios]] = minimos.T
+    return firmas
+
+
+def elegir_bandas(permutaciones, umbral, recall=RECALL_BANDAS):
+    """(bandas, filas por banda) con las bandas más largas que aún vuelven candidato a un par con similitud `umbral`.
+
+    Un par con similitud s comparte alguna banda con probabilidad 1 - (1 - s^r)^b;
+    se pide al menos `recall` en s = `umbral` y, entre las opciones que lo
+    cumplen, la de más filas por banda (menos candidatos falsos, que igual se
+    descartan al verificar con la firma completa).
+    """
+    opciones = [(b, permutaciones // b) for b in range(1, permutaciones + 1) if permutaciones % b == 0]
+    suficientes = [o for o in opciones if 1 - (1 - umbral ** o[1]) ** o[0] >= recall]
+    return max(suficientes, key=lambda o: o[1]) if suficientes else (permutaciones, 1)
+
+
+def _bloques(df, columnas):
+    presentes = [c for c in columnas if c in df.columns]
+    if not presentes:
+        return np.zeros(len(df), dtype=np.int64)
+    return df.groupby(presentes, dropna=False, sort=False).ngroup().to_numpy(dtype=np.int64)
+
+
+def _candidatos(firmas, bloque, validas, bandas, por_banda, vecinos=VECINOS_POR_CUBETA):
+    """Pares de filas que comparten una banda y un bloque.
+
+    Dentro de cada cubeta (filas con la misma banda, ordenadas por posición) se
+    emite cada fila con las `vecinos` siguientes, o sea todos los pares si la
+    cubeta tiene hasta `vecinos` + 1 filas. Un par puede salir repetido si
+    comparte varias bandas.
+    """
+    origenes, destinos = [], []
+    filas = np.flatnonzero(validas)
+    if len(filas) == 0:
+        # Ninguna fila tiene palabras (df vacío o todos los títulos vacíos o faltantes)
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    for k in range(bandas):
+        clave = bloque[filas].astype(np.uint64) * _MEZCLA
+        for columna in firmas[filas, k * por_banda:(k + 1) * por_banda].T:
+            clave = (clave ^ columna.astype(np.uint64)) * _MEZCLA
+        orden = np.argsort(clave, kind='stable')
+        ordenadas = clave[orden]
+        for d in range(1, vecinos + 1):
+            misma = ordenadas[d:] == ordenadas[:-d]
+            if not misma.any():
+                break  # Ninguna cubeta tiene más de d filas
+            posiciones = np.flatnonzero(misma)
+            origenes.append(filas[orden[posiciones + d]])
+            destinos.append(filas[orden[posiciones]])
+    if not origenes:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(origenes), np.concatenate(destinos)
+
+
+def _componentes(n, origenes, destinos):
+    """Raíz (la fila de menor posición) del grupo de cada fila, uniendo los pares dados (union-find)."""
+    padre = np.arange(n)
+    while True:
+        raiz_o, raiz_d = padre[origenes], padre[destinos]
+        distintas = raiz_o != raiz_d
+        if not distintas.any():
+            return padre
+        menor = np.minimum(raiz_o[distintas], raiz_d[distintas])
+        np.minimum.at(padre, raiz_o[distintas], menor)
+        np.minimum.at(padre, raiz_d[distintas], menor)
+        # Compresión de caminos hasta que cada fila apunta a su raíz
+        while True:
+            siguiente = padre[padre]
+            if (siguiente == padre).all():
+                break
+            padre = siguiente
+
+
+def agrupar_duplicados(df, columna='title', bloques=BLOQUES, umbral=UMBRAL, permutaciones=PERMUTACIONES, semilla=1):
+    """Grupos de casi duplicados de `df` según los títulos de `columna`.
+
+    Solo se comparan filas con los mismos valores en las columnas de `bloques`
+    que existan en `df`. Devuelve un DataFrame con el índice de `df` y las
+    columnas `grupo` (número de grupo), `canonica` (índice de la fila que
+    representa al grupo: la que tiene más campos completos y, a igualdad, la
+    primera) y `tamano` (filas del grupo).
+    """
+    n = len(df)
+    if n == 0:
+        return pd.DataFrame({'grupo': np.empty(0, dtype=np.int64), 'canonica': df.index[:0],
+                             'tamano': np.empty(0, dtype=np.int64)}, index=df.index)
+    filas, palabras, total = palabras_normalizadas(df[columna])
+    firmas = firmas_minhash(filas, palabras, total, n, permutaciones, semilla)
+    validas = np.zeros(n, dtype=bool)
+    validas[filas] = True
+    bloque = _bloques(df, bloques)
+    origenes, destinos = _candidatos(firmas, bloque, validas, *elegir_bandas(permutaciones, umbral))
+    # Verificación con la firma completa
+    similares = (firmas[origenes] == firmas[destinos]).mean(axis=1) >= umbral
+    raices = _componentes(n, origenes[similares], destinos[similares])
+
+    completitud = df.notna().sum(axis=1).to_numpy()
+    orden = np.lexsort((np.arange(n), -completitud, raices))
+    primeras = np.r_[True, raices[orden][1:] != raices[orden][:-1]]
+    canonica = np.empty(n, dtype=np.int64)
+    canonica[raices[orden][primeras]] = orden[primeras]
+    grupo, _ = pd.factorize(raices)
+    return pd.DataFrame({'grupo': grupo, 'canonica': df.index[canonica[raices]],
+                         'tamano': np.bincount(grupo)[grupo]}, index=df.index)
+
+
+def eliminar_duplicados(df, columna='title', **opciones):
+    """`df` con una sola fila (la canónica) por grupo de casi duplicados."""
+    grupos = agrupar_duplicados(df.reset_index(drop=True), columna, **opciones)
+    return df[grupos['canonica'].to_numpy() == np.arange(len(df))]
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from categorizador import plegar_acentos
+
+# Emparejamiento de un mismo producto entre marketplaces.
+#
+# Cada título se convierte en un vector TF-IDF disperso de n-gramas de
+# caracteres (tolera plurales, errores de tipeo y palabras en otro orden) con
+# norma 1, así que el producto punto de dos vectores es su similitud coseno.
+# Solo se comparan productos de la misma categoría y de marketplaces distintos,
+# y por lotes de filas: cada lote se multiplica contra los candidatos con un
+# producto de matrices dispersas y de cada fila se guardan los k mejores, sin
+# armar nunca la matriz completa de similitudes.
+
+NGRAMAS = (3, 4)
+# Un n-grama presente en más de esta fracción de títulos no distingue productos
+MAX_DF = 0.5
+# Máximo de pares (fila del lote, candidato) por producto de matrices
+PARES_POR_LOTE = 20_000_000
+
+
+def normalizar(texto):
+    texto = texto.lower()
+    return texto if texto.isascii() else plegar_acentos(texto)
+
+
+def vectorizar(titulos, ngramas=NGRAMAS, max_df=MAX_DF):
+    """Matriz CSR (float32, filas de norma 1) con los n-gramas de caracteres de cada título.
+
+    Si ningún título tiene n-gramas (lista vacía, títulos vacíos o faltantes) la matriz no tiene columnas.
+    """
+    vectorizador = TfidfVectorizer(analyzer='char_wb', ngram_range=ngramas, preprocessor=normalizar,
+                                   max_df=max_df, sublinear_tf=True, dtype=np.float32)
+    textos = [t if isinstance(t, str) else '' for t in titulos]
+    if not any(t.strip() for t in textos):
+        return sparse.csr_matrix((len(textos), 0), dtype=np.float32)
+    try:
+        return vectorizador.fit_transform(textos).tocsr()
+    except ValueError:
+        # Muy pocos títulos: con max_df no queda ningún n-grama
+        vectorizador.set_params(max_df=1.0)
+        return vectorizador.fit_transform(textos).tocsr()
+
+
+def top_k(similitudes, k, umbral):
+    """(filas, columnas, scores, puestos) de los k mayores valores >= umbral de cada fila de una matriz dispersa."""
+    similitudes = similitudes.tocoo()
+    conservar = similitudes.data >= umbral
+    filas, columnas, scores = similitudes.row[conservar], similitudes.col[conservar], similitudes.data[conservar]
+    # Por fila y de mayor a menor score; el puesto dentro de la fila decide si entra
+    orden = np.lexsort((columnas, -scores, filas))
+    filas, columnas, scores = filas[orden], columnas[orden], scores[orden]
+    inicios = np.flatnonzero(np.r_[True, filas[1:] != filas[:-1]]) if len(filas) else np.empty(0, dtype=np.int64)
+    puesto = np.arange(len(filas)) - np.repeat(inicios, np.diff(np.r_[inicios, len(filas)]))
+    entra = puesto < k
+    return filas[entra], columnas[entra], scores[entra], puesto[entra] + 1
+
+
+def _emparejar_bloque(vectores, origen, destino, k, umbral, pares_por_lote):
+    """Top-k de cada fila de `origen` entre las de `destino` (posiciones en `vectores`), por lotes."""
+    candidatos = vectores[destino].T.tocsc()
+    lote = max(1, pares_por_lote // max(len(destino), 1))
+    partes = []
+    for inicio in range(0, len(origen), lote):
+        filas = origen[inicio:inicio + lote]
+        f, c, s, puesto = top_k(vectores[filas] @ candidatos, k, umbral)
+        partes.append((filas[f], destino[c], s, puesto))
+    return partes
+
+
+def emparejar(df, columna='title', bloque='category', marketplace='marketplace', k=3, umbral=0.3,
+              max_df=MAX_DF, pares_por_lote=PARES_POR_LOTE):
+    """Tabla de emparejamientos entre marketplaces.
+
+    Para cada fila, los k productos más parecidos de cada uno de los otros
+    marketplaces de su misma categoría, con similitud coseno >= `umbral`.
+    Columnas: indice y indice_match (índices de `df`), marketplace,
+    marketplace_match, category, score y rango (1 = el más parecido).
+    Las filas sin categoría no se emparejan. En catálogos muy grandes, bajar
+    `max_df` descarta más n-gramas comunes y acelera mucho los productos.
+    """
+    columnas = ['indice', 'marketplace', 'indice_match', 'marketplace_match', bloque, 'score', 'rango']
+    if len(df) == 0:
+        return pd.DataFrame(columns=columnas)
+    vectores = vectorizar(df[columna], max_df=max_df)
+    bloques = df[bloque].to_numpy()
+    mercados = df[marketplace].to_numpy()
+    # Posiciones de cada marketplace dentro de cada categoría
+    por_bloque = {}
+    for (b, m), posiciones in pd.DataFrame({'b': bloques, 'm': mercados}).groupby(['b', 'm']).indices.items():
+        por_bloque.setdefault(b, []).append((m, posiciones))
+    partes = []
+    for mercados_bloque in por_bloque.values():
+        for m, origen in mercados_bloque:
+            for m_destino, destino in mercados_bloque:
+                if m_destino != m:
+                    partes.extend(_emparejar_bloque(vectores, origen, destino, k, umbral, pares_por_lote))
+
+    if not partes:
+        return pd.DataFrame(columns=columnas)
+    origen, destino, score, rango = (np.concatenate(p) for p in zip(*partes))
+    return pd.DataFrame({'indice': df.index[origen], 'marketplace': mercados[origen],
+                         'indice_match': df.index[destino], 'marketplace_match': mercados[destino],
+                         bloque: bloques[origen], 'score': score, 'rango': rango}, columns=columnas)
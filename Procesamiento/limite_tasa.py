@@ -0,0 +1,28 @@
+import threading
+import time
+
+# Límite de solicitudes por segundo compartido entre hilos. Lo usan la
+# traducción (traduccion.py, que lo importa por nombre como el resto de esta
+# carpeta) y las llamadas a la API de Instagram (Scraping/instagram.py).
+#
+# Es la única dependencia de Scraping hacia Procesamiento: instagram.py lo
+# importa como Procesamiento.limite_tasa, así que se corre desde la raíz del
+# repositorio (python -m Scraping.instagram). Por eso este módulo solo usa la
+# biblioteca estándar y no importa otros módulos de Procesamiento.
+
+
+class LimiteTasa:
+    """Espacia las solicitudes para no superar `por_segundo` entre todos los hilos."""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo if por_segundo else 0.0
+        self._lock = threading.Lock()
+        self._proximo = 0.0
+
+    def esperar(self):
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._proximo)
+            self._proximo = turno + self.intervalo
+        if turno > ahora:
+            time.sleep(turno - ahora)
@@ -1,48 +1,13 @@
 import pandas as pd
-import re
-
-df_mercado_libre = pd.read_csv("./Datos_extraidos/Datos_procesados/mercado_libre_con_categorias.csv")
-df_aliexpress = pd.read_csv("./Datos_extraidos/Datos_procesados/aliexpress_con_categorias.csv")
-df_amazon = pd.read_csv("./Datos_extraidos/Datos_procesados/amazon_con_categorias.csv")
-
-# Función para limpiar precios en formato "COP13.350,84"
-def clean_price(price_str):
-    if isinstance(price_str, str):
-        price_str = price_str.replace("COP", "").replace(".", "").replace(",", ".").strip()
-    try:
-        return float(price_str)
-    except:
-        return None
-
-# Función para limpiar descuentos "-25%"
-def clean_discount(discount_str):
-    if isinstance(discount_str, str):
-        match = re.search(r"-?(\d+)", discount_str)
-        return int(match.group(1)) if match else 0
-    return 0
-
-# Función para limpiar campo 'sold'
-def clean_sold(sold_str):
-    if isinstance(sold_str, str):
-        sold_str = sold_str.lower()
-        if 'k' in sold_str:
-            match = re.search(r"([\d,.]+)", sold_str)
-            if match:
-                return int(float(match.group(1).replace(",", "").replace(".", "")) * 1000)
-        match = re.search(r"(\d+)", sold_str)
-        if match:
-            return int(match.group(1))
-    try:
-        return int(sold_str)
-    except:
-        return 0
+from datasets import COMPETENCIA, FILAS_POR_LOTE, Escritor, lotes
+from parseo_valores import LOCALES, parsear_descuento, parsear_precio, parsear_vendidos
 
 # Limpieza de AliExpress
 def clean_aliexpress(df):
     df['marketplace'] = 'AliExpress'
-    df['price'] = df['price'].apply(clean_price)
-    df['discount'] = df['discount'].apply(clean_discount)
-    df['sold'] = df['sold'].apply(clean_sold)
+    df['price'] = parsear_precio(df['price'], **LOCALES['AliExpress'])  # "COP13.350,84"
+    df['discount'] = parsear_descuento(df['discount'])  # "-25%"
+    df['sold'] = parsear_vendidos(df['sold'])  # "325 sold"
     df = df[['title', 'price', 'discount', 'sold', 'rating', 'category', 'marketplace']]
     return df
 
@@ -50,7 +15,7 @@ def clean_aliexpress(df):
 def clean_amazon(df):
     df['marketplace'] = 'Amazon'
     df['discount'] = 0
-    df['sold'] = df['sold'].apply(clean_sold)
+    df['sold'] = parsear_vendidos(df['sold'])  # "40 K+ comprados el mes pasado"
     df['price'] = df['price'] * 4000  # Conversión a COP
     df = df[['title', 'price', 'discount', 'sold', 'rating', 'category', 'marketplace']]
     return df
@@ -59,21 +24,51 @@ def clean_amazon(df):
 def clean_mercado_libre(df):
     df['marketplace'] = 'Mercado Libre'
     df['discount'] = 0  # No hay descuento explícito
-    df['sold'] = df['sold'].apply(clean_sold)
+    df['sold'] = parsear_vendidos(df['sold'])
     df = df[['title', 'price', 'discount', 'sold', 'rating', 'category', 'marketplace']]
     return df
 
 
-# Aplicar las funciones a cada dataframe
-df_aliexpress_clean = clean_aliexpress(df_aliexpress)
-df_amazon_clean = clean_amazon(df_amazon)
-df_mercado_clean = clean_mercado_libre(df_mercado_libre)
+LIMPIEZAS = {
+    'AliExpress': clean_aliexpress,
+    'Amazon': clean_amazon,
+    'Mercado Libre': clean_mercado_libre,
+}
+
+
+def limpiar(entrada, salida, marketplace, filas_por_lote=FILAS_POR_LOTE):
+    """Limpia el CSV de un marketplace y lo guarda con las columnas y tipos comunes (Parquet o CSV).
+
+    Se procesa por lotes de `filas_por_lote` filas: la memoria no depende del tamaño del archivo.
+    """
+    limpiar_y_unir({marketplace: entrada}, salida, filas_por_lote)
+
+
+def limpiar_y_unir(entradas, salida, filas_por_lote=FILAS_POR_LOTE):
+    """Limpia los CSV de `entradas` ({marketplace: ruta}) y los escribe, uno tras otro, en `salida`."""
+    with Escritor(salida, COMPETENCIA) as escritor:
+        for marketplace, entrada in entradas.items():
+            for df in lotes(entrada, filas_por_lote=filas_por_lote):
+                escritor.escribir(LIMPIEZAS[marketplace](df))
+    return escritor.filas
+
 
-df_all = pd.concat([df_aliexpress_clean, df_amazon_clean, df_mercado_clean], ignore_index=True)
+def unir(entradas, salida, filas_por_lote=FILAS_POR_LOTE):
+    """Concatena los datasets ya limpios de cada marketplace, lote a lote."""
+    with Escritor(salida, COMPETENCIA) as escritor:
+        for entrada in entradas:
+            for df in lotes(entrada, esquema=COMPETENCIA, filas_por_lote=filas_por_lote):
+                escritor.escribir(df)
 
-# Ver una muestra final
-print(df_all.head())
 
-# Guardar el resultado
-df_all.to_csv("dataset_competencia.csv", index=False)
+if __name__ == '__main__':
+    # Orden de siempre: AliExpress, Amazon, Mercado Libre
+    filas = limpiar_y_unir({
+        'AliExpress': "./Datos_extraidos/Datos_procesados/aliexpress_con_categorias.csv",
+        'Amazon': "./Datos_extraidos/Datos_procesados/amazon_con_categorias.csv",
+        'Mercado Libre': "./Datos_extraidos/Datos_procesados/mercado_libre_con_categorias.csv",
+    }, "dataset_competencia.csv")
 
+    # Ver una muestra final
+    print(pd.read_csv("dataset_competencia.csv", nrows=5))
+    print(f"{filas} filas")
@@ -0,0 +1,230 @@
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import is_bool_dtype, is_integer_dtype, is_numeric_dtype
+
+# Conversión vectorizada de los textos scrapeados a números: precios ("COP13.350,84",
+# "84.900"), descuentos ("-25%"), vendidos ("325 sold", "40 K+ comprados el mes
+# pasado") y conteos de reseñas ("2,576").
+#
+# Se usan operaciones de texto de pandas sobre strings de Arrow y, como columnas
+# como sold o discount repiten muchísimo los mismos textos, en ellas cada valor
+# distinto se parsea una sola vez (pd.factorize) y el resultado se expande. Los
+# valores raros (notación científica, texto no ASCII, números enormes) pasan por
+# las funciones escalares de abajo, que son las que usaba limpieza.py, así que el
+# resultado es idéntico al de aplicarlas fila por fila con .apply.
+
+# Formato de los números en cada marketplace
+LOCALES = {
+    'AliExpress': {'moneda': 'COP', 'miles': '.', 'decimal': ','},  # "COP13.350,84"
+    'Mercado Libre': {'moneda': None, 'miles': '.', 'decimal': ','},  # "84.900"
+    'Amazon': {'moneda': None, 'miles': ',', 'decimal': '.'},  # "1,299.99", reseñas "2,576"
+}
+
+PRIMER_NUMERO = re.compile(r"-?(\d+)")
+NUMERO_K = re.compile(r"([\d,.]+)")
+DIGITOS = re.compile(r"(\d+)")
+# Strings de Arrow: las expresiones regulares son RE2 y [0-9] o lower() solo cubren ASCII,
+# así que los textos con caracteres no ASCII van por la vía escalar
+TEXTO = pd.ArrowDtype(pa.string())
+DECIMAL = pd.ArrowDtype(pa.float64())
+ENTERO = pd.ArrowDtype(pa.int64())
+# Número decimal simple (con espacios alrededor), lo único que se convierte por la vía rápida
+DECIMAL_SIMPLE = r'[ \t\n\r\f\v]*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)[ \t\n\r\f\v]*'
+# Más dígitos que estos podrían no caber en int64 o perder precisión en float
+MAX_DIGITOS_ENTERO = 18
+MAX_DIGITOS_K = 15
+# Filas que se miran para decidir si conviene parsear solo los valores distintos
+MUESTRA_REPETICION = 10000
+
+
+# --- Versiones escalares (semántica de referencia) ---
+
+def precio(valor, moneda='COP', miles='.', decimal=','):
+    """Precio en formato "COP13.350,84" a float; None si no se puede convertir."""
+    if isinstance(valor, str):
+        if moneda:
+            valor = valor.replace(moneda, "")
+        valor = valor.replace(miles, "").replace(decimal, ".").strip()
+    try:
+        return float(valor)
+    except:
+        return None
+
+
+def descuento(valor):
+    """Descuento "-25%" a 25; 0 si no hay número o no es texto."""
+    if isinstance(valor, str):
+        match = PRIMER_NUMERO.search(valor)
+        return int(match.group(1)) if match else 0
+    return 0
+
+
+def vendidos(valor):
+    """Vendidos "325 sold" a 325 y "40 K+ comprados" a 40000; 0 si no se puede convertir.
+
+    Como en la versión original, en "1.5k" se quitan los separadores antes de
+    multiplicar (15000).
+    """
+    if isinstance(valor, str):
+        valor = valor.lower()
+        if 'k' in valor:
+            match = NUMERO_K.search(valor)
+            if match:
+                return int(float(match.group(1).replace(",", "").replace(".", "")) * 1000)
+        match = DIGITOS.search(valor)
+        if match:
+            return int(match.group(1))
+    try:
+        return int(valor)
+    except:
+        return 0
+
+
+# --- Versiones vectorizadas ---
+
+def _parsear_columna(serie, parsear, valor_na, dtype):
+    """Aplica parsear (que recibe una serie object sin faltantes) y pone `valor_na` en los faltantes.
+
+    Si en una muestra se repiten muchos valores, se parsea cada valor distinto una
+    sola vez y el resultado se expande con los códigos de pd.factorize.
+    """
+    faltantes = serie.isna().to_numpy()
+    valores = serie[~faltantes]
+    muestra = valores.iloc[:MUESTRA_REPETICION]
+    if muestra.nunique() <= len(muestra) / 2:
+        codigos, unicos = pd.factorize(valores)
+        parseados = np.asarray(parsear(pd.Series(np.asarray(unicos, dtype=object), dtype=object)),
+                               dtype=dtype)[codigos]
+    else:
+        parseados = parsear(pd.Series(valores.to_numpy(dtype=object), dtype=object))
+    salida = np.full(len(serie), valor_na, dtype=dtype)
+    salida[~faltantes] = parseados
+    return pd.Series(salida, index=serie.index, name=serie.name)
+
+
+def _es_texto(valores):
+    """Máscara de los valores que son str."""
+    if pd.api.types.infer_dtype(valores, skipna=False) == 'string':
+        return np.ones(len(valores), dtype=bool)
+    return valores.map(type).eq(str).to_numpy()
+
+
+def _textos_ascii(valores):
+    """Los valores str y solo ASCII, como strings de Arrow (sus operaciones corren en C++)."""
+    textos = valores[_es_texto(valores)].astype(TEXTO)
+    return textos[pc.string_is_ascii(pa.array(textos)).to_numpy(zero_copy_only=False)]
+
+
+def _mascara(serie):
+    return serie.fillna(False).to_numpy(dtype=bool)
+
+
+def _combinar(valores, rapidos, escalar, dtype):
+    """La serie `rapidos` en sus posiciones y la función escalar en el resto de `valores`."""
+    salida = np.empty(len(valores), dtype=dtype)
+    posiciones = rapidos.index.to_numpy()  # `valores` tiene índice 0..n-1
+    salida[posiciones] = rapidos.to_numpy(dtype=dtype)
+    resto = np.ones(len(valores), dtype=bool)
+    resto[posiciones] = False
+    if resto.any():
+        salida[resto] = [escalar(v) for v in valores[resto]]
+    return salida
+
+
+def _precio_valores(valores, moneda, miles, decimal):
+    textos = _textos_ascii(valores)
+    if moneda:
+        textos = textos.str.replace(moneda, '', regex=False)
+    textos = textos.str.replace(miles, '', regex=False).str.replace(decimal, '.', regex=False)
+    rapidos = textos[_mascara(textos.str.fullmatch(DECIMAL_SIMPLE))].str.strip().astype(DECIMAL)
+
+    def escalar(valor):
+        resultado = precio(valor, moneda, miles, decimal)
+        return np.nan if resultado is None else resultado
+
+    return _combinar(valores, rapidos, escalar, 'float64')
+
+
+def _primer_entero(textos):
+    """Primer grupo de dígitos de cada texto como int64, 0 si no hay; solo las filas que caben en int64."""
+    numeros = textos.str.extract(r'(?P<n>[0-9]+)', expand=False)
+    sin_numero = _mascara(numeros.isna())
+    con_numero = ~sin_numero & _mascara(numeros.str.len() <= MAX_DIGITOS_ENTERO)
+    valores = pd.Series(0, index=textos.index, dtype='int64')
+    valores[con_numero] = numeros[con_numero].astype(ENTERO).to_numpy(dtype='int64')
+    return valores[sin_numero | con_numero]
+
+
+def _descuento_valores(valores):
+    return _combinar(valores, _primer_entero(_textos_ascii(valores)), descuento, 'int64')
+
+
+def _vendidos_valores(valores):
+    textos = _textos_ascii(valores).str.lower()
+    # "40 K+": primer grupo de dígitos, comas y puntos, sin separadores, por mil
+    grupo_k = textos.str.extract(r'(?P<n>[0-9,.]+)', expand=False)
+    con_k = _mascara(textos.str.contains('k', regex=False)) & _mascara(grupo_k.notna())
+    digitos_k = grupo_k[con_k].str.replace(',', '', regex=False).str.replace('.', '', regex=False)
+    # Sin dígitos ("k.") la versión original falla: esos quedan para la vía escalar
+    digitos_k = digitos_k[_mascara(digitos_k.str.len().between(1, MAX_DIGITOS_K))]
+    con_k_rapido = pd.Series((digitos_k.astype(DECIMAL).to_numpy(dtype='float64') * 1000).astype('int64'),
+                             index=digitos_k.index)
+    # Sin "k" (o sin número junto a la k): primer grupo de dígitos, o 0
+    return _combinar(valores, pd.concat([con_k_rapido, _primer_entero(textos[~con_k])]), vendidos, 'int64')
+
+
+def parsear_precio(serie, moneda='COP', miles='.', decimal=','):
+    """Serie de precios a float64 (NaN donde no se puede convertir).
+
+    Por defecto el formato de AliExpress ("COP13.350,84"); ver LOCALES para el resto.
+    """
+    if is_numeric_dtype(serie):
+        return serie.astype('float64')
+    return _parsear_columna(serie, lambda u: _precio_valores(u, moneda, miles, decimal), np.nan, 'float64')
+
+
+def parsear_descuento(serie):
+    """Serie de descuentos "-25%" a int64 (25); 0 si no hay número o el valor no es texto."""
+    if is_numeric_dtype(serie):
+        return pd.Series(0, index=serie.index, name=serie.name, dtype='int64')
+    try:
+        return _parsear_columna(serie, _descuento_valores, 0, 'int64')
+    except OverflowError:
+        return serie.map(descuento)  # Números que no caben en int64: se devuelven como int de Python
+
+
+def parsear_vendidos(serie):
+    """Serie de vendidos ("325 sold", "40 K+ comprados el mes pasado") a int64; 0 si no se puede convertir."""
+    if is_bool_dtype(serie) or is_integer_dtype(serie):
+        return serie.astype('int64')
+    if is_numeric_dtype(serie):
+        numeros = serie.to_numpy(dtype='float64')
+        finitos = np.isfinite(numeros)
+        if not (np.abs(numeros[finitos]) >= 2 ** 63).any():
+            return pd.Series(np.where(finitos, numeros, 0).astype('int64'), index=serie.index, name=serie.name)
+    try:
+        return _parsear_columna(serie, _vendidos_valores, 0, 'int64')
+    except OverflowError:
+        return serie.map(vendidos)
+
+
+def _conteo_valores(valores, miles):
+    es_texto = _es_texto(valores)
+    salida = pd.to_numeric(valores.where(~es_texto), errors='coerce').to_numpy(dtype='float64')
+    limpios = (valores[es_texto].astype(TEXTO).str.strip().str.strip('()').str.rstrip('+')
+               .str.replace(miles, '', regex=False).str.strip())
+    salida[es_texto] = pd.to_numeric(limpios, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return salida
+
+
+def parsear_conteo(serie, miles=','):
+    """Conteos de reseñas ("2,576", "(1.234)", "300+") a float64; NaN si falta o no es un número.
+
+    Una columna que ya es numérica se devuelve tal cual.
+    """
+    if is_numeric_dtype(serie):
+        return serie
+    return _parsear_columna(serie, lambda u: _conteo_valores(u, miles), np.nan, 'float64')
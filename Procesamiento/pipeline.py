@@ -0,0 +1,283 @@
+import argparse
+import collections
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Orquestador incremental del procesamiento: cada etapa declara sus archivos de
+# entrada y salida, de ahí sale el grafo de dependencias, y una etapa solo se
+# vuelve a correr si cambió el contenido de sus entradas, sus parámetros o el
+# código de sus módulos (o si falta o se modificó alguna salida). Las ramas
+# independientes, como la limpieza de cada marketplace, corren en paralelo.
+#
+#   python Procesamiento/pipeline.py                 # desde la raíz del repositorio
+#   python Procesamiento/pipeline.py --forzar limpiar_amazon
+#
+# Los módulos de las etapas se importan recién al correrlas, así una ejecución
+# sin cambios no carga pandas y termina en milisegundos.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ESTADO = '.pipeline_estado.json'
+# Datasets con categorías corregidas a mano (Asignación_categoria_manual.py):
+# son entradas del pipeline y ninguna etapa puede escribirlos
+MANUALES = [os.path.join('Datos_extraidos', 'Datos_procesados', f'{a}_con_categorias.csv')
+            for a in ('aliexpress', 'amazon', 'mercado_libre')]
+
+Etapa = collections.namedtuple('Etapa', ['nombre', 'funcion', 'entradas', 'salidas', 'parametros', 'modulos'],
+                               defaults=({}, ()))
+Etapa.__doc__ = """Paso del pipeline.
+
+- funcion: 'modulo.funcion' de Procesamiento; se llama con entradas, salidas y
+  parámetros como argumentos por nombre.
+- entradas / salidas: {argumento: ruta o lista de rutas}.
+- modulos: módulos extra cuyo código afecta el resultado (el de la función ya cuenta).
+"""
+
+
+def etapas(raiz=RAIZ, traductor='google'):
+    """Etapas del procesamiento de los tres marketplaces."""
+    datos = os.path.join(raiz, 'Datos_extraidos')
+    procesados = os.path.join(datos, 'Datos_procesados')
+    archivos = {'AliExpress': 'aliexpress', 'Amazon': 'amazon', 'Mercado Libre': 'mercado_libre'}
+    con_categorias = {m: os.path.join(raiz, r) for m, r in zip(archivos, MANUALES)}
+    # Intermedios tipados en Parquet; los CSV de la raíz son los entregables
+    limpios = {m: os.path.join(procesados, f'{a}_limpio.parquet') for m, a in archivos.items()}
+    competencia = os.path.join(procesados, 'dataset_competencia.parquet')
+    return [
+        Etapa('traducir', 'Traducir_al_español.traducir_titulos',
+              {'entrada': os.path.join(datos, 'aliexpress_productos_mas_vendidos.csv')},
+              {'salida': os.path.join(procesados, 'aliexpress_traducido.csv')},
+              {'backend': traductor, 'cache': os.path.join(raiz, 'traducciones.sqlite')}, ('traduccion',)),
+        Etapa('asignar_categoria', 'Asignar_categoria.asignar_categorias',
+              {'mercado_libre': os.path.join(datos, 'mercado_libre_productos_mas_vendidos.csv'),
+               'entrada': os.path.join(procesados, 'aliexpress_traducido.csv')},
+              {'salida': os.path.join(procesados, 'aliexpress_categorizado.csv')},
+              {'columna': 'name_es'}, ('categorizador',)),
+        # Categorías automáticas: punto de partida para corregir a mano, que después
+        # se guarda como aliexpress_con_categorias.csv (la entrada de la limpieza)
+        Etapa('reasignar_nombres', 'Reasignar_nombres.reasignar_nombres',
+              {'entrada': os.path.join(procesados, 'aliexpress_categorizado.csv')},
+              {'salida': os.path.join(procesados, 'aliexpress_con_categorias_auto.csv')}),
+    ] + [
+        Etapa(f'limpiar_{archivo}', 'limpieza.limpiar', {'entrada': con_categorias[marketplace]},
+              {'salida': limpios[marketplace]}, {'marketplace': marketplace}, ('parseo_valores', 'datasets'))
+        for marketplace, archivo in archivos.items()
+    ] + [
+        Etapa('unir', 'limpieza.unir', {'entradas': list(limpios.values())}, {'salida': competencia},
+              modulos=('datasets',)),
+        Etapa('exportar', 'datasets.convertir', {'entrada': competencia},
+              {'salida': os.path.join(raiz, 'dataset_competencia.csv')}, {'esquema': 'competencia'}),
+        Etapa('unificacion', 'Unificacion.preparar_modelo', {'entrada': competencia},
+              {'salida': os.path.join(raiz, 'dataset_competencia_modelo2.csv')}, modulos=('datasets',)),
+    ]
+
+
+def _rutas(archivos):
+    """Rutas de un {argumento: ruta o lista de rutas}."""
+    for valor in archivos.values():
+        yield from (valor if isinstance(valor, (list, tuple)) else [valor])
+
+
+def dependencias(lista, protegidas=()):
+    """{etapa: etapas que producen alguna de sus entradas}; valida salidas repetidas, protegidas y ciclos."""
+    protegidas = {os.path.normpath(r) for r in protegidas}
+    productor = {}
+    for etapa in lista:
+        for ruta in _rutas(etapa.salidas):
+            if os.path.normpath(ruta) in protegidas:
+                raise ValueError(f"{ruta} tiene correcciones manuales y no puede ser salida de {etapa.nombre}")
+            if ruta in productor:
+                raise ValueError(f"{ruta} es salida de {productor[ruta]} y de {etapa.nombre}")
+            productor[ruta] = etapa.nombre
+    previas = {e.nombre: {productor[r] for r in _rutas(e.entradas) if r in productor} for e in lista}
+    # Orden topológico solo para detectar ciclos
+    pendientes = dict(previas)
+    while pendientes:
+        listas = [n for n, p in pendientes.items() if not p & pendientes.keys()]
+        if not listas:
+            raise ValueError(f"Hay un ciclo entre las etapas: {', '.join(sorted(pendientes))}")
+        for n in listas:
+            del pendientes[n]
+    return previas
+
+
+class Huellas:
+    """sha256 de archivos, recordando (tamaño, mtime) para no releer los que no cambiaron."""
+
+    def __init__(self, conocidas=None):
+        self.conocidas = dict(conocidas or {})
+        self._lock = threading.Lock()
+
+    def archivo(self, ruta):
+        """Hash del contenido, o None si el archivo no existe."""
+        try:
+            st = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            previa = self.conocidas.get(ruta)
+        if previa and previa[0] == st.st_size and previa[1] == st.st_mtime_ns:
+            return previa[2]
+        h = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+        with self._lock:
+            self.conocidas[ruta] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def modulo(self, nombre):
+        spec = importlib.util.find_spec(nombre)
+        if spec is None or spec.origin is None:
+            raise ModuleNotFoundError(nombre)
+        return self.archivo(spec.origin)
+
+
+def huella_etapa(etapa, huellas):
+    """Huella de todo lo que determina las salidas de la etapa."""
+    modulo = etapa.funcion.rsplit('.', 1)[0]
+    contenido = {
+        'funcion': etapa.funcion,
+        'parametros': etapa.parametros,
+        'entradas': {r: huellas.archivo(r) for r in _rutas(etapa.entradas)},
+        'salidas': sorted(_rutas(etapa.salidas)),
+        'codigo': {m: huellas.modulo(m) for m in (modulo,) + tuple(etapa.modulos)},
+    }
+    return hashlib.sha256(json.dumps(contenido, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """Corre las etapas en orden de dependencias, en paralelo y saltando las que no cambiaron.
+
+    El estado (huella de cada etapa y de sus salidas, y el caché de hashes de
+    archivos) se guarda en un JSON, con rutas relativas a `raiz`, después de
+    cada etapa terminada.
+    """
+
+    def __init__(self, lista, raiz=RAIZ, estado=None, workers=4):
+        self.etapas = {e.nombre: e for e in lista}
+        self.previas = dependencias(lista, [os.path.join(raiz, r) for r in MANUALES])
+        self.raiz = raiz
+        self.ruta_estado = estado or os.path.join(raiz, ESTADO)
+        self.workers = workers
+        self._lock = threading.Lock()
+        guardado = self._leer_estado()
+        self.huellas = Huellas({self._absoluta(r): v for r, v in guardado.get('archivos', {}).items()})
+        self.hechas = guardado.get('etapas', {})
+
+    def _absoluta(self, ruta):
+        return os.path.normpath(os.path.join(self.raiz, ruta))
+
+    def _relativa(self, ruta):
+        return os.path.relpath(ruta, self.raiz)
+
+    def _leer_estado(self):
+        try:
+            with open(self.ruta_estado, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _guardar_estado(self):
+        with self._lock:
+            estado = {'etapas': self.hechas,
+                      'archivos': {self._relativa(r): v for r, v in self.huellas.conocidas.items()}}
+            temporal = f"{self.ruta_estado}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(estado, f, indent=1, sort_keys=True)
+            os.replace(temporal, self.ruta_estado)
+
+    def _al_dia(self, etapa, huella):
+        """La etapa ya corrió con esta huella y sus salidas siguen siendo las que produjo."""
+        previa = self.hechas.get(etapa.nombre)
+        if previa is None or previa['huella'] != huella:
+            return False
+        return all(self.huellas.archivo(r) == previa['salidas'].get(self._relativa(r))
+                   for r in _rutas(etapa.salidas))
+
+    def _correr(self, etapa, forzar):
+        """Corre la etapa si hace falta; devuelve 'omitida' o 'ejecutada'."""
+        faltantes = [r for r in _rutas(etapa.entradas) if not os.path.exists(r)]
+        if faltantes:
+            raise FileNotFoundError(f"Faltan entradas: {', '.join(faltantes)}")
+        huella = huella_etapa(etapa, self.huellas)
+        if not forzar and self._al_dia(etapa, huella):
+            return 'omitida'
+        for ruta in _rutas(etapa.salidas):
+            os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+        modulo, funcion = etapa.funcion.rsplit('.', 1)
+        getattr(importlib.import_module(modulo), funcion)(**etapa.entradas, **etapa.salidas, **etapa.parametros)
+        salidas = {self._relativa(r): self.huellas.archivo(r) for r in _rutas(etapa.salidas)}
+        with self._lock:
+            self.hechas[etapa.nombre] = {'huella': huella, 'salidas': salidas}
+        self._guardar_estado()
+        return 'ejecutada'
+
+    def correr(self, forzar=()):
+        """Corre todo el grafo; devuelve {etapa: 'ejecutada' | 'omitida' | 'fallida' | 'bloqueada'}.
+
+        forzar: nombres de etapas a correr aunque estén al día ('todas' para todas).
+        Si una etapa falla, las que dependen de ella no corren y el resto sigue.
+        """
+        forzar = set(self.etapas) if 'todas' in forzar else set(forzar)
+        desconocidas = forzar - self.etapas.keys()
+        if desconocidas:
+            raise ValueError(f"Etapas desconocidas: {', '.join(sorted(desconocidas))}")
+        resultados = {}
+        en_curso = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as ex:
+            while len(resultados) < len(self.etapas):
+                for nombre, previas in self.previas.items():
+                    if nombre in resultados or any(nombre == n for n, _ in en_curso.values()):
+                        continue
+                    if any(resultados.get(p) in ('fallida', 'bloqueada') for p in previas):
+                        resultados[nombre] = 'bloqueada'
+                        print(f"  bloqueada  {nombre}")
+                    elif all(p in resultados for p in previas):
+                        futuro = ex.submit(self._correr, self.etapas[nombre], nombre in forzar)
+                        en_curso[futuro] = (nombre, time.perf_counter())
+                if not en_curso:
+                    continue
+                terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    nombre, inicio = en_curso.pop(futuro)
+                    try:
+                        resultados[nombre] = futuro.result()
+                        print(f"  {resultados[nombre]:<9}  {nombre}"
+                              + (f" ({time.perf_counter() - inicio:.2f} s)" if resultados[nombre] == 'ejecutada' else ''))
+                    except Exception as e:
+                        resultados[nombre] = 'fallida'
+                        print(f"  fallida    {nombre}: {type(e).__name__}: {e}")
+        return resultados
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Corre las etapas del procesamiento que cambiaron')
+    parser.add_argument('--forzar', nargs='*', default=[], metavar='ETAPA',
+                        help="Etapas a correr aunque estén al día ('todas' para todas)")
+    parser.add_argument('--workers', type=int, default=4, help='Etapas independientes en paralelo')
+    parser.add_argument('--traductor', default='google', help="Backend de traducción ('offline' sin red)")
+    parser.add_argument('--estado', default=None, help=f'Archivo de estado (por defecto {ESTADO} en la raíz)')
+    parser.add_argument('--listar', action='store_true', help='Muestra las etapas y sus dependencias y sale')
+    return parser
+
+
+if __name__ == '__main__':
+    args = crear_parser().parse_args()
+    pipeline = Pipeline(etapas(traductor=args.traductor), estado=args.estado, workers=args.workers)
+    if args.listar:
+        for nombre, previas in pipeline.previas.items():
+            print(f"{nombre} <- {', '.join(sorted(previas)) or '(datos extraídos)'}")
+        sys.exit(0)
+    inicio = time.perf_counter()
+    resultados = pipeline.correr(args.forzar)
+    conteo = collections.Counter(resultados.values())
+    print(f"Pipeline: {', '.join(f'{n} {e}' for e, n in sorted(conteo.items()))} "
+          f"en {time.perf_counter() - inicio:.2f} s")
+    sys.exit(1 if conteo['fallida'] or conteo['bloqueada'] else 0)
@@ -0,0 +1,183 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from limite_tasa import LimiteTasa
+
+# Traducción de columnas de texto con caché persistente.
+#
+# Cada texto distinto se busca en un caché SQLite por el sha256 de (backend,
+# idiomas, texto); solo los que faltan se mandan al backend, agrupados en lotes
+# que se traducen en paralelo respetando un límite de solicitudes por segundo.
+# Cada lote se guarda en el caché apenas termina, así que una ejecución
+# interrumpida se retoma sin repetir llamadas, y volver a correr sobre un export
+# casi igual solo traduce los títulos nuevos.
+
+RUTA_CACHE = 'traducciones.sqlite'
+# El endpoint gratuito de Google acepta hasta 5000 caracteres por solicitud
+MAX_CARACTERES_LOTE = 4500
+MAX_TEXTOS_LOTE = 50
+# Google conserva los saltos de línea, así que un lote viaja como un solo texto
+SEPARADOR = '\n'
+
+
+def clave_traduccion(texto, backend, origen, destino):
+    return hashlib.sha256(f"{backend}\x00{origen}\x00{destino}\x00{texto}".encode('utf-8')).hexdigest()
+
+
+class CacheTraducciones:
+    """Traducciones ya hechas, en SQLite, por hash del texto original."""
+
+    def __init__(self, ruta=RUTA_CACHE):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(ruta, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS traducciones (
+                clave TEXT PRIMARY KEY, traduccion TEXT NOT NULL, guardado REAL);
+        ''')
+
+    def obtener(self, claves, tamano=500):
+        """{clave: traducción} de las claves que están en el caché."""
+        encontradas = {}
+        claves = list(claves)
+        with self._lock:
+            for i in range(0, len(claves), tamano):
+                parte = claves[i:i + tamano]
+                encontradas.update(self.conn.execute(
+                    f"SELECT clave, traduccion FROM traducciones WHERE clave IN ({','.join('?' * len(parte))})",
+                    parte))
+        return encontradas
+
+    def guardar(self, traducciones):
+        """Guarda un {clave: traducción}."""
+        ahora = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO traducciones (clave, traduccion, guardado) VALUES (?, ?, ?)',
+                                  [(clave, traduccion, ahora) for clave, traduccion in traducciones.items()])
+
+    def cerrar(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# --- Backends ---
+# Un backend tiene `nombre` (parte de la clave del caché) y traducir_lote(textos),
+# que devuelve las traducciones en el mismo orden y cuenta sus solicitudes en `llamadas`.
+
+class TraductorGoogle:
+    """Google Translate vía deep_translator; un lote es una sola solicitud."""
+
+    nombre = 'google'
+
+    def __init__(self, origen='auto', destino='es'):
+        from deep_translator import GoogleTranslator  # Solo hace falta si se usa este backend
+        self._clase = GoogleTranslator
+        self.origen = origen
+        self.destino = destino
+        self.llamadas = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _traductor(self):
+        # Las instancias de GoogleTranslator guardan estado de la solicitud: una por hilo
+        if not hasattr(self._local, 'traductor'):
+            self._local.traductor = self._clase(source=self.origen, target=self.destino)
+        return self._local.traductor
+
+    def _traducir(self, texto):
+        with self._lock:
+            self.llamadas += 1
+        return self._traductor().translate(texto)
+
+    def traducir_lote(self, textos):
+        if len(textos) > 1 and not any(SEPARADOR in t for t in textos):
+            partes = (self._traducir(SEPARADOR.join(textos)) or '').split(SEPARADOR)
+            if len(partes) == len(textos):
+                return [p.strip() for p in partes]
+        # Textos con saltos de línea o respuesta que no se puede separar: uno por uno
+        return [self._traducir(t) for t in textos]
+
+
+class TraductorOffline:
+    """Backend sin red para pruebas: antepone el idioma destino ("[es] texto")."""
+
+    nombre = 'offline'
+
+    def __init__(self, origen='auto', destino='es'):
+        self.origen = origen
+        self.destino = destino
+        self.llamadas = 0
+        self._lock = threading.Lock()
+
+    def traducir_lote(self, textos):
+        with self._lock:
+            self.llamadas += 1
+        return [f"[{self.destino}] {t}" for t in textos]
+
+
+BACKENDS = {'google': TraductorGoogle, 'offline': TraductorOffline}
+
+
+def lotes(textos, max_textos=MAX_TEXTOS_LOTE, max_caracteres=MAX_CARACTERES_LOTE):
+    """Agrupa textos en lotes de a lo sumo `max_textos` y `max_caracteres` (unidos con el separador)."""
+    lote, caracteres = [], 0
+    for texto in textos:
+        if lote and (len(lote) == max_textos or caracteres + len(SEPARADOR) + len(texto) > max_caracteres):
+            yield lote
+            lote, caracteres = [], 0
+        caracteres += len(texto) + (len(SEPARADOR) if lote else 0)
+        lote.append(texto)
+    if lote:
+        yield lote
+
+
+def traducir(serie, backend, cache, workers=4, por_segundo=5, reintentos=2, max_textos=MAX_TEXTOS_LOTE):
+    """Traduce una serie de textos; los faltantes quedan como están.
+
+    Cada texto distinto se traduce una sola vez y solo si no está en el caché.
+    Un lote que falla se reintenta con espera creciente; si sigue fallando se
+    propaga el error, con lo ya traducido guardado en el caché.
+    """
+    distintos = [t for t in pd.unique(serie.dropna()) if isinstance(t, str)]
+    claves = {t: clave_traduccion(t, backend.nombre, backend.origen, backend.destino) for t in distintos}
+    en_cache = cache.obtener(claves.values())
+    traducciones = {t: en_cache[c] for t, c in claves.items() if c in en_cache}
+    pendientes = [t for t in distintos if t not in traducciones]
+    limite = LimiteTasa(por_segundo)
+
+    def traducir_lote(lote):
+        for intento in range(reintentos + 1):
+            limite.esperar()
+            try:
+                return lote, backend.traducir_lote(lote)
+            except Exception:
+                if intento == reintentos:
+                    raise
+                time.sleep(2 ** intento)
+
+    llamadas_previas = backend.llamadas
+    error = None
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futuros = [ex.submit(traducir_lote, lote) for lote in lotes(pendientes, max_textos)]
+        for futuro in as_completed(futuros):
+            try:
+                lote, resultado = futuro.result()
+            except Exception as e:
+                error = error or e  # Los demás lotes igual se guardan
+                continue
+            nuevas = {t: r for t, r in zip(lote, resultado) if r is not None}
+            cache.guardar({claves[t]: r for t, r in nuevas.items()})
+            traducciones.update(nuevas)
+    if error is not None:
+        raise error
+
+    print(f"Traducción: {len(serie)} textos, {len(distintos)} distintos, {len(distintos) - len(pendientes)} "
+          f"desde el caché, {len(pendientes)} traducidos en {backend.llamadas - llamadas_previas} solicitudes")
+    return serie.map(lambda t: traducciones.get(t, t) if isinstance(t, str) else t)
@@ -0,0 +1,8 @@
+"""Scrapers de marketplaces (AliExpress, Amazon, Mercado Libre) e Instagram.
+
+Los navegadores se crean solo al scrapear, así que los parsers se pueden
+importar sin abrir Chrome. `python -m Scraping` corre varios sitios a la vez
+sobre un único dataset; cada scraper también se puede correr por separado con
+`python -m Scraping.<modulo>`.
+"""
+from .sitios import POR_DEFECTO, SITIOS, Sitio
@@ -0,0 +1,95 @@
+import argparse
+import threading
+import time
+from .espera import REGISTRO
+from .salida import SalidaEtiquetada, SalidaStreaming
+from .sitios import POR_DEFECTO, SITIOS
+
+# Corre los sitios elegidos en paralelo (un hilo por sitio, cada uno con sus
+# propios navegadores) y guarda todas las filas en un único dataset con las
+# columnas marketplace y sitio. El tiempo total es el del sitio más lento.
+#
+#   python -m Scraping amazon mercado_libre --args amazon "--pages 6" --output dataset.csv
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='python -m Scraping',
+                                     description='Scrapea varios sitios en paralelo sobre un único dataset')
+    parser.add_argument('sitios', nargs='*', metavar='SITIO',
+                        help=f'Sitios a scrapear: {", ".join(sorted(SITIOS))} '
+                             f'(por defecto: {" ".join(POR_DEFECTO)})')
+    parser.add_argument('--output', default='dataset_scraping.csv', help='Archivo de salida (.csv o .parquet)')
+    parser.add_argument('--lote', type=int, default=100, help='Filas por lote al volcar la salida')
+    parser.add_argument('--url', nargs=2, action='append', default=[], metavar=('SITIO', 'URL'),
+                        help='URL a usar para un sitio en lugar de la registrada')
+    parser.add_argument('--args', nargs=2, action='append', default=[], metavar=('SITIO', 'ARGUMENTOS'),
+                        help='Argumentos propios de un sitio, p. ej. --args amazon "--pages 6"')
+    # Opciones comunes: se pasan a todos los sitios que las aceptan
+    parser.add_argument('--workers', type=int, default=None, help='Navegadores en paralelo por sitio')
+    parser.add_argument('--cache', nargs='?', const='.cache_paginas', default=None,
+                        help='Guardar cada página descargada en la caché')
+    parser.add_argument('--replay', action='store_true', help='Parsear desde la caché sin descargar')
+    parser.add_argument('--completo', action='store_true', help='Perfil completo de Chrome (sin bloqueos)')
+    parser.add_argument('--adaptativo', action='store_true',
+                        help='Concurrencia y pausa por dominio adaptativas (--workers pasa a ser el máximo)')
+    parser.add_argument('--servicio', nargs='?', const='127.0.0.1:8765', default=None, metavar='HOST:PUERTO',
+                        help='Usar los navegadores de servicio_navegadores.py')
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    nombres = list(dict.fromkeys(args.sitios or POR_DEFECTO))
+    desconocidos = [n for n in nombres + [s for s, _ in args.url + args.args] if n not in SITIOS]
+    if desconocidos:
+        parser.error(f"sitios desconocidos: {', '.join(desconocidos)} (opciones: {', '.join(sorted(SITIOS))})")
+    urls = dict(args.url)
+    extras = dict(args.args)
+    comunes = {'workers': args.workers, 'cache': args.cache, 'replay': args.replay,
+               'completo': args.completo, 'servicio': args.servicio, 'adaptativo': args.adaptativo}
+    # Las opciones se validan todas antes de abrir ningún navegador
+    opciones = {n: SITIOS[n].opciones(urls.get(n), extras.get(n, ''), **comunes) for n in nombres}
+
+    campos = ['marketplace', 'sitio']
+    for n in nombres:
+        campos += [c for c in SITIOS[n].columnas(opciones[n]) if c not in campos]
+
+    lock = threading.Lock()
+    resultados = {}
+
+    with SalidaStreaming(args.output, campos, lote=args.lote) as salida:
+        def correr(nombre):
+            sitio = SITIOS[nombre]
+            fijos = {'marketplace': sitio.marketplace, 'sitio': nombre}
+            vista = SalidaEtiquetada(salida, sitio.columnas(opciones[nombre]), fijos, lock,
+                                     como_texto=salida.formato == 'parquet')
+            inicio = time.perf_counter()
+            try:
+                sitio.ejecutar(opciones[nombre], vista)
+                error = None
+            except Exception as e:
+                error = e
+                print(f"  ⚠️ {nombre} falló: {e!r}")
+            resultados[nombre] = (vista.total, time.perf_counter() - inicio, error)
+
+        inicio = time.perf_counter()
+        hilos = [threading.Thread(target=correr, args=(n,), name=n) for n in nombres]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        total = time.perf_counter() - inicio
+
+    print(f"\n{salida.total} filas guardadas en {args.output} en {total:.1f} s")
+    for nombre in nombres:
+        filas, segundos, error = resultados[nombre]
+        estado = f"error: {error!r}" if error else "ok"
+        print(f"  {nombre:<15} {filas:>6} filas  {segundos:7.1f} s  {estado}")
+    REGISTRO.imprimir()
+    if any(error for _, _, error in resultados.values()):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
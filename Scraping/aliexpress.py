@@ -1,100 +1,111 @@
-import time
-import csv
 import argparse
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from .cache_paginas import argumentos_cache, con_cache
+from .descarga import FetcherSelenium
+from .extraccion import parse_aliexpress
+from .navegador import argumentos_navegador, crear_driver as crear_chrome
+from .salida import SalidaStreaming
+from .servicio_navegadores import ClienteNavegador
+
+CAMPOS = ['name', 'price', 'discount', 'sold', 'rating']
+
 
 # Argumentos de línea de comandos
-parser = argparse.ArgumentParser(description='Extraer datos de productos de AliExpress')
-parser.add_argument('url', help='URL de la página de AliExpress a scrapear')
-parser.add_argument('--output', default='aliexpress_products.csv', help='Archivo CSV de salida')
-args = parser.parse_args()
-
-target_url = args.url
-output_file = args.output
-
-# Configuración de Chrome con Selenium
-options = webdriver.ChromeOptions()
-options.add_argument('--headless')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-dev-shm-usage')
-options.add_argument('--disable-gpu')
-options.add_argument('--disable-software-rasterizer')
-
-# Inicializar WebDriver
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=options
-)
-wait = WebDriverWait(driver, 15)
-
-
-def fetch_products(url):
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Extraer datos de productos de AliExpress')
+    parser.add_argument('url', help='URL de la página de AliExpress a scrapear')
+    parser.add_argument('--output', default='aliexpress_products.csv', help='Archivo de salida (.csv o .parquet)')
+    argumentos_cache(parser)
+    argumentos_navegador(parser)
+    return parser
+
+
+class FetcherScroll(FetcherSelenium):
+    """Carga la lista de productos haciendo scroll en su contenedor hasta el final (en la página)."""
+
+    def fetch(self, url, selector=None):
+        return cargar_lista(self.driver, url)
+
+
+# Scroll dentro del navegador: se repite hasta que la cantidad de tarjetas deja de
+# crecer durante `estable` ms y se devuelve solo el HTML de las tarjetas, todo en
+# un único viaje de ida y vuelta al WebDriver.
+SCRIPT_SCROLL = """
+const [selContenedor, selTarjeta, estable, limite, listo] = arguments;
+const inicio = Date.now();
+let contenedor = null, previo = -1, desde = Date.now();
+(function paso() {
+    contenedor = contenedor || document.querySelector(selContenedor);
+    if (contenedor) {
+        const n = contenedor.getElementsByClassName(selTarjeta).length;
+        if (n !== previo) {
+            previo = n;
+            desde = Date.now();
+        }
+        contenedor.scrollTop = contenedor.scrollHeight;
+    }
+    const ahora = Date.now();
+    if ((contenedor && ahora - desde >= estable) || ahora - inicio >= limite) {
+        const tarjetas = contenedor ? contenedor.getElementsByClassName(selTarjeta) : [];
+        listo(Array.from(tarjetas, t => t.outerHTML));
+        return;
+    }
+    setTimeout(paso, 100);
+})();
+"""
+
+
+def cargar_lista(driver, url, estable=3, limite=120):
+    """Carga la URL, hace scroll hasta que no aparecen más tarjetas y devuelve su HTML."""
     driver.get(url)
-    # Esperar a que cargue el contenedor de productos
-    container = wait.until(EC.presence_of_element_located(
-        (By.CSS_SELECTOR, 'div[data-spm="prodcutlist"]')
-    ))
-
-    # Scroll interno del contenedor para cargar todos los productos
-    prev_count = 0
-    while True:
-        cards = container.find_elements(By.CSS_SELECTOR, 'a._3mPKP')
-        count_before = len(cards)
-
-        # Scroll dentro del contenedor
-        driver.execute_script(
-            "arguments[0].scrollTop = arguments[0].scrollHeight;",
-            container
-        )
-
-        # Esperar hasta que aparezca al menos una tarjeta más (o timeout 10 s)
-        try:
-            wait.until(lambda d: len(container.find_elements(
-                By.CSS_SELECTOR, 'a._3mPKP'
-            )) > count_before, timeout=10)
-        except:
-            break
-
-        # Si el número no aumentó, terminamos
-        if len(container.find_elements(By.CSS_SELECTOR, 'a._3mPKP')) == count_before:
-            break
-
-    # Parsear HTML de la página completa
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    products = []
+    driver.set_script_timeout(limite + 10)
+    tarjetas = driver.execute_async_script(SCRIPT_SCROLL, *argumentos_scroll(estable, limite))
+    return documento_tarjetas(tarjetas)
+
+
+def argumentos_scroll(estable, limite):
+    return 'div[data-spm="prodcutlist"]', '_3mPKP', estable * 1000, limite * 1000
+
+
+def documento_tarjetas(tarjetas):
+    # Un documento mínimo con las tarjetas: parse_aliexpress no necesita el resto de la página
+    return '<html><body>' + ''.join(tarjetas) + '</body></html>'
+
+
+class ClienteScroll(ClienteNavegador):
+    """Mismo scroll en la página, pero ejecutado en un navegador del servicio."""
 
+    def fetch(self, url, selector=None, estable=3, limite=120):
+        return documento_tarjetas(self.ejecutar_async(url, SCRIPT_SCROLL, argumentos_scroll(estable, limite),
+                                                      timeout=limite + 10))
+
+
+def fetch_products(fetcher, url):
     # Extraer datos de cada producto
-    for a in soup.select('a._3mPKP'):
-        name = a.select_one('h3.yB6en').get_text(strip=True) if a.select_one('h3.yB6en') else ''
-        price = a.select_one('div._3Mpbo').get_text(strip=True) if a.select_one('div._3Mpbo') else ''
-        discount = a.select_one('span.W__kt').get_text(strip=True) if a.select_one('span.W__kt') else ''
-        sold = a.select_one('span.DUuR2').get_text(strip=True) if a.select_one('span.DUuR2') else ''
-        rating = a.select_one('span._2L2Tc').get_text(strip=True) if a.select_one('span._2L2Tc') else ''
-        products.append({
-            'name': name,
-            'price': price,
-            'discount': discount,
-            'sold': sold,
-            'rating': rating
-        })
-
-    return products
+    return parse_aliexpress(fetcher.fetch(url))
 
 
-if __name__ == '__main__':
-    data = fetch_products(target_url)
+def ejecutar(args, salida):
+    """Carga la lista completa de productos y la escribe en `salida`."""
+    # Inicializar WebDriver (solo si hay que descargar; en --replay no se abre)
+    def crear_driver():
+        return crear_chrome(headless=True, liviano=not args.completo)
+
+    fetcher = con_cache(lambda: ClienteScroll(args.servicio) if args.servicio else FetcherScroll(crear_driver),
+                        args.cache, args.replay)()
+    try:
+        salida.escribir(fetch_products(fetcher, args.url))
+    finally:
+        fetcher.cerrar()
 
-    # Guardar resultados en CSV
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=['name', 'price', 'discount', 'sold', 'rating'])
-        writer.writeheader()
-        for item in data:
-            writer.writerow(item)
 
-    print(f"Scraped {len(data)} products. Datos guardados en {output_file}")
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    # Guardar resultados
+    with SalidaStreaming(args.output, CAMPOS) as salida:
+        ejecutar(args, salida)
+
+    print(f"Scraped {salida.total} products. Datos guardados en {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,112 +1,79 @@
-import csv
 import argparse
-import time
-import re
-import unicodedata
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from .cache_paginas import argumentos_cache, con_cache
+from .control_dominios import argumentos_control, controlado, crear_control
+from .descarga import FetcherSelenium
+from .espera import REGISTRO
+from .extraccion import parse_amazon
+from .navegador import argumentos_navegador, crear_driver as crear_chrome
+from .pool_navegadores import PoolNavegadores
+from .salida import SalidaStreaming
+from .servicio_navegadores import ClienteNavegador
+
+CAMPOS = ['asin', 'title', 'price', 'rating', 'reviews', 'sales']
+
 
 # Argumentos
-parser = argparse.ArgumentParser(description='Scrapea resultados de búsqueda en Amazon')
-parser.add_argument('url', help='URL de búsqueda de Amazon')
-parser.add_argument('--output', default='amazon_products.csv', help='Archivo CSV de salida')
-parser.add_argument('--pages', type=int, default=1, help='Número de páginas a scrapear')
-args = parser.parse_args()
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Scrapea resultados de búsqueda en Amazon')
+    parser.add_argument('url', help='URL de búsqueda de Amazon')
+    parser.add_argument('--output', default='amazon_products.csv', help='Archivo de salida (.csv o .parquet)')
+    parser.add_argument('--pages', type=int, default=1, help='Número de páginas a scrapear')
+    parser.add_argument('--workers', type=int, default=1, help='Navegadores headless en paralelo')
+    parser.add_argument('--max-por-dominio', type=int, default=None,
+                        help='Máximo de páginas simultáneas por dominio (por defecto = workers)')
+    parser.add_argument('--lote', type=int, default=100,
+                        help='Filas por lote al volcar la salida (.csv o .parquet según la extensión)')
+    parser.add_argument('--registro-esperas', default=None,
+                        help='CSV opcional con la duración de cada espera de página')
+    argumentos_cache(parser)
+    argumentos_control(parser)
+    argumentos_navegador(parser)
+    return parser
 
-base_url = args.url
-output_file = args.output
-num_pages = args.pages
 
-# Configura Selenium
-options = webdriver.ChromeOptions()
-options.add_argument('--headless')
-options.add_argument('--no-sandbox')
-options.add_argument('--disable-dev-shm-usage')
-options.add_argument('--disable-gpu')
-options.add_argument('--disable-software-rasterizer')
+def parse_page(html):
+    return parse_amazon(html)
 
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=options
-)
-wait = WebDriverWait(driver, 15)
 
+def scrape_page(fetcher, url):
+    # Espera a que el número de resultados deje de crecer (sin pausa fija)
+    html = fetcher.fetch(url, 'div[data-component-type="s-search-result"]')
+    return parse_page(html)
 
-def clean_text(text):
-    t = unicodedata.normalize('NFKD', text)
-    return t.replace('\xa0', ' ').strip()
 
+def ejecutar(args, salida):
+    """Scrapea las páginas de resultados y escribe cada una en `salida` apenas se parsea."""
+    # Chrome headless y liviano salvo --completo; se abre solo si hace falta descargar
+    def crear_driver():
+        return crear_chrome(headless=True, liviano=not args.completo)
 
-def parse_page(html):
-    soup = BeautifulSoup(html, 'html.parser')
-    products = []
-    for item in soup.select('div[data-component-type="s-search-result"]'):
-        asin = item.get('data-asin', '')
-
-        # Título con fallback
-        title = ''
-        tag = item.select_one('h2 a span') or item.select_one('h2 span')
-        if tag:
-            title = clean_text(tag.get_text())
-
-        # Precio
-        price = ''
-        pw = item.select_one('span.a-price-whole')
-        pf = item.select_one('span.a-price-fraction')
-        if pw and pf:
-            whole = re.sub(r'[^0-9]', '', pw.get_text())
-            frac = re.sub(r'[^0-9]', '', pf.get_text())
-            if whole and frac:
-                price = f"{whole}.{frac}"
-
-        # Rating
-        rating = ''
-        rt = item.select_one('i.a-icon-star-small span.a-icon-alt')
-        if rt:
-            rating = rt.get_text().split()[0]
-
-        # Reviews count
-        reviews = ''
-        rv = item.select_one('span.a-size-base.s-underline-text')
-        if rv:
-            reviews = re.sub(r'[^0-9,]', '', rv.get_text())
-
-        # Sales info
-        sales = ''
-        sl = item.find('span', string=re.compile(r'comprad', re.IGNORECASE))
-        if sl:
-            sales = clean_text(sl.get_text())
-
-        products.append({
-            'asin': asin,
-            'title': title,
-            'price': price,
-            'rating': rating,
-            'reviews': reviews,
-            'sales': sales
-        })
-    return products
+    # Cada worker usa su propio navegador y la caché si se pidió
+    # (o un cliente del servicio de navegadores con --servicio). Con --adaptativo,
+    # las descargas reales (no los aciertos de caché) pasan por el control por dominio.
+    control = crear_control(args)
+    nuevo_fetcher = con_cache(lambda: controlado(ClienteNavegador(args.servicio) if args.servicio
+                                                 else FetcherSelenium(crear_driver, pausa_fija=2), control),
+                              args.cache, args.replay)
+
+    urls = [f"{args.url}&page={page}" for page in range(1, args.pages + 1)]
+    with PoolNavegadores(nuevo_fetcher, workers=args.workers,
+                         limite_por_dominio=args.max_por_dominio) as pool:
+        for productos in pool.imap(scrape_page, urls):
+            salida.escribir(productos)
+    if control is not None:
+        control.imprimir()
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    with SalidaStreaming(args.output, CAMPOS, lote=args.lote) as salida:
+        ejecutar(args, salida)
+
+    print(f"Scraped {salida.total} productos. Guardados en {args.output}")
+    REGISTRO.imprimir()
+    if args.registro_esperas:
+        REGISTRO.guardar_csv(args.registro_esperas)
 
 
 if __name__ == '__main__':
-    all_products = []
-    for page in range(1, num_pages + 1):
-        url = f"{base_url}&page={page}"
-        driver.get(url)
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-component-type="s-search-result"]')))
-        time.sleep(2)
-        all_products.extend(parse_page(driver.page_source))
-
-    # Guardar CSV
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['asin','title','price','rating','reviews','sales'])
-        writer.writeheader()
-        for prod in all_products:
-            writer.writerow(prod)
-
-    print(f"Scraped {len(all_products)} productos. Guardados en {output_file}")
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import os
+import re
+import time
+from bs4 import BeautifulSoup
+from . import extraccion
+
+# Benchmark del motor de extracción (lxml) contra los parsers originales con
+# BeautifulSoup sobre las páginas guardadas en fixtures/. Comprueba además que
+# ambos produzcan exactamente las mismas filas.
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+# --- PARSERS ORIGINALES (BeautifulSoup + html.parser) ---
+
+def bs4_amazon(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    products = []
+    for item in soup.select('div[data-component-type="s-search-result"]'):
+        asin = item.get('data-asin', '')
+        title = ''
+        tag = item.select_one('h2 a span') or item.select_one('h2 span')
+        if tag:
+            title = extraccion.clean_text(tag.get_text())
+        price = ''
+        pw = item.select_one('span.a-price-whole')
+        pf = item.select_one('span.a-price-fraction')
+        if pw and pf:
+            whole = re.sub(r'[^0-9]', '', pw.get_text())
+            frac = re.sub(r'[^0-9]', '', pf.get_text())
+            if whole and frac:
+                price = f"{whole}.{frac}"
+        rating = ''
+        rt = item.select_one('i.a-icon-star-small span.a-icon-alt')
+        if rt:
+            rating = rt.get_text().split()[0]
+        reviews = ''
+        rv = item.select_one('span.a-size-base.s-underline-text')
+        if rv:
+            reviews = re.sub(r'[^0-9,]', '', rv.get_text())
+        sales = ''
+        sl = item.find('span', string=re.compile(r'comprad', re.IGNORECASE))
+        if sl:
+            sales = extraccion.clean_text(sl.get_text())
+        products.append({'asin': asin, 'title': title, 'price': price,
+                         'rating': rating, 'reviews': reviews, 'sales': sales})
+    return products
+
+
+def bs4_ml_mas_vendidos(html, category, limite=None):
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = soup.select('div.poly-card--grid-card')
+    results = []
+    for idx, card in enumerate(cards[:limite], start=1):
+        label_tag = card.select_one('span.poly-component__highlight')
+        title_tag = card.select_one('a.poly-component__title')
+        rating_tag = card.select_one('span.poly-reviews__rating')
+        total_tag = card.select_one('span.poly-reviews__total')
+        price_tag = card.select_one('span.andes-money-amount__fraction')
+        results.append({
+            'category': category,
+            'position': idx,
+            'label': label_tag.get_text(strip=True) if label_tag else '',
+            'title': title_tag.get_text(strip=True) if title_tag else '',
+            'rating': rating_tag.get_text(strip=True) if rating_tag else '',
+            'reviews_count': total_tag.get_text(strip=True).strip('()') if total_tag else '',
+            'price': price_tag.get_text(strip=True) if price_tag else ''
+        })
+    return results
+
+
+def bs4_ml_listado(html, nombre_categoria):
+    soup = BeautifulSoup(html, "html.parser")
+    filas = []
+    for item in soup.select("div.ui-search-result__wrapper"):
+        try:
+            calificacion = item.select_one("span.poly-reviews__rating").get_text(strip=True)
+            num_calificaciones = item.select_one("span.poly-reviews__total").get_text(strip=True).strip("()")
+        except:
+            continue
+        try:
+            precio = item.select_one("div.poly-price__current span.andes-money-amount__fraction").get_text(strip=True)
+        except:
+            precio = ""
+        try:
+            precio_anterior = item.select_one("s span.andes-money-amount__fraction").get_text(strip=True)
+        except:
+            precio_anterior = ""
+        try:
+            descuento = item.select_one("span.andes-money-amount__discount").get_text(strip=True)
+        except:
+            descuento = ""
+        filas.append([nombre_categoria, precio, precio_anterior, descuento,
+                      calificacion, num_calificaciones])
+    return filas
+
+
+def bs4_aliexpress(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    products = []
+    for a in soup.select('a._3mPKP'):
+        products.append({
+            'name': a.select_one('h3.yB6en').get_text(strip=True) if a.select_one('h3.yB6en') else '',
+            'price': a.select_one('div._3Mpbo').get_text(strip=True) if a.select_one('div._3Mpbo') else '',
+            'discount': a.select_one('span.W__kt').get_text(strip=True) if a.select_one('span.W__kt') else '',
+            'sold': a.select_one('span.DUuR2').get_text(strip=True) if a.select_one('span.DUuR2') else '',
+            'rating': a.select_one('span._2L2Tc').get_text(strip=True) if a.select_one('span._2L2Tc') else '',
+        })
+    return products
+
+
+# (fixture, parser original, parser nuevo)
+CASOS = [
+    ('amazon_busqueda.html', bs4_amazon, extraccion.parse_amazon),
+    ('ml_mas_vendidos.html', lambda h: bs4_ml_mas_vendidos(h, 'Aves'),
+     lambda h: extraccion.parse_ml_mas_vendidos(h, 'Aves')),
+    ('ml_listado.html', lambda h: bs4_ml_listado(h, 'Gatos'),
+     lambda h: extraccion.parse_ml_listado(h, 'Gatos')),
+    ('aliexpress_productos.html', bs4_aliexpress, extraccion.parse_aliexpress),
+]
+
+
+def medir(parser, html, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        filas = parser(html)
+    return time.perf_counter() - inicio, filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de extracción: BeautifulSoup vs lxml')
+    parser.add_argument('--repeticiones', type=int, default=20, help='Veces que se parsea cada página')
+    args = parser.parse_args()
+
+    print(f"{'fixture':28} {'tarjetas':>8} {'bs4 tarj/s':>12} {'lxml tarj/s':>12} {'x':>6}")
+    for nombre, original, nuevo in CASOS:
+        with open(os.path.join(FIXTURES, nombre), encoding='utf-8') as f:
+            html = f.read()
+        t_bs4, filas_bs4 = medir(original, html, args.repeticiones)
+        t_lxml, filas_lxml = medir(nuevo, html, args.repeticiones)
+        if filas_bs4 != filas_lxml:
+            raise SystemExit(f"❌ {nombre}: las filas no coinciden con el parser original")
+        tarjetas = len(filas_lxml) * args.repeticiones
+        print(f"{nombre:28} {len(filas_lxml):>8} {tarjetas / t_bs4:>12.0f} "
+              f"{tarjetas / t_lxml:>12.0f} {t_bs4 / t_lxml:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
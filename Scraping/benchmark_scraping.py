@@ -0,0 +1,288 @@
+import argparse
+import collections
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from . import extraccion
+from .aliexpress import CAMPOS as CAMPOS_ALIEXPRESS
+from .amazon import CAMPOS as CAMPOS_AMAZON
+from .categoriamascotas import columnas as CAMPOS_LISTADO
+from .descarga import crear_fetcher
+from .mercado_libre import CAMPOS as CAMPOS_ML
+from .navegador import crear_driver
+from .pool_navegadores import PoolNavegadores
+from .salida import SalidaStreaming
+from .servicio_navegadores import memoria_mb
+from .servidor_mock import FIXTURES, POR_PAGINA_ML, ServidorMock
+
+# Benchmark del scraping sin tocar los sitios reales, sobre las páginas de fixtures/:
+#
+# - parseo: solo la extracción, parseando el fixture de cada sitio N veces.
+# - e2e: descarga desde el marketplace local (servidor_mock.py, con latencia y
+#   paginación), parseo y escritura a CSV, con el pool de workers de los scrapers.
+#   Con --backend selenium las páginas se cargan en Chrome headless.
+#
+# Cada caso corre en un proceso aparte para que el pico de RSS sea solo suyo. Los
+# resultados se comparan con la línea base para detectar regresiones. Los tiempos
+# absolutos dependen de la máquina, así que la línea base no se versiona: cada
+# uno la graba en la suya (antes de los cambios) y compara contra ella.
+#
+#   python -m Scraping.benchmark_scraping --guardar-base
+#   python -m Scraping.benchmark_scraping --comparar
+#   python -m Scraping.benchmark_scraping --modo e2e --backend selenium --paginas 20
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_linea_base.json')
+MODOS = ('parseo', 'e2e')
+
+Adaptador = collections.namedtuple('Adaptador', 'ruta fixture selector parsear campos')
+
+ADAPTADORES = {
+    'amazon': Adaptador('/amazon', 'amazon_busqueda.html', 'div[data-component-type="s-search-result"]',
+                        extraccion.parse_amazon, CAMPOS_AMAZON),
+    'ml_mas_vendidos': Adaptador('/ml/mas-vendidos', 'ml_mas_vendidos.html', 'div.poly-card--grid-card',
+                                 lambda html: extraccion.parse_ml_mas_vendidos(html, 'Aves'), CAMPOS_ML),
+    'ml_listado': Adaptador('/ml/listado', 'ml_listado.html', 'div.ui-search-result__wrapper',
+                            lambda html: extraccion.parse_ml_listado(html, 'Gatos'), CAMPOS_LISTADO),
+    'aliexpress': Adaptador('/aliexpress', 'aliexpress_productos.html', 'a._3mPKP',
+                            extraccion.parse_aliexpress, CAMPOS_ALIEXPRESS),
+}
+
+
+def url_pagina(base, adaptador, pagina):
+    """URL de la página `pagina` (desde 1) con la paginación de cada sitio."""
+    if adaptador.ruta == '/ml/listado':
+        return f"{base}{adaptador.ruta}_Desde_{(pagina - 1) * POR_PAGINA_ML}" if pagina > 1 else base + adaptador.ruta
+    return f"{base}{adaptador.ruta}?page={pagina}"
+
+
+def pico_rss_mb():
+    """Pico de memoria residente de este proceso (ru_maxrss está en KB en Linux y en bytes en macOS)."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+class MuestreoMemoria:
+    """Máximo del RSS del proceso y sus descendientes (Chrome) muestreado en segundo plano."""
+
+    def __init__(self, intervalo=0.1):
+        self.intervalo = intervalo
+        self.maximo = None
+        self._fin = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        while not self._fin.is_set():
+            actual = memoria_mb(os.getpid())
+            if actual is None:
+                return
+            self.maximo = actual if self.maximo is None else max(self.maximo, actual)
+            self._fin.wait(self.intervalo)
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._fin.set()
+        self._hilo.join()
+
+
+def medir_parseo(nombre, repeticiones):
+    adaptador = ADAPTADORES[nombre]
+    with open(os.path.join(FIXTURES, adaptador.fixture), encoding='utf-8') as f:
+        html = f.read()
+    adaptador.parsear(html)  # Calentamiento (imports perezosos, cachés de lxml)
+    tarjetas = 0
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        tarjetas += len(adaptador.parsear(html))
+    return repeticiones, tarjetas, time.perf_counter() - inicio
+
+
+def medir_e2e(nombre, url_mock, paginas, workers, backend):
+    adaptador = ADAPTADORES[nombre]
+    urls = [url_pagina(url_mock, adaptador, i) for i in range(1, paginas + 1)]
+    nuevo_fetcher = lambda: crear_fetcher(backend, lambda: crear_driver(headless=True))
+
+    def procesar(fetcher, url):
+        return adaptador.parsear(fetcher.fetch(url, adaptador.selector))
+
+    vacias = 0
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = time.perf_counter()
+        with SalidaStreaming(os.path.join(directorio, 'salida.csv'), adaptador.campos) as salida, \
+                PoolNavegadores(nuevo_fetcher, workers=workers) as pool:
+            for filas in pool.imap(procesar, urls):
+                vacias += not filas
+                salida.escribir(filas)
+        segundos = time.perf_counter() - inicio
+    if vacias:
+        raise RuntimeError(f"{vacias} de {paginas} páginas llegaron sin tarjetas")
+    return paginas, salida.total, segundos
+
+
+def correr_caso(args):
+    """Mide un caso en este proceso y devuelve el resultado como dict."""
+    modo, nombre = args.caso.split(':')
+    with MuestreoMemoria() as muestreo:
+        if modo == 'parseo':
+            paginas, tarjetas, segundos = medir_parseo(nombre, args.repeticiones)
+        else:
+            paginas, tarjetas, segundos = medir_e2e(nombre, args.url_mock, args.paginas, args.workers, args.backend)
+    resultado = {
+        'caso': args.caso,
+        'paginas': paginas,
+        'tarjetas': tarjetas,
+        'segundos': round(segundos, 4),
+        'paginas_s': round(paginas / segundos, 2),
+        'tarjetas_s': round(tarjetas / segundos, 1),
+        'rss_mb': round(pico_rss_mb(), 1),
+    }
+    if muestreo.maximo is not None and modo == 'e2e' and args.backend != 'http':
+        resultado['rss_arbol_mb'] = round(muestreo.maximo, 1)  # Incluye chromedriver y Chrome
+    return resultado
+
+
+def correr_en_subproceso(caso, args, url_mock=None):
+    comando = [sys.executable, '-m', 'Scraping.benchmark_scraping', '--caso', caso,
+               '--repeticiones', str(args.repeticiones), '--paginas', str(args.paginas),
+               '--workers', str(args.workers), '--backend', args.backend]
+    if url_mock:
+        comando += ['--url-mock', url_mock]
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proceso = subprocess.run(comando, cwd=raiz, capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"{caso} falló:\n{proceso.stderr.strip()}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def configuracion(args):
+    """Parámetros que tienen que coincidir para que dos corridas sean comparables."""
+    return {'repeticiones': args.repeticiones, 'paginas': args.paginas, 'workers': args.workers,
+            'backend': args.backend, 'latencia': args.latencia}
+
+
+def maquina():
+    """Identifica la máquina donde se midió (una línea base solo vale en la misma)."""
+    return {'nodo': platform.node(), 'procesador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count()}
+
+
+def comparar(resultados, base, tolerancia):
+    """Lista de regresiones respecto de la línea base.
+
+    La cantidad de tarjetas tiene que ser idéntica (si cambia, cambió un parser);
+    páginas/s puede bajar y el pico de RSS subir hasta `tolerancia` (fracción).
+    """
+    regresiones = []
+    anteriores = base.get('resultados', {})
+    for caso, r in resultados.items():
+        b = anteriores.get(caso)
+        if b is None:
+            continue
+        if r['tarjetas'] != b['tarjetas']:
+            regresiones.append(f"{caso}: {r['tarjetas']} tarjetas, la línea base tiene {b['tarjetas']}")
+        if r['paginas_s'] < b['paginas_s'] * (1 - tolerancia):
+            regresiones.append(f"{caso}: {r['paginas_s']} páginas/s, línea base {b['paginas_s']}")
+        if r['rss_mb'] > b['rss_mb'] * (1 + tolerancia):
+            regresiones.append(f"{caso}: pico RSS {r['rss_mb']} MB, línea base {b['rss_mb']} MB")
+    return regresiones
+
+
+def imprimir(resultados, base):
+    anteriores = base.get('resultados', {}) if base else {}
+    print(f"\n{'caso':26} {'páginas':>7} {'tarjetas':>8} {'pág/s':>9} {'tarj/s':>10} {'RSS MB':>7} {'vs base':>8}")
+    for caso, r in resultados.items():
+        b = anteriores.get(caso)
+        relativo = f"{r['paginas_s'] / b['paginas_s']:>7.2f}x" if b else '-'
+        rss = f"{r['rss_mb']}" + (f" ({r['rss_arbol_mb']})" if 'rss_arbol_mb' in r else '')
+        print(f"{caso:26} {r['paginas']:>7} {r['tarjetas']:>8} {r['paginas_s']:>9} {r['tarjetas_s']:>10} "
+              f"{rss:>7} {relativo:>8}")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Benchmark offline del scraping con fixtures y un marketplace local')
+    parser.add_argument('--modo', choices=MODOS + ('todo',), default='todo',
+                        help='parseo (solo extracción), e2e (descarga + parseo + CSV) o ambos')
+    parser.add_argument('--adaptadores', nargs='+', choices=sorted(ADAPTADORES), default=list(ADAPTADORES))
+    parser.add_argument('--repeticiones', type=int, default=200, help='Veces que se parsea cada fixture')
+    parser.add_argument('--paginas', type=int, default=40, help='Páginas descargadas por sitio en e2e')
+    parser.add_argument('--workers', type=int, default=4, help='Workers del pool en e2e')
+    parser.add_argument('--latencia', type=float, default=0.05, help='Segundos por respuesta del marketplace local')
+    parser.add_argument('--backend', choices=('http', 'selenium'), default='http',
+                        help='Descarga en e2e: HTTP o Chrome headless')
+    parser.add_argument('--base', default=LINEA_BASE, help='JSON con la línea base (local, no se versiona)')
+    parser.add_argument('--comparar', action='store_true',
+                        help='Comparar con la línea base y salir con error si hay regresiones')
+    parser.add_argument('--tolerancia', type=float, default=0.3,
+                        help='Fracción que pueden empeorar páginas/s y RSS antes de contar como regresión')
+    parser.add_argument('--guardar-base', action='store_true', help='Guardar estos resultados como línea base')
+    parser.add_argument('--json', default=None, help='Guardar los resultados en este JSON')
+    # Uso interno: medir un único caso en este proceso
+    parser.add_argument('--caso', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--url-mock', default=None, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.caso:
+        print(json.dumps(correr_caso(args)))
+        return
+
+    modos = MODOS if args.modo == 'todo' else (args.modo,)
+    resultados = {}
+    for modo in modos:
+        for nombre in args.adaptadores:
+            caso = f"{modo}:{nombre}"
+            print(f"Midiendo {caso}...")
+            if modo == 'parseo':
+                resultados[caso] = correr_en_subproceso(caso, args)
+            else:
+                # El marketplace corre en este proceso, así no suma al RSS del caso
+                with ServidorMock(latencia=args.latencia, capacidad=max(4, args.workers),
+                                  paginas=args.paginas) as servidor:
+                    resultados[caso] = correr_en_subproceso(caso, args, servidor.url)
+
+    base = None
+    if os.path.exists(args.base):
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        if base.get('configuracion') != configuracion(args):
+            print(f"⚠️ La línea base se midió con otra configuración: {base.get('configuracion')}")
+        if base.get('maquina') != maquina():
+            print(f"⚠️ La línea base se midió en otra máquina ({base.get('maquina')}): los tiempos no son comparables")
+    imprimir(resultados, base)
+
+    datos = {'configuracion': configuracion(args), 'maquina': maquina(), 'python': sys.version.split()[0],
+             'resultados': resultados}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2)
+    if args.guardar_base:
+        if base and base.get('configuracion') == configuracion(args) and base.get('maquina') == maquina():
+            # Los casos que no se midieron ahora conservan su valor anterior
+            datos['resultados'] = {**base.get('resultados', {}), **resultados}
+        with open(args.base, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"Línea base guardada en {args.base}")
+    if args.comparar:
+        if base is None:
+            raise SystemExit(f"No hay línea base en {args.base} (generarla con --guardar-base)")
+        regresiones = comparar(resultados, base, args.tolerancia)
+        for regresion in regresiones:
+            print(f"❌ {regresion}")
+        if regresiones:
+            raise SystemExit(1)
+        print("✅ Sin regresiones respecto de la línea base")
+
+
+if __name__ == '__main__':
+    main()
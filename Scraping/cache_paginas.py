@@ -0,0 +1,160 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DIRECTORIO_CACHE = '.cache_paginas'
+
+
+class CachePaginas:
+    """Caché en disco de page_source comprimido y direccionado por contenido.
+
+    Cada HTML se guarda una sola vez en `objetos/<hh>/<sha256>.z` (zlib) aunque lo
+    devuelvan varias URLs; un índice SQLite asocia cada URL con el hash de su
+    última versión. Las entradas vencen tras `ttl` segundos y, si el total supera
+    `max_bytes`, se eliminan las menos usadas recientemente.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, ttl=14 * 86400, max_bytes=2 * 1024 ** 3):
+        self.directorio = directorio
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directorio, 'objetos'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directorio, 'indice.sqlite'), check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY, hash TEXT NOT NULL, guardado REAL, usado REAL);
+            CREATE TABLE IF NOT EXISTS objetos (hash TEXT PRIMARY KEY, bytes INTEGER);
+            CREATE INDEX IF NOT EXISTS idx_urls_hash ON urls (hash);
+        ''')
+        self.purgar()
+
+    def _ruta(self, h):
+        return os.path.join(self.directorio, 'objetos', h[:2], h + '.z')
+
+    def guardar(self, url, html):
+        """Guarda el HTML de la URL y devuelve su hash de contenido."""
+        datos = html.encode('utf-8')
+        h = hashlib.sha256(datos).hexdigest()
+        ruta = self._ruta(h)
+        if not os.path.exists(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            comprimido = zlib.compress(datos, 6)
+            temporal = f"{ruta}.{threading.get_ident()}.tmp"
+            with open(temporal, 'wb') as f:
+                f.write(comprimido)
+            os.replace(temporal, ruta)
+        else:
+            comprimido = None
+        ahora = time.time()
+        with self._lock, self.conn:
+            if comprimido is not None:
+                self.conn.execute('INSERT OR REPLACE INTO objetos (hash, bytes) VALUES (?, ?)',
+                                  (h, len(comprimido)))
+            self.conn.execute('INSERT OR REPLACE INTO urls (url, hash, guardado, usado) VALUES (?, ?, ?, ?)',
+                              (url, h, ahora, ahora))
+        if comprimido is not None and self.tamano() > self.max_bytes:
+            self.purgar()
+        return h
+
+    def obtener(self, url):
+        """Devuelve el HTML guardado para la URL, o None si no está o venció."""
+        with self._lock:
+            fila = self.conn.execute('SELECT hash, guardado FROM urls WHERE url = ?', (url,)).fetchone()
+        if fila is None or time.time() - fila[1] > self.ttl:
+            return None
+        try:
+            with open(self._ruta(fila[0]), 'rb') as f:
+                html = zlib.decompress(f.read()).decode('utf-8')
+        except FileNotFoundError:
+            return None
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE urls SET usado = ? WHERE url = ?', (time.time(), url))
+        return html
+
+    def tamano(self):
+        with self._lock:
+            return self.conn.execute('SELECT COALESCE(SUM(bytes), 0) FROM objetos').fetchone()[0]
+
+    def purgar(self):
+        """Elimina entradas vencidas, objetos huérfanos y, por LRU, lo que exceda max_bytes."""
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM urls WHERE guardado < ?', (time.time() - self.ttl,))
+            total = self.conn.execute('SELECT COALESCE(SUM(bytes), 0) FROM objetos').fetchone()[0]
+            if total > self.max_bytes:
+                # Objetos ordenados por su último uso; se libera hasta quedar en el 90 %
+                usados = self.conn.execute('''
+                    SELECT o.hash, o.bytes FROM objetos o JOIN urls u ON u.hash = o.hash
+                    GROUP BY o.hash ORDER BY MAX(u.usado)''').fetchall()
+                for h, tam in usados:
+                    if total <= self.max_bytes * 0.9:
+                        break
+                    self.conn.execute('DELETE FROM urls WHERE hash = ?', (h,))
+                    total -= tam
+            huerfanos = self.conn.execute(
+                'SELECT hash FROM objetos WHERE hash NOT IN (SELECT hash FROM urls)').fetchall()
+            for (h,) in huerfanos:
+                self.conn.execute('DELETE FROM objetos WHERE hash = ?', (h,))
+                try:
+                    os.remove(self._ruta(h))
+                except FileNotFoundError:
+                    pass
+
+    def cerrar(self):
+        self.conn.close()
+
+
+class FetcherCache:
+    """Envuelve un fetcher: guarda cada página descargada y, en modo replay, solo lee de la caché.
+
+    En replay no se crea ningún navegador ni sesión HTTP; las URLs que no estén en
+    caché se devuelven vacías (el parser no extrae filas) y se avisa por consola.
+    """
+
+    def __init__(self, origen, cache, replay=False):
+        self.origen = origen
+        self.cache = cache
+        self.replay = replay
+        self._estadisticas = {'cache': 0, 'sin_cache': 0}
+
+    @property
+    def estadisticas(self):
+        estadisticas = dict(getattr(self.origen, 'estadisticas', {}))
+        estadisticas.update(self._estadisticas)
+        return estadisticas
+
+    def fetch(self, url, selector=None):
+        if self.replay:
+            html = self.cache.obtener(url)
+            if html is None:
+                print(f"  ⚠️ {url} no está en la caché")
+                self._estadisticas['sin_cache'] += 1
+                return ''
+            self._estadisticas['cache'] += 1
+            return html
+        html = self.origen.fetch(url, selector)
+        self.cache.guardar(url, html)
+        return html
+
+    def cerrar(self):
+        if self.origen is not None:
+            self.origen.cerrar()
+
+
+def argumentos_cache(parser):
+    """Agrega --cache y --replay a un ArgumentParser."""
+    parser.add_argument('--cache', nargs='?', const=DIRECTORIO_CACHE, default=None,
+                        help=f'Guardar cada página descargada en la caché (por defecto {DIRECTORIO_CACHE})')
+    parser.add_argument('--replay', action='store_true',
+                        help='Parsear desde la caché sin abrir el navegador ni descargar nada')
+
+
+def con_cache(crear_origen, directorio=None, replay=False):
+    """Devuelve una fábrica de fetchers que pasan por la caché si hay directorio o replay."""
+    if not directorio and not replay:
+        return crear_origen
+    cache = CachePaginas(directorio or DIRECTORIO_CACHE)
+    return lambda: FetcherCache(None if replay else crear_origen(), cache, replay)
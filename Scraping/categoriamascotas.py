@@ -1,13 +1,24 @@
-import time
-import csv
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import argparse
+from .cache_paginas import argumentos_cache, con_cache
+from .control_dominios import argumentos_control, controlado, crear_control
+from .descarga import BACKENDS, crear_fetcher, sumar_estadisticas
+from .espera import REGISTRO
+from .extraccion import parse_ml_listado
+from .frontera import Frontera, recorrer
+from .navegador import argumentos_navegador, crear_driver as crear_chrome
+from .pool_navegadores import PoolNavegadores
+from .salida import SalidaStreaming
+from .servicio_navegadores import ClienteNavegador
 
-# Configuración del navegador
-chrome_options = Options()
-chrome_options.add_argument("--start-maximized")
-driver = webdriver.Chrome(options=chrome_options)
+# Valores por defecto (se pueden cambiar por línea de comandos)
+# Backend de descarga: "http", "selenium" o "auto" (HTTP y Chrome solo si hace falta)
+BACKEND = "auto"
+# Archivo de salida (.csv o .parquet); cada página se guarda apenas se parsea
+ARCHIVO_SALIDA = "productos_gatos_por_categoria.csv"
+# Frontera persistente: si el scraping se interrumpe, la siguiente ejecución continúa donde quedó
+ARCHIVO_FRONTERA = "frontera_gatos.sqlite"
+# Páginas descargadas en paralelo
+WORKERS = 1
 
 # Diccionario con las categorías y sus URLs
 enlaces_categorias = {
@@ -19,56 +30,105 @@ enlaces_categorias = {
 }
 
 paginas = 10
-productos = []
-
-# Iterar por cada categoría
-for nombre_categoria, url_base in enlaces_categorias.items():
-    print(f"\n🔎 Procesando categoría: {nombre_categoria}")
-    for i in range(paginas):
-        offset = i * 50
-        url = f"{url_base}_Desde_{offset}" if i > 0 else url_base
-        driver.get(url)
-        time.sleep(4)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        items = soup.select("div.ui-search-result__wrapper")
-
-        for item in items:
-            try:
-                calificacion = item.select_one("span.poly-reviews__rating").get_text(strip=True)
-                num_calificaciones = item.select_one("span.poly-reviews__total").get_text(strip=True).strip("()")
-            except:
-                continue  # Saltar productos sin calificación
-
-            try:
-                precio = item.select_one("div.poly-price__current span.andes-money-amount__fraction").get_text(strip=True)
-            except:
-                precio = ""
-
-            try:
-                precio_anterior = item.select_one("s span.andes-money-amount__fraction").get_text(strip=True)
-            except:
-                precio_anterior = ""
-
-            try:
-                descuento = item.select_one("span.andes-money-amount__discount").get_text(strip=True)
-            except:
-                descuento = ""
-
-            productos.append([
-                nombre_categoria, precio, precio_anterior, descuento,
-                calificacion, num_calificaciones
-            ])
-        print(f"  Página {i+1} lista. Productos acumulados: {len(productos)}")
-
-# Guardar en CSV
-with open("productos_gatos_por_categoria.csv", "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow([
-        "Categoría", "Precio actual", "Precio anterior",
-        "Descuento", "Calificación", "N° Calificaciones"
-    ])
-    writer.writerows(productos)
-
-print("\n✅ Scraping finalizado. Total productos con calificación:", len(productos))
-driver.quit()
+columnas = [
+    "Categoría", "Precio actual", "Precio anterior",
+    "Descuento", "Calificación", "N° Calificaciones"
+]
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Scrapea los listados de Mercado Libre de cada categoría de gatos')
+    parser.add_argument('--output', default=ARCHIVO_SALIDA, help='Archivo de salida (.csv o .parquet)')
+    parser.add_argument('--pages', type=int, default=paginas, help='Páginas de 50 productos por categoría')
+    parser.add_argument('--backend', choices=BACKENDS, default=BACKEND,
+                        help='Backend de descarga: HTTP, Selenium o auto (HTTP con respaldo en Chrome)')
+    parser.add_argument('--workers', type=int, default=WORKERS, help='Páginas descargadas en paralelo')
+    parser.add_argument('--max-por-dominio', type=int, default=None,
+                        help='Máximo de páginas simultáneas por dominio (por defecto = workers)')
+    parser.add_argument('--frontera', default=ARCHIVO_FRONTERA,
+                        help='Archivo SQLite de la frontera; si existe un recorrido sin terminar se reanuda')
+    argumentos_cache(parser)
+    argumentos_control(parser)
+    argumentos_navegador(parser)
+    return parser
+
+
+def paginas_a_visitar(num_paginas=paginas):
+    """Lista de (url, [categoria, i]) en el mismo orden que el recorrido secuencial."""
+    visitas = []
+    for nombre_categoria, url_base in enlaces_categorias.items():
+        for i in range(num_paginas):
+            offset = i * 50
+            url = f"{url_base}_Desde_{offset}" if i > 0 else url_base
+            visitas.append((url, [nombre_categoria, i]))
+    return visitas
+
+
+def abrir_frontera(args):
+    frontera = Frontera(args.frontera)
+    reanudando = frontera.iniciar_recorrido(paginas_a_visitar(args.pages))
+    if reanudando:
+        print(f"↩️ Reanudando scraping anterior: {frontera.conteos()}")
+    return frontera
+
+
+def ejecutar(args, salida, frontera=None):
+    """Recorre las páginas pendientes y escribe los productos con calificación en `salida`.
+
+    Devuelve las páginas servidas por cada backend.
+    """
+    # Configuración del navegador (solo se abre si el backend lo necesita)
+    def crear_driver():
+        return crear_chrome(headless=args.workers > 1, liviano=not args.completo, maximizada=True)
+
+    fetchers = []
+    crear_navegador = (lambda: ClienteNavegador(args.servicio)) if args.servicio else None
+    # Con --adaptativo, la concurrencia y la pausa por dominio las regula el control
+    control = crear_control(args)
+    crear_fetcher_cache = con_cache(lambda: controlado(crear_fetcher(args.backend, crear_driver, pausa_fija=4,
+                                                                     crear_navegador=crear_navegador,
+                                                                     reintentar_estados=control is None), control),
+                                    args.cache, args.replay)
+
+    def nuevo_fetcher():
+        fetcher = crear_fetcher_cache()
+        fetchers.append(fetcher)
+        return fetcher
+
+    if frontera is None:
+        frontera = abrir_frontera(args)
+    categoria_de_url = {url: categoria for url, (categoria, _) in paginas_a_visitar(args.pages)}
+
+    def procesar_pagina(fetcher, url):
+        html = fetcher.fetch(url, "div.ui-search-result__wrapper")
+        # Los productos sin calificación se omiten
+        return parse_ml_listado(html, categoria_de_url[url])
+
+    # Iterar por cada página pendiente (en paralelo si --workers > 1; el orden se conserva)
+    with PoolNavegadores(nuevo_fetcher, workers=args.workers, limite_por_dominio=args.max_por_dominio) as pool:
+        for url, (nombre_categoria, i), filas in recorrer(frontera, pool, procesar_pagina, salida):
+            if i == 0:
+                print(f"\n🔎 Procesando categoría: {nombre_categoria}")
+            print(f"  Página {i+1} lista. Productos: {len(filas)}")
+
+    print("Estado de la frontera:", frontera.conteos())
+    frontera.cerrar()
+    if control is not None:
+        control.imprimir()
+    return sumar_estadisticas(fetchers)
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    frontera = abrir_frontera(args)
+    with SalidaStreaming(args.output, columnas, anexar=frontera.reanudando) as salida:
+        estadisticas = ejecutar(args, salida, frontera)
+
+    print("\n✅ Scraping finalizado. Total productos con calificación:", salida.total)
+    if estadisticas:
+        print("Páginas por backend:", estadisticas)
+    REGISTRO.imprimir()
+
+
+if __name__ == '__main__':
+    main()
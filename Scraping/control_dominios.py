@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from .descarga import marcadores
+
+# Control adaptativo por dominio (AIMD): cada respuesta sana sube de a poco la
+# concurrencia y baja la pausa entre solicitudes; una señal de saturación
+# (latencia alta, error HTTP, captcha o grilla vacía) recorta la concurrencia a
+# la mitad y duplica la pausa. Así cada sitio converge a lo que tolera.
+
+SENALES = ('ok', 'lento', 'error', 'bloqueo', 'vacio')
+# Textos que delatan una página de verificación en lugar del contenido
+MARCAS_BLOQUEO = ('validatecaptcha', 'robot check', 'g-recaptcha', 'px-captcha', 'are you a human',
+                  'unusual traffic', 'account-verification', '/captcha/')
+ESTADOS_BLOQUEO = (403, 429, 503)
+
+
+def clasificar(html, selector=None):
+    """Señal de una página descargada: 'bloqueo' (captcha), 'vacio' (sin tarjetas) u 'ok'."""
+    minusculas = html.lower()
+    if any(marca in minusculas for marca in MARCAS_BLOQUEO):
+        return 'bloqueo'
+    if selector and not all(m in html for m in marcadores(selector)):
+        return 'vacio'
+    return 'ok'
+
+
+class EstadoDominio:
+    def __init__(self, concurrencia, pausa):
+        self.concurrencia = float(concurrencia)
+        self.pausa = pausa
+        self.en_curso = 0
+        self.ultimo_inicio = 0.0
+        self.ultimo_recorte = 0.0
+        self.latencia = None
+        self.senales = dict.fromkeys(SENALES, 0)
+
+    def como_dict(self):
+        return {
+            'concurrencia': round(self.concurrencia, 2),
+            'pausa': round(self.pausa, 3),
+            'en_curso': self.en_curso,
+            'latencia': None if self.latencia is None else round(self.latencia, 3),
+            **self.senales,
+        }
+
+
+class ControlDominios:
+    """Concurrencia y pausa por dominio ajustadas con AIMD.
+
+    - Suma: cada respuesta 'ok' agrega `suma / concurrencia`, o sea +`suma` por
+      ventana completa de solicitudes; la pausa se reduce un 20 %.
+    - Multiplica: ante 'lento', 'error' o 'vacio' la concurrencia se multiplica
+      por `factor` y la pausa se duplica (al menos `pausa_recorte`); un 'bloqueo'
+      la lleva al mínimo y cuadruplica la pausa. Como las señales de una misma
+      ráfaga llegan juntas, se recorta como mucho una vez por latencia observada.
+
+    El estado se consulta con `estado()` y, si se indica `ruta_estado`, se vuelca
+    a ese JSON como mucho una vez por segundo para monitorearlo en vivo.
+    """
+
+    def __init__(self, concurrencia_inicial=2, minimo=1, maximo=8, pausa_inicial=0.0, pausa_recorte=0.5,
+                 pausa_max=30.0, latencia_objetivo=5.0, suma=1.0, factor=0.5, ruta_estado=None):
+        self.concurrencia_inicial = concurrencia_inicial
+        self.minimo = minimo
+        self.maximo = max(minimo, maximo)
+        self.pausa_inicial = pausa_inicial
+        self.pausa_recorte = pausa_recorte
+        self.pausa_max = pausa_max
+        self.latencia_objetivo = latencia_objetivo
+        self.suma = suma
+        self.factor = factor
+        self.ruta_estado = ruta_estado
+        self._dominios = {}
+        self._cond = threading.Condition()
+        self._ultimo_volcado = 0.0
+
+    def _dominio(self, url):
+        dominio = urlparse(url).netloc
+        if dominio not in self._dominios:
+            inicial = min(self.maximo, max(self.minimo, self.concurrencia_inicial))
+            self._dominios[dominio] = EstadoDominio(inicial, self.pausa_inicial)
+        return self._dominios[dominio]
+
+    def adquirir(self, url):
+        """Bloquea hasta que el dominio admite otra solicitud (cupo libre y pausa cumplida)."""
+        with self._cond:
+            d = self._dominio(url)
+            while True:
+                ahora = time.monotonic()
+                espera = d.ultimo_inicio + d.pausa - ahora
+                if d.en_curso < max(1, int(d.concurrencia)) and espera <= 0:
+                    break
+                self._cond.wait(timeout=espera if espera > 0 else None)
+            d.en_curso += 1
+            d.ultimo_inicio = ahora
+
+    def liberar(self, url, segundos, senal):
+        """Registra el resultado de una solicitud y ajusta el dominio."""
+        with self._cond:
+            d = self._dominio(url)
+            d.en_curso -= 1
+            if senal == 'ok' and segundos > self.latencia_objetivo:
+                senal = 'lento'
+            d.senales[senal] += 1
+            d.latencia = segundos if d.latencia is None else 0.8 * d.latencia + 0.2 * segundos
+            ahora = time.monotonic()
+            if senal == 'ok':
+                d.concurrencia = min(self.maximo, d.concurrencia + self.suma / d.concurrencia)
+                d.pausa = max(self.pausa_inicial, d.pausa * 0.8 if d.pausa * 0.8 > 0.01 else 0.0)
+            elif ahora - d.ultimo_recorte >= max(1.0, d.latencia):
+                d.ultimo_recorte = ahora
+                if senal == 'bloqueo':
+                    d.concurrencia = float(self.minimo)
+                    d.pausa = min(self.pausa_max, max(d.pausa * 4, self.pausa_recorte * 4))
+                else:
+                    d.concurrencia = max(float(self.minimo), d.concurrencia * self.factor)
+                    d.pausa = min(self.pausa_max, max(d.pausa * 2, self.pausa_recorte))
+            self._cond.notify_all()
+            if self.ruta_estado and ahora - self._ultimo_volcado >= 1:
+                self._ultimo_volcado = ahora
+                self.guardar_json(self.ruta_estado)
+
+    def estado(self):
+        with self._cond:
+            return {dominio: d.como_dict() for dominio, d in self._dominios.items()}
+
+    def guardar_json(self, ruta):
+        estado = {dominio: d.como_dict() for dominio, d in self._dominios.items()}
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'actualizado': time.time(), 'dominios': estado}, f, indent=2)
+        os.replace(temporal, ruta)
+
+    def imprimir(self):
+        estado = self.estado()
+        if not estado:
+            return
+        print(f"\n{'dominio':<32} {'conc':>5} {'pausa':>6} {'lat s':>6}  " + ' '.join(f"{s:>7}" for s in SENALES))
+        for dominio, d in estado.items():
+            latencia = '-' if d['latencia'] is None else f"{d['latencia']:.2f}"
+            print(f"{dominio:<32} {d['concurrencia']:>5} {d['pausa']:>6} {latencia:>6}  "
+                  + ' '.join(f"{d[s]:>7}" for s in SENALES))
+
+
+class FetcherControlado:
+    """Envuelve un fetcher: pide turno al control antes de cada descarga y le informa el resultado."""
+
+    def __init__(self, origen, control):
+        self.origen = origen
+        self.control = control
+
+    @property
+    def estadisticas(self):
+        return getattr(self.origen, 'estadisticas', {})
+
+    def fetch(self, url, selector=None):
+        self.control.adquirir(url)
+        inicio = time.monotonic()
+        senal = 'error'
+        try:
+            html = self.origen.fetch(url, selector)
+            senal = clasificar(html, selector)
+            return html
+        except requests.HTTPError as e:
+            estado = e.response.status_code if e.response is not None else None
+            senal = 'bloqueo' if estado in ESTADOS_BLOQUEO else 'error'
+            raise
+        finally:
+            self.control.liberar(url, time.monotonic() - inicio, senal)
+
+    def cerrar(self):
+        self.origen.cerrar()
+
+
+def controlado(fetcher, control):
+    """Devuelve el fetcher envuelto por el control, o tal cual si no hay control."""
+    return fetcher if control is None else FetcherControlado(fetcher, control)
+
+
+def argumentos_control(parser):
+    """Agrega --adaptativo y --estado-control a un ArgumentParser."""
+    parser.add_argument('--adaptativo', action='store_true',
+                        help='Ajustar concurrencia y pausa por dominio según latencia, errores y captchas '
+                             '(--workers pasa a ser el máximo)')
+    parser.add_argument('--estado-control', default=None, metavar='JSON',
+                        help='Archivo donde se vuelca el estado del control adaptativo para monitoreo')
+
+
+def crear_control(args):
+    """ControlDominios según --adaptativo/--workers, o None."""
+    if not getattr(args, 'adaptativo', False):
+        return None
+    maximo = max(1, args.workers)
+    return ControlDominios(concurrencia_inicial=min(2, maximo), maximo=maximo,
+                           ruta_estado=getattr(args, 'estado_control', None))
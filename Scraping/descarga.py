@@ -0,0 +1,142 @@
+import re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .espera import espera_para_selector
+
+# Cabeceras de un Chrome de escritorio; gzip para reducir bytes transferidos
+CABECERAS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'es-CO,es;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+BACKENDS = ('auto', 'http', 'selenium')
+ESTADOS_REINTENTO = (429, 500, 502, 503, 504)
+
+
+def crear_sesion(conexiones=10, reintentos=2, reintentar_estados=True):
+    """Crea una sesión HTTP con pool de conexiones keep-alive y reintentos.
+
+    Con reintentar_estados=False solo se reintentan los errores de conexión: un
+    429 o 503 llega enseguida como HTTPError, para que el control adaptativo
+    por dominio se entere en la primera respuesta y sea él quien espere.
+    """
+    sesion = requests.Session()
+    sesion.headers.update(CABECERAS)
+    retry = Retry(total=reintentos, backoff_factor=0.5,
+                  status_forcelist=ESTADOS_REINTENTO if reintentar_estados else (),
+                  respect_retry_after_header=reintentar_estados,
+                  allowed_methods=('GET',))
+    adaptador = HTTPAdapter(pool_connections=conexiones, pool_maxsize=conexiones,
+                            max_retries=retry)
+    sesion.mount('http://', adaptador)
+    sesion.mount('https://', adaptador)
+    return sesion
+
+
+def marcadores(selector):
+    """Extrae clases y valores de atributos de un selector CSS para buscarlos como texto."""
+    clases = re.findall(r'\.([\w-]+)', selector)
+    valores = re.findall(r'\[[\w-]+="([^"]+)"\]', selector)
+    return clases + valores
+
+
+class FetcherHttp:
+    """Descarga páginas renderizadas en servidor con una sesión HTTP reutilizable."""
+
+    def __init__(self, sesion=None, timeout=15):
+        self.sesion = sesion or crear_sesion()
+        self.timeout = timeout
+
+    def fetch(self, url, selector=None):
+        resp = self.sesion.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.text
+
+    def cerrar(self):
+        self.sesion.close()
+
+
+class FetcherSelenium:
+    """Descarga páginas con Chrome; el navegador se crea solo cuando hace falta."""
+
+    def __init__(self, crear_driver, pausa_fija=0):
+        self._crear_driver = crear_driver
+        self._driver = None
+        self.pausa_fija = pausa_fija
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self._crear_driver()
+        return self._driver
+
+    def fetch(self, url, selector=None):
+        self.driver.get(url)
+        if selector:
+            # Si vence el timeout se devuelve lo que haya cargado; el parser decide
+            espera_para_selector(selector, self.pausa_fija).esperar(self.driver, url)
+        return self.driver.page_source
+
+    def cerrar(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+class FetcherHttpPrimero:
+    """Intenta por HTTP y recurre a Selenium solo si la página necesita JavaScript.
+
+    Se considera que la página llegó completa cuando el HTML contiene todas las
+    clases/atributos del selector esperado (p. ej. 'div.poly-card--grid-card').
+    Los errores HTTP (429, 403, 503...) y de conexión se propagan: si el sitio
+    está limitando, abrir Chrome contra él solo empeora las cosas.
+    """
+
+    def __init__(self, http, navegador):
+        self.http = http
+        self.navegador = navegador
+        self.estadisticas = {'http': 0, 'selenium': 0}
+
+    def fetch(self, url, selector=None):
+        html = self.http.fetch(url)
+        if all(m in html for m in marcadores(selector or '')):
+            self.estadisticas['http'] += 1
+            return html
+        self.estadisticas['selenium'] += 1
+        return self.navegador.fetch(url, selector)
+
+    def cerrar(self):
+        self.http.cerrar()
+        self.navegador.cerrar()
+
+
+def sumar_estadisticas(fetchers):
+    """Suma las páginas servidas por cada backend (http, selenium, caché) en varios fetchers."""
+    total = {}
+    for fetcher in fetchers:
+        for k, v in getattr(fetcher, 'estadisticas', {}).items():
+            total[k] = total.get(k, 0) + v
+    return total
+
+
+def crear_fetcher(backend, crear_driver, pausa_fija=0, crear_navegador=None, reintentar_estados=True):
+    """Construye el backend de descarga: 'http', 'selenium' o 'auto' (HTTP con respaldo).
+
+    `pausa_fija` es la pausa que usaba el scraper antes; solo sirve para medir el ahorro.
+    `crear_navegador` reemplaza al Chrome propio (p. ej. por un ClienteNavegador del servicio).
+    `reintentar_estados` se apaga cuando el fetcher va envuelto por el control adaptativo.
+    """
+    if crear_navegador is None:
+        crear_navegador = lambda: FetcherSelenium(crear_driver, pausa_fija=pausa_fija)
+    nuevo_http = lambda: FetcherHttp(crear_sesion(reintentar_estados=reintentar_estados))
+    if backend == 'http':
+        return nuevo_http()
+    if backend == 'selenium':
+        return crear_navegador()
+    if backend == 'auto':
+        return FetcherHttpPrimero(nuevo_http(), crear_navegador())
+    raise ValueError(f"Backend desconocido: {backend}")
@@ -0,0 +1,208 @@
+import csv
+import threading
+import time
+from selenium.webdriver.common.by import By
+
+
+# --- CONDICIONES DE PÁGINA LISTA ---
+# Cada condición recibe el driver y un diccionario de estado propio de cada espera,
+# así una misma condición se puede compartir entre varios workers.
+
+class SelectorPresente:
+    """Lista cuando existe al menos un elemento que coincide con el selector CSS."""
+
+    def __init__(self, selector):
+        self.selector = selector
+
+    def __call__(self, driver, estado):
+        return len(driver.find_elements(By.CSS_SELECTOR, self.selector)) > 0
+
+
+class SelectorAusente:
+    """Lista cuando ya no existe ningún elemento con el selector (p. ej. el formulario de login)."""
+
+    def __init__(self, selector):
+        self.selector = selector
+
+    def __call__(self, driver, estado):
+        return len(driver.find_elements(By.CSS_SELECTOR, self.selector)) == 0
+
+
+class ConteoEstable:
+    """Lista cuando hay tarjetas y su número no cambia durante `estable_por` segundos."""
+
+    def __init__(self, selector, estable_por=0.5):
+        self.selector = selector
+        self.estable_por = estable_por
+
+    def __call__(self, driver, estado):
+        conteo = len(driver.find_elements(By.CSS_SELECTOR, self.selector))
+        ahora = time.monotonic()
+        if conteo != estado.get('conteo'):
+            estado['conteo'] = conteo
+            estado['desde'] = ahora
+            return False
+        return conteo > 0 and ahora - estado['desde'] >= self.estable_por
+
+
+class RedInactiva:
+    """Lista cuando el documento terminó de cargar y no se piden recursos nuevos durante `inactividad` s."""
+
+    SCRIPT = ("return [document.readyState, "
+              "performance.getEntriesByType('resource').length];")
+
+    def __init__(self, inactividad=0.5):
+        self.inactividad = inactividad
+
+    def __call__(self, driver, estado):
+        listo, recursos = driver.execute_script(self.SCRIPT)
+        ahora = time.monotonic()
+        if listo != 'complete' or recursos != estado.get('recursos'):
+            estado['recursos'] = recursos
+            estado['desde'] = ahora
+            return False
+        return ahora - estado['desde'] >= self.inactividad
+
+
+class Todas:
+    """Lista cuando se cumplen todas las condiciones."""
+
+    def __init__(self, *condiciones):
+        self.condiciones = condiciones
+
+    def __call__(self, driver, estado):
+        return all(c(driver, estado.setdefault(i, {})) for i, c in enumerate(self.condiciones))
+
+
+# --- REGISTRO DE TIEMPOS ---
+
+class RegistroEsperas:
+    """Guarda cuánto tardó cada espera para comparar contra las pausas fijas de antes."""
+
+    def __init__(self):
+        self.esperas = []
+        self._lock = threading.Lock()
+
+    def agregar(self, sitio, url, segundos, listo, pausa_fija):
+        with self._lock:
+            self.esperas.append({'sitio': sitio, 'url': url, 'segundos': round(segundos, 3),
+                                 'listo': listo, 'pausa_fija': pausa_fija})
+
+    def resumen(self):
+        """Devuelve por sitio: esperas, media, p95, timeouts y segundos ahorrados frente a la pausa fija."""
+        por_sitio = {}
+        with self._lock:
+            for e in self.esperas:
+                por_sitio.setdefault(e['sitio'], []).append(e)
+        resumen = {}
+        for sitio, esperas in por_sitio.items():
+            tiempos = sorted(e['segundos'] for e in esperas)
+            resumen[sitio] = {
+                'esperas': len(tiempos),
+                'media': round(sum(tiempos) / len(tiempos), 3),
+                'p95': tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))],
+                'timeouts': sum(1 for e in esperas if not e['listo']),
+                'ahorro_segundos': round(sum(e['pausa_fija'] - e['segundos'] for e in esperas), 2),
+            }
+        return resumen
+
+    def imprimir(self):
+        for sitio, r in self.resumen().items():
+            print(f"Esperas {sitio}: {r['esperas']} | media {r['media']} s | p95 {r['p95']} s | "
+                  f"timeouts {r['timeouts']} | ahorro {r['ahorro_segundos']} s")
+
+    def guardar_csv(self, ruta):
+        with self._lock, open(ruta, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['sitio', 'url', 'segundos', 'listo', 'pausa_fija'])
+            writer.writeheader()
+            writer.writerows(self.esperas)
+
+
+REGISTRO = RegistroEsperas()
+
+
+# --- ESPERA ADAPTATIVA ---
+
+class EsperaAdaptativa:
+    """Espera a que la página esté lista con un timeout que se ajusta a lo observado.
+
+    Mientras no hay suficientes muestras se usa `timeout_max`; después, el p95 de
+    las esperas exitosas multiplicado por `factor`, acotado a [timeout_min, timeout_max].
+    """
+
+    def __init__(self, sitio, condicion, pausa_fija=0, timeout_min=3, timeout_max=20,
+                 factor=3, intervalo=0.1, registro=REGISTRO):
+        self.sitio = sitio
+        self.condicion = condicion
+        self.pausa_fija = pausa_fija
+        self.timeout_min = timeout_min
+        self.timeout_max = timeout_max
+        self.factor = factor
+        self.intervalo = intervalo
+        self.registro = registro
+        self._exitosas = []
+        self._lock = threading.Lock()
+
+    def timeout(self):
+        with self._lock:
+            muestras = sorted(self._exitosas[-50:])
+        if len(muestras) < 5:
+            return self.timeout_max
+        p95 = muestras[min(len(muestras) - 1, int(len(muestras) * 0.95))]
+        return min(self.timeout_max, max(self.timeout_min, p95 * self.factor))
+
+    def esperar(self, driver, url=''):
+        """Sondea la condición hasta que se cumpla o venza el timeout. Devuelve True si quedó lista."""
+        limite = self.timeout()
+        inicio = time.monotonic()
+        estado = {}
+        listo = False
+        while True:
+            try:
+                listo = self.condicion(driver, estado)
+            except Exception:
+                listo = False  # Página a medio cargar (elementos obsoletos, script sin contexto)
+            if listo or time.monotonic() - inicio >= limite:
+                break
+            time.sleep(self.intervalo)
+        segundos = time.monotonic() - inicio
+        if listo:
+            with self._lock:
+                self._exitosas.append(segundos)
+        if self.registro is not None:
+            self.registro.agregar(self.sitio, url, segundos, listo, self.pausa_fija)
+        return listo
+
+
+# --- CONDICIONES POR SITIO ---
+# pausa_fija es el time.sleep que usaba cada scraper, para medir la latencia ahorrada.
+
+ESPERAS = {
+    'amazon': EsperaAdaptativa(
+        'amazon', ConteoEstable('div[data-component-type="s-search-result"]'), pausa_fija=2),
+    'mercado_libre': EsperaAdaptativa(
+        'mercado_libre', ConteoEstable('div.poly-card--grid-card'), pausa_fija=2),
+    'mercado_libre_categorias': EsperaAdaptativa(
+        'mercado_libre_categorias', SelectorPresente('aside.ui-search-sidebar'), pausa_fija=2),
+    'ml_listado': EsperaAdaptativa(
+        'ml_listado', ConteoEstable('div.ui-search-result__wrapper'), pausa_fija=4),
+    'instagram_login': EsperaAdaptativa(
+        'instagram_login', SelectorPresente('input[name="password"]'), pausa_fija=5),
+    'instagram_sesion': EsperaAdaptativa(
+        'instagram_sesion', Todas(SelectorAusente('input[name="password"]'), RedInactiva()),
+        pausa_fija=7),
+    'instagram_perfil': EsperaAdaptativa(
+        'instagram_perfil', Todas(SelectorPresente('header'), ConteoEstable('article a')),
+        pausa_fija=5),
+    'instagram_post': EsperaAdaptativa(
+        'instagram_post', Todas(SelectorPresente('article'), RedInactiva()), pausa_fija=3),
+}
+
+
+def espera_para_selector(selector, pausa_fija=0):
+    """Devuelve (creándola si hace falta) la espera de conteo estable para un selector."""
+    for espera in ESPERAS.values():
+        if getattr(espera.condicion, 'selector', None) == selector:
+            return espera
+    return ESPERAS.setdefault(selector, EsperaAdaptativa(
+        selector, ConteoEstable(selector), pausa_fija=pausa_fija))
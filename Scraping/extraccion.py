@@ -0,0 +1,219 @@
+import re
+import unicodedata
+from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+
+# Motor de extracción con lxml: el documento se parsea en C y cada campo se busca
+# solo dentro de su tarjeta con XPath precompilados (se compilan una vez al importar).
+# Las filas son idénticas a las de los parsers con BeautifulSoup ('html.parser').
+
+
+def _clase(nombre):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nombre} ')"
+
+
+def _primero(expr):
+    """Compila un XPath relativo a la tarjeta que devuelve el primer nodo en orden de documento."""
+    return etree.XPath(f'({expr})[1]')
+
+
+def documento(html):
+    """Parsea el HTML completo; devuelve None si la página viene vacía."""
+    if not html or not html.strip():
+        return None
+    return lxml_html.document_fromstring(html)
+
+
+def texto(nodo):
+    """Equivalente a get_text() de BeautifulSoup (sin comentarios)."""
+    return ''.join(nodo.itertext())
+
+
+def texto_limpio(nodo):
+    """Equivalente a get_text(strip=True) de BeautifulSoup."""
+    return ''.join(t.strip() for t in nodo.itertext())
+
+
+def cadena(nodo):
+    """Equivalente a Tag.string: el texto solo si el nodo tiene un único hijo (recursivo)."""
+    while True:
+        hijos = len(nodo) + sum(1 for h in nodo if h.tail) + (1 if nodo.text else 0)
+        if hijos != 1:
+            return None
+        if nodo.text:
+            return nodo.text
+        nodo = nodo[0]
+        if not isinstance(nodo.tag, str):
+            return nodo.text  # Comentario
+
+
+def _campo(selector, nodo, limpiar=texto_limpio, defecto=''):
+    encontrado = selector(nodo)
+    return limpiar(encontrado[0]) if encontrado else defecto
+
+
+def clean_text(text):
+    t = unicodedata.normalize('NFKD', text)
+    return t.replace('\xa0', ' ').strip()
+
+
+# --- AMAZON ---
+
+AMZ_TARJETAS = etree.XPath("//div[@data-component-type='s-search-result']")
+AMZ_TITULO = _primero('.//h2//a//span')
+AMZ_TITULO_RESPALDO = _primero('.//h2//span')
+AMZ_PRECIO_ENTERO = _primero(f'.//span[{_clase("a-price-whole")}]')
+AMZ_PRECIO_FRACCION = _primero(f'.//span[{_clase("a-price-fraction")}]')
+AMZ_RATING = _primero(f'.//i[{_clase("a-icon-star-small")}]//span[{_clase("a-icon-alt")}]')
+AMZ_RESENAS = _primero(f'.//span[{_clase("a-size-base")} and {_clase("s-underline-text")}]')
+# Prefiltro en C; luego se comprueba la semántica de find(string=...) en Python
+AMZ_VENTAS = etree.XPath(".//span[contains(translate(., 'COMPRAD', 'comprad'), 'comprad')]")
+AMZ_VENTAS_RE = re.compile(r'comprad', re.IGNORECASE)
+NO_DIGITOS = re.compile(r'[^0-9]')
+NO_DIGITOS_COMA = re.compile(r'[^0-9,]')
+
+
+def parse_amazon(html):
+    """Filas de los resultados de búsqueda de Amazon (mismas que parse_page con BeautifulSoup)."""
+    doc = documento(html)
+    if doc is None:
+        return []
+    products = []
+    for item in AMZ_TARJETAS(doc):
+        asin = item.get('data-asin', '')
+
+        title = ''
+        tag = AMZ_TITULO(item) or AMZ_TITULO_RESPALDO(item)
+        if tag:
+            title = clean_text(texto(tag[0]))
+
+        price = ''
+        pw = AMZ_PRECIO_ENTERO(item)
+        pf = AMZ_PRECIO_FRACCION(item)
+        if pw and pf:
+            whole = NO_DIGITOS.sub('', texto(pw[0]))
+            frac = NO_DIGITOS.sub('', texto(pf[0]))
+            if whole and frac:
+                price = f"{whole}.{frac}"
+
+        rating = _campo(AMZ_RATING, item, lambda n: texto(n).split()[0])
+        reviews = _campo(AMZ_RESENAS, item, lambda n: NO_DIGITOS_COMA.sub('', texto(n)))
+
+        sales = ''
+        for sl in AMZ_VENTAS(item):
+            s = cadena(sl)
+            if s is not None and AMZ_VENTAS_RE.search(s):
+                sales = clean_text(texto(sl))
+                break
+
+        products.append({
+            'asin': asin,
+            'title': title,
+            'price': price,
+            'rating': rating,
+            'reviews': reviews,
+            'sales': sales
+        })
+    return products
+
+
+# --- MERCADO LIBRE: MÁS VENDIDOS ---
+
+ML_CATEGORIAS = etree.XPath(
+    f"//aside[{_clase('ui-search-sidebar')}]//ul//li[{_clase('ui-search-filter-container')}]")
+ML_CATEGORIA_LINK = _primero(f".//a[{_clase('ui-search-link')}]")
+ML_TARJETAS = etree.XPath(f"//div[{_clase('poly-card--grid-card')}]")
+ML_ETIQUETA = _primero(f".//span[{_clase('poly-component__highlight')}]")
+ML_TITULO = _primero(f".//a[{_clase('poly-component__title')}]")
+ML_RATING = _primero(f".//span[{_clase('poly-reviews__rating')}]")
+ML_TOTAL = _primero(f".//span[{_clase('poly-reviews__total')}]")
+ML_PRECIO = _primero(f".//span[{_clase('andes-money-amount__fraction')}]")
+
+
+def parse_ml_categorias(html, base_url):
+    """Lista de (nombre, url) de las categorías del menú lateral de "Más vendidos"."""
+    doc = documento(html)
+    if doc is None:
+        return []
+    categories = []
+    for li in ML_CATEGORIAS(doc):
+        link = ML_CATEGORIA_LINK(li)
+        if link and link[0].get('href') is not None:
+            categories.append((texto_limpio(link[0]), urljoin(base_url, link[0].get('href'))))
+    return categories
+
+
+def parse_ml_mas_vendidos(html, category, limite=None):
+    """Filas de una categoría de "Más vendidos" (mismas que parse_products con BeautifulSoup)."""
+    doc = documento(html)
+    if doc is None:
+        return []
+    results = []
+    for idx, card in enumerate(ML_TARJETAS(doc)[:limite], start=1):
+        results.append({
+            'category': category,
+            'position': idx,
+            'label': _campo(ML_ETIQUETA, card),
+            'title': _campo(ML_TITULO, card),
+            'rating': _campo(ML_RATING, card),
+            'reviews_count': _campo(ML_TOTAL, card, lambda n: texto_limpio(n).strip('()')),
+            'price': _campo(ML_PRECIO, card)
+        })
+    return results
+
+
+# --- MERCADO LIBRE: LISTADO POR CATEGORÍA ---
+
+LISTADO_TARJETAS = etree.XPath(f"//div[{_clase('ui-search-result__wrapper')}]")
+LISTADO_RATING = ML_RATING
+LISTADO_TOTAL = ML_TOTAL
+LISTADO_PRECIO = _primero(
+    f".//div[{_clase('poly-price__current')}]//span[{_clase('andes-money-amount__fraction')}]")
+LISTADO_PRECIO_ANTERIOR = _primero(f".//s//span[{_clase('andes-money-amount__fraction')}]")
+LISTADO_DESCUENTO = _primero(f".//span[{_clase('andes-money-amount__discount')}]")
+
+
+def parse_ml_listado(html, nombre_categoria):
+    """Filas [categoría, precio, precio anterior, descuento, calificación, n° calificaciones].
+
+    Los productos sin calificación se omiten, igual que en categoriamascotas.py.
+    """
+    doc = documento(html)
+    if doc is None:
+        return []
+    filas = []
+    for item in LISTADO_TARJETAS(doc):
+        rating = LISTADO_RATING(item)
+        total = LISTADO_TOTAL(item)
+        if not rating or not total:
+            continue
+        filas.append([
+            nombre_categoria,
+            _campo(LISTADO_PRECIO, item),
+            _campo(LISTADO_PRECIO_ANTERIOR, item),
+            _campo(LISTADO_DESCUENTO, item),
+            texto_limpio(rating[0]),
+            texto_limpio(total[0]).strip("()")
+        ])
+    return filas
+
+
+# --- ALIEXPRESS ---
+
+ALI_TARJETAS = etree.XPath(f"//a[{_clase('_3mPKP')}]")
+ALI_CAMPOS = (
+    ('name', _primero(f".//h3[{_clase('yB6en')}]")),
+    ('price', _primero(f".//div[{_clase('_3Mpbo')}]")),
+    ('discount', _primero(f".//span[{_clase('W__kt')}]")),
+    ('sold', _primero(f".//span[{_clase('DUuR2')}]")),
+    ('rating', _primero(f".//span[{_clase('_2L2Tc')}]")),
+)
+
+
+def parse_aliexpress(html):
+    """Filas de la lista de productos de AliExpress (un solo XPath por campo)."""
+    doc = documento(html)
+    if doc is None:
+        return []
+    return [{campo: _campo(selector, a) for campo, selector in ALI_CAMPOS}
+            for a in ALI_TARJETAS(doc)]
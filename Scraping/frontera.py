@@ -0,0 +1,168 @@
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+
+
+class FiltroBloom:
+    """Conjunto aproximado y compacto de claves vistas (sin falsos negativos)."""
+
+    def __init__(self, capacidad=200000, error=0.001, bits=None):
+        self.m = max(8, int(-capacidad * math.log(error) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacidad * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.m + 7) // 8)
+        self.m = len(self.bits) * 8
+
+    def _posiciones(self, clave):
+        digest = hashlib.blake2b(clave.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def __contains__(self, clave):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._posiciones(clave))
+
+    def agregar(self, clave):
+        """Agrega la clave; devuelve True si no estaba."""
+        nueva = False
+        for p in self._posiciones(clave):
+            if not self.bits[p >> 3] & (1 << (p & 7)):
+                self.bits[p >> 3] |= 1 << (p & 7)
+                nueva = True
+        return nueva
+
+
+class Frontera:
+    """Frontera de crawl persistente en SQLite.
+
+    Cada página pasa por pendiente -> en_curso -> hecho (o fallido tras
+    `max_intentos`). Si el proceso se interrumpe, las páginas en curso vuelven a
+    pendientes al abrir la frontera y el recorrido continúa donde quedó. Un filtro
+    de Bloom persistido en el mismo archivo evita volver a emitir productos ya
+    guardados.
+    """
+
+    def __init__(self, ruta, max_intentos=3, capacidad_filtro=200000):
+        self.max_intentos = max_intentos
+        self.capacidad_filtro = capacidad_filtro
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(ruta, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS paginas (
+                url TEXT PRIMARY KEY,
+                orden INTEGER,
+                estado TEXT NOT NULL DEFAULT 'pendiente',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                datos TEXT,
+                error TEXT,
+                actualizado REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_paginas_estado ON paginas (estado, orden);
+            CREATE TABLE IF NOT EXISTS filtros (nombre TEXT PRIMARY KEY, bits BLOB);
+        ''')
+        with self.conn:
+            self.conn.execute("UPDATE paginas SET estado = 'pendiente' WHERE estado = 'en_curso'")
+        fila = self.conn.execute("SELECT bits FROM filtros WHERE nombre = 'vistos'").fetchone()
+        self.vistos = FiltroBloom(capacidad_filtro, bits=fila[0] if fila else None)
+        self.reanudando = self.conteos().get('pendiente', 0) > 0
+
+    def conteos(self):
+        with self._lock:
+            filas = self.conn.execute('SELECT estado, COUNT(*) FROM paginas GROUP BY estado').fetchall()
+        return dict(filas)
+
+    def iniciar_recorrido(self, paginas):
+        """Registra las páginas de un recorrido nuevo, salvo que haya uno sin terminar.
+
+        `paginas` es una lista de (url, datos). Devuelve True si se está reanudando.
+        """
+        if self.reanudando:
+            return True
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM paginas')
+            self.conn.execute('DELETE FROM filtros')
+            self.vistos = FiltroBloom(self.capacidad_filtro)
+        self.agregar(paginas)
+        return False
+
+    def agregar(self, paginas):
+        """Agrega (url, datos) al final de la frontera; las URLs ya conocidas se ignoran."""
+        with self._lock, self.conn:
+            orden = self.conn.execute('SELECT COALESCE(MAX(orden), 0) FROM paginas').fetchone()[0]
+            for url, datos in paginas:
+                orden += 1
+                self.conn.execute(
+                    'INSERT OR IGNORE INTO paginas (url, orden, datos, actualizado) VALUES (?, ?, ?, ?)',
+                    (url, orden, json.dumps(datos, ensure_ascii=False), time.time()))
+
+    def pendientes(self):
+        """Lista de (url, datos) pendientes, en el orden en que se agregaron."""
+        with self._lock:
+            filas = self.conn.execute(
+                "SELECT url, datos FROM paginas WHERE estado = 'pendiente' ORDER BY orden").fetchall()
+        return [(url, json.loads(datos)) for url, datos in filas]
+
+    def _actualizar(self, url, estado, error=None, sumar_intento=0):
+        with self._lock, self.conn:
+            self.conn.execute(
+                'UPDATE paginas SET estado = ?, error = ?, intentos = intentos + ?, actualizado = ? '
+                'WHERE url = ?', (estado, error, sumar_intento, time.time(), url))
+
+    def en_curso(self, url):
+        self._actualizar(url, 'en_curso')
+
+    def completar(self, url):
+        """Marca la página como hecha y persiste el filtro de vistos en la misma transacción."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE paginas SET estado = 'hecho', error = NULL, actualizado = ? WHERE url = ?",
+                (time.time(), url))
+            self.conn.execute('INSERT OR REPLACE INTO filtros (nombre, bits) VALUES (?, ?)',
+                              ('vistos', bytes(self.vistos.bits)))
+
+    def fallar(self, url, error):
+        with self._lock:
+            intentos = self.conn.execute(
+                'SELECT intentos FROM paginas WHERE url = ?', (url,)).fetchone()[0] + 1
+        estado = 'fallido' if intentos >= self.max_intentos else 'pendiente'
+        self._actualizar(url, estado, error=str(error), sumar_intento=1)
+
+    def marcar_visto(self, clave):
+        """Devuelve True si la clave es nueva (y la registra)."""
+        with self._lock:
+            return self.vistos.agregar(clave)
+
+    def cerrar(self):
+        self.conn.close()
+
+
+def recorrer(frontera, pool, funcion, salida, clave_item=None):
+    """Procesa con el pool las páginas pendientes de la frontera y guarda sus filas.
+
+    Cada página se vuelca a disco antes de marcarse como hecha, así una
+    interrupción nunca pierde filas. Las páginas que fallan quedan para reintento.
+    Entrega (url, datos, filas) de cada página procesada, en orden.
+    """
+    pendientes = frontera.pendientes()
+
+    def tarea(recurso, url):
+        frontera.en_curso(url)
+        try:
+            return True, funcion(recurso, url)
+        except Exception as e:
+            return False, e
+
+    for (url, datos), (ok, filas) in zip(pendientes, pool.imap(tarea, [u for u, _ in pendientes])):
+        if not ok:
+            print(f"  ⚠️ Falló {url}: {filas}")
+            frontera.fallar(url, repr(filas))
+            continue
+        if clave_item is not None:
+            filas = [f for f in filas if frontera.marcar_visto(clave_item(f))]
+        salida.escribir(filas)
+        salida.flush()
+        frontera.completar(url)
+        yield url, datos, filas
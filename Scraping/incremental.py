@@ -0,0 +1,143 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# Scraping incremental: se guarda una instantánea con la huella de cada página y de
+# cada producto, y cada ejecución emite solo las diferencias (altas, cambios y bajas).
+
+CAMPOS_DELTA = ['op', 'category', 'position', 'label', 'title', 'rating', 'reviews_count',
+                'price', 'changed_fields', 'previous_values']
+# Campos cuyo cambio genera una actualización
+CAMPOS_SEGUIDOS = ('position', 'price', 'rating', 'reviews_count', 'label')
+
+_NO_VISIBLE = re.compile(r'<(script|style|noscript|template)\b.*?</\1\s*>', re.S | re.I)
+_TEXTO = re.compile(r'>([^<]+)<')
+
+
+def huella_pagina(html, marcador):
+    """Huella del texto visible desde la primera tarjeta; ignora scripts y atributos volátiles."""
+    inicio = html.find(marcador)
+    region = _NO_VISIBLE.sub('', html[inicio:] if inicio >= 0 else html)
+    h = hashlib.blake2b(digest_size=16)
+    for texto in _TEXTO.findall(region):
+        texto = texto.strip()
+        if texto:
+            h.update(texto.encode('utf-8'))
+            h.update(b'\x00')
+    return h.hexdigest()
+
+
+def clave_producto(fila):
+    return f"{fila['category']}|{fila['title']}"
+
+
+class Instantanea:
+    """Último estado conocido de cada página y producto, en SQLite.
+
+    `comparar` calcula las diferencias de una página sin tocar la instantánea;
+    `confirmar` las persiste una vez que los deltas quedaron guardados, así una
+    interrupción puede repetir deltas pero nunca perderlos.
+    """
+
+    def __init__(self, ruta):
+        self._lock = threading.Lock()
+        self._pendientes = {}
+        self._retiradas = []
+        self.conn = sqlite3.connect(ruta, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS paginas (url TEXT PRIMARY KEY, huella TEXT, actualizado REAL);
+            CREATE TABLE IF NOT EXISTS productos (
+                clave TEXT PRIMARY KEY, url TEXT NOT NULL, fila TEXT NOT NULL, actualizado REAL);
+            CREATE INDEX IF NOT EXISTS idx_productos_url ON productos (url);
+        ''')
+
+    def comparar(self, url, html, marcador, parsear):
+        """Devuelve los deltas de la página; si su huella no cambió, no se parsea.
+
+        Una página sin tarjetas (descarga fallida, captcha, sin caché en replay) no
+        se compara, para no tomar todo su contenido anterior como bajas.
+        """
+        if marcador not in html:
+            return []
+        huella = huella_pagina(html, marcador)
+        with self._lock:
+            fila = self.conn.execute('SELECT huella FROM paginas WHERE url = ?', (url,)).fetchone()
+            if fila is not None and fila[0] == huella:
+                return []
+            anteriores = {clave: json.loads(f) for clave, f in self.conn.execute(
+                'SELECT clave, fila FROM productos WHERE url = ?', (url,))}
+
+        actuales = {}
+        for f in parsear(html):
+            actuales.setdefault(clave_producto(f), f)
+
+        deltas = []
+        for clave, f in actuales.items():
+            previa = anteriores.get(clave)
+            if previa is None:
+                deltas.append(dict(f, op='insert', changed_fields='', previous_values=''))
+                continue
+            cambios = [c for c in CAMPOS_SEGUIDOS if str(previa.get(c, '')) != str(f.get(c, ''))]
+            if cambios:
+                deltas.append(dict(f, op='update', changed_fields=','.join(cambios),
+                                   previous_values=json.dumps({c: previa.get(c) for c in cambios},
+                                                              ensure_ascii=False)))
+        for clave, previa in anteriores.items():
+            if clave not in actuales:
+                deltas.append(dict(previa, op='delete', changed_fields='', previous_values=''))
+
+        with self._lock:
+            self._pendientes[url] = (huella, actuales)
+        return deltas
+
+    def confirmar(self, url):
+        """Persiste el nuevo estado de la página (tras guardar sus deltas)."""
+        with self._lock:
+            pendiente = self._pendientes.pop(url, None)
+            if pendiente is None:
+                return
+            huella, actuales = pendiente
+            ahora = time.time()
+            with self.conn:
+                self.conn.execute('INSERT OR REPLACE INTO paginas (url, huella, actualizado) VALUES (?, ?, ?)',
+                                  (url, huella, ahora))
+                self.conn.execute('DELETE FROM productos WHERE url = ?', (url,))
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO productos (clave, url, fila, actualizado) VALUES (?, ?, ?, ?)',
+                    [(clave, url, json.dumps(f, ensure_ascii=False), ahora) for clave, f in actuales.items()])
+
+    def retirar_paginas(self, urls_vigentes):
+        """Bajas de los productos de páginas que ya no existen (p. ej. categorías eliminadas).
+
+        Como `comparar`, no toca la instantánea: las páginas se borran con
+        `confirmar_retiro` una vez que las bajas quedaron guardadas.
+        """
+        vigentes = set(urls_vigentes)
+        deltas = []
+        with self._lock:
+            viejas = [u for (u,) in self.conn.execute('SELECT url FROM paginas') if u not in vigentes]
+            for url in viejas:
+                for (f,) in self.conn.execute('SELECT fila FROM productos WHERE url = ?', (url,)).fetchall():
+                    deltas.append(dict(json.loads(f), op='delete', changed_fields='', previous_values=''))
+            self._retiradas = viejas
+        return deltas
+
+    def confirmar_retiro(self):
+        """Borra de la instantánea las páginas de la última llamada a `retirar_paginas`."""
+        with self._lock:
+            viejas, self._retiradas = self._retiradas, []
+            with self.conn:
+                for url in viejas:
+                    self.conn.execute('DELETE FROM productos WHERE url = ?', (url,))
+                    self.conn.execute('DELETE FROM paginas WHERE url = ?', (url,))
+
+    def filas(self):
+        """Estado completo actual (para reconstruir el listado sin volver a scrapear)."""
+        with self._lock:
+            return [json.loads(f) for (f,) in self.conn.execute('SELECT fila FROM productos ORDER BY rowid')]
+
+    def cerrar(self):
+        self.conn.close()
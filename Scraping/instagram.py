@@ -1,50 +1,62 @@
-from selenium import webdriver
+import argparse
+import requests
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-import time
-import pandas as pd
+# El mismo límite que usa la traducción; ver Procesamiento/limite_tasa.py
+from Procesamiento.limite_tasa import LimiteTasa
+from .espera import ESPERAS, REGISTRO
+from .navegador import crear_driver
+from .pool_navegadores import PoolNavegadores
+from .salida import SalidaStreaming
+from .sesiones import AlmacenSesion, datos_sesion, restaurar, sesion_http, vencida
 
 # --- CONFIGURACIÓN ---
 USUARIO = "d3orj005"  # Cambia por tu usuario de Instagram
 CONTRASENA = "D4s5.V10o7"
 PERFIL_OBJETIVO = "mercadolibre.co"
 NUM_POSTS = 10  # Cantidad de publicaciones a extraer
+ARCHIVO_SALIDA = "instagram_mascotas.csv"  # .csv o .parquet
+ARCHIVO_SESION = "sesion_instagram.json"  # Cookies del último login (no compartir)
 
-# --- INICIALIZAR DRIVER ---
-options = Options()
-options.add_argument("--start-maximized")
+CAMPOS = ["link", "tipo", "likes", "comentarios", "seguidores"]
 
-driver = webdriver.Chrome(options=options)
-driver.get("https://www.instagram.com/accounts/login/")
+# API JSON que usa la propia web de Instagram (se consulta con las cookies del login)
+API_INSTAGRAM = "https://www.instagram.com/api/v1"
+APP_ID_WEB = "936619743392459"
+POSTS_POR_PAGINA = 33
+TIPOS_POST = {1: "Imagen", 2: "Video", 8: "Carrusel",
+              "GraphImage": "Imagen", "GraphVideo": "Video", "GraphSidecar": "Carrusel"}
 
-# --- LOGIN ---
-time.sleep(5)
-inputs = driver.find_elements(By.TAG_NAME, "input")
-inputs[0].send_keys(USUARIO)
-inputs[1].send_keys(CONTRASENA)
-inputs[1].send_keys(Keys.RETURN)
 
-time.sleep(7)
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Extrae likes y comentarios de las publicaciones de un perfil')
+    parser.add_argument('--perfil', default=PERFIL_OBJETIVO, help='Perfil de Instagram a recorrer')
+    parser.add_argument('--posts', type=int, default=NUM_POSTS, help='Cantidad de publicaciones a extraer')
+    parser.add_argument('--output', default=ARCHIVO_SALIDA, help='Archivo de salida (.csv o .parquet)')
+    parser.add_argument('--sesion', default=ARCHIVO_SESION,
+                        help='JSON donde se guarda la sesión para no volver a iniciar sesión ("" para no usarlo)')
+    parser.add_argument('--modo', choices=('json', 'dom'), default='json',
+                        help='json: lee la API de la web con la sesión del navegador; dom: abre cada post')
+    parser.add_argument('--workers', type=int, default=4, help='Detalles de posts pedidos en paralelo')
+    parser.add_argument('--por-segundo', type=float, default=2,
+                        help='Máximo de solicitudes JSON por segundo (entre todos los workers)')
+    return parser
 
-# --- IR AL PERFIL ---
-driver.get(f"https://www.instagram.com/{PERFIL_OBJETIVO}/")
-time.sleep(5)
 
-# --- EXTRAER SEGUIDORES ---
-seguidores_texto = driver.find_element(By.XPATH, "//header//ul/li[2]/a/span").get_attribute("title")
-seguidores = int(seguidores_texto.replace(".", "").replace(",", ""))
-print(f"Seguidores: {seguidores}")
+def iniciar_sesion(driver):
+    driver.get("https://www.instagram.com/accounts/login/")
+    ESPERAS["instagram_login"].esperar(driver, driver.current_url)
+    inputs = driver.find_elements(By.TAG_NAME, "input")
+    inputs[0].send_keys(USUARIO)
+    inputs[1].send_keys(CONTRASENA)
+    inputs[1].send_keys(Keys.RETURN)
 
-# --- BAJAR Y CLICKEAR POSTS ---
-posts = driver.find_elements(By.XPATH, '//article//a')
-links_posts = [elem.get_attribute("href") for elem in posts[:NUM_POSTS]]
+    ESPERAS["instagram_sesion"].esperar(driver, driver.current_url)
 
-datos = []
 
-for link in links_posts:
+def datos_post(driver, link, seguidores):
     driver.get(link)
-    time.sleep(3)
+    ESPERAS["instagram_post"].esperar(driver, link)
 
     try:
         tipo = driver.find_element(By.XPATH, '//article//video')
@@ -68,18 +80,225 @@ for link in links_posts:
     except:
         comentarios_count = 0
 
-    datos.append({
+    return {
         "link": link,
         "tipo": tipo_post,
         "likes": likes,
-        "comentarios": comentarios_count
+        "comentarios": comentarios_count,
+        "seguidores": seguidores
+    }
+
+
+# --- MODO JSON ---
+
+def sesion_api(datos):
+    """Sesión HTTP con las cookies y el User-Agent del navegador logueado, lista para la API."""
+    sesion = sesion_http(datos)
+    sesion.headers.update({
+        'Accept': '*/*',
+        'X-IG-App-ID': APP_ID_WEB,
+        'X-Requested-With': 'XMLHttpRequest',
+        'X-CSRFToken': sesion.cookies.get('csrftoken') or '',
+        'Referer': 'https://www.instagram.com/',
     })
+    return sesion
+
+
+def sesion_valida(datos):
+    """Comprueba la sesión guardada con una sola solicitud liviana, sin abrir el navegador."""
+    if vencida(datos, 'sessionid'):
+        return False
+    sesion = sesion_api(datos)
+    try:
+        resp = sesion.get(f"{API_INSTAGRAM}/accounts/current_user/", params={'edit': 'true'},
+                          timeout=10, allow_redirects=False)
+        return resp.status_code == 200 and 'user' in resp.json()
+    except (requests.RequestException, ValueError):
+        return False
+    finally:
+        sesion.close()
+
+
+class ClienteApi:
+    """Pide JSON a la API respetando un máximo de solicitudes por segundo."""
+
+    def __init__(self, sesion, limite, timeout=15):
+        self.sesion = sesion
+        self.limite = limite
+        self.timeout = timeout
+
+    def json(self, ruta, **params):
+        self.limite.esperar()
+        resp = self.sesion.get(f"{API_INSTAGRAM}{ruta}", params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def cerrar(self):
+        pass  # La sesión es compartida; se cierra al terminar
+
+
+def post_desde_json(item):
+    """Normaliza un post del feed (API v1) o un nodo GraphQL; los conteos ocultos quedan en None."""
+    codigo = item.get('code') or item.get('shortcode')
+    tipo = TIPOS_POST.get(item.get('media_type')) or \
+        TIPOS_POST.get(str(item.get('__typename', '')).replace('XDT', ''), "Imagen")
+    likes = item.get('like_count')
+    if likes is None:
+        likes = (item.get('edge_liked_by') or item.get('edge_media_preview_like') or {}).get('count')
+    comentarios = item.get('comment_count')
+    if comentarios is None:
+        comentarios = (item.get('edge_media_to_comment') or {}).get('count')
+    return {
+        "pk": item.get('pk') or item.get('id'),
+        "link": f"https://www.instagram.com/p/{codigo}/",
+        "tipo": tipo,
+        "likes": likes,
+        "comentarios": comentarios,
+    }
+
+
+def detalle_post(api, pk):
+    items = api.json(f"/media/{pk}/info/").get('items') or [{}]
+    return post_desde_json(items[0])
+
+
+def paginas_de_posts(api, perfil):
+    """Entrega (seguidores, posts) por página: primero los del perfil, luego el feed paginado."""
+    usuario = api.json("/users/web_profile_info/", username=perfil)['data']['user']
+    seguidores = usuario['edge_followed_by']['count']
+    iniciales = [e['node'] for e in usuario.get('edge_owner_to_timeline_media', {}).get('edges', [])]
+    yield seguidores, [post_desde_json(n) for n in iniciales]
+
+    vistos = {n.get('shortcode') or n.get('code') for n in iniciales}
+    cursor = None
+    while True:
+        params = {'count': POSTS_POR_PAGINA}
+        if cursor:
+            params['max_id'] = cursor
+        feed = api.json(f"/feed/user/{usuario['id']}/", **params)
+        nuevos = [i for i in feed.get('items', []) if i.get('code') not in vistos]
+        vistos.update(i.get('code') for i in nuevos)
+        yield seguidores, [post_desde_json(i) for i in nuevos]
+        cursor = feed.get('next_max_id')
+        if not feed.get('more_available') or not cursor:
+            return
+
+
+def recolectar_json(args, sesion, salida):
+    """Lee los posts desde la API y pide en paralelo el detalle de los que no traen conteos."""
+    limite = LimiteTasa(args.por_segundo)
+    api = ClienteApi(sesion, limite)
+    restantes = args.posts
+    with PoolNavegadores(lambda: ClienteApi(sesion, limite), workers=args.workers) as pool:
+        for i, (seguidores, posts) in enumerate(paginas_de_posts(api, args.perfil)):
+            if i == 0:
+                print(f"Seguidores: {seguidores}")
+            posts = posts[:restantes]
+            incompletos = [p for p in posts if p['likes'] is None or p['comentarios'] is None]
+            detalles = dict(zip([p['pk'] for p in incompletos],
+                                pool.imap(detalle_post, [p['pk'] for p in incompletos])))
+            filas = []
+            for post in posts:
+                detalle = detalles.get(post['pk'], {})
+                filas.append({
+                    "link": post['link'],
+                    "tipo": post['tipo'],
+                    "likes": post['likes'] if post['likes'] is not None else detalle.get('likes') or 0,
+                    "comentarios": post['comentarios'] if post['comentarios'] is not None
+                    else detalle.get('comentarios') or 0,
+                    "seguidores": seguidores,
+                })
+            salida.escribir(filas)
+            restantes -= len(filas)
+            if restantes <= 0:
+                return
+
+
+# --- MODO DOM (una página por post) ---
+
+def recolectar_dom(driver, args, salida):
+    # --- IR AL PERFIL ---
+    driver.get(f"https://www.instagram.com/{args.perfil}/")
+    ESPERAS["instagram_perfil"].esperar(driver, driver.current_url)
+
+    # --- EXTRAER SEGUIDORES ---
+    seguidores_texto = driver.find_element(By.XPATH, "//header//ul/li[2]/a/span").get_attribute("title")
+    seguidores = int(seguidores_texto.replace(".", "").replace(",", ""))
+    print(f"Seguidores: {seguidores}")
+
+    # --- BAJAR Y CLICKEAR POSTS ---
+    posts = driver.find_elements(By.XPATH, '//article//a')
+    links_posts = [elem.get_attribute("href") for elem in posts[:args.posts]]
+
+    # Cada publicación se guarda apenas se extrae
+    for link in links_posts:
+        salida.escribir([datos_post(driver, link, seguidores)])
+
+
+def abrir_sesion(driver, almacen, guardada):
+    """Deja el navegador autenticado: con la sesión guardada si sirve, si no con login completo."""
+    if guardada is not None:
+        restaurar(driver, guardada, "https://www.instagram.com/")
+        return guardada
+    # --- LOGIN ---
+    iniciar_sesion(driver)
+    return almacen.guardar(driver) if almacen else datos_sesion(driver)
+
+
+def ejecutar(args, salida):
+    """Escribe en `salida` las publicaciones del perfil.
+
+    Si la sesión guardada sigue siendo válida no se hace login; en modo json
+    tampoco se abre el navegador. Si la API no responde como se espera (y todavía
+    no se escribió nada) se recorre post por post.
+    """
+    almacen = AlmacenSesion(args.sesion) if args.sesion else None
+    guardada = almacen.cargar() if almacen else None
+    if guardada is not None and not sesion_valida(guardada):
+        print("La sesión guardada venció; se inicia sesión de nuevo")
+        guardada = None
+
+    if args.modo == 'json' and guardada is not None:
+        print("Usando la sesión guardada (sin login ni navegador)")
+        if probar_json(args, guardada, salida):
+            return
+
+    # --- INICIALIZAR DRIVER ---
+    # Ventana visible para el login; sin imágenes ni video (los conteos no los necesitan)
+    driver = crear_driver(headless=False, liviano=True, maximizada=True)
+    try:
+        datos = abrir_sesion(driver, almacen, guardada)
+        if args.modo == 'json' and guardada is None and probar_json(args, datos, salida):
+            return
+        recolectar_dom(driver, args, salida)
+    finally:
+        # --- CERRAR ---
+        driver.quit()
+
+
+def probar_json(args, datos, salida):
+    """Recolecta por la API; devuelve False si falló antes de escribir (para pasar al modo dom)."""
+    escritas = salida.total
+    sesion = sesion_api(datos)
+    try:
+        recolectar_json(args, sesion, salida)
+        return True
+    except (requests.RequestException, KeyError, ValueError) as e:
+        if salida.total != escritas:
+            raise
+        print(f"  ⚠️ No se pudo leer la API de Instagram ({e!r}); se abre cada post")
+        return False
+    finally:
+        sesion.close()
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    with SalidaStreaming(args.output, CAMPOS, lote=10) as salida:
+        ejecutar(args, salida)
+    print(f"{salida.total} publicaciones guardadas en {args.output}")
+    REGISTRO.imprimir()
 
-# --- CERRAR ---
-driver.quit()
 
-# --- GUARDAR DATOS ---
-df = pd.DataFrame(datos)
-df["seguidores"] = seguidores
-df.to_csv("instagram_mascotas.csv", index=False)
-print(df.head())
+if __name__ == '__main__':
+    main()
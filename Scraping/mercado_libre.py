@@ -1,90 +1,154 @@
-import csv
 import argparse
-import time
-from urllib.parse import urljoin
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from .cache_paginas import argumentos_cache, con_cache
+from .control_dominios import argumentos_control, controlado, crear_control
+from .descarga import BACKENDS, crear_fetcher, sumar_estadisticas
+from .espera import REGISTRO
+from .extraccion import parse_ml_categorias, parse_ml_mas_vendidos
+from .frontera import Frontera, recorrer
+from .incremental import CAMPOS_DELTA, Instantanea
+from .navegador import argumentos_navegador, crear_driver as crear_chrome
+from .pool_navegadores import PoolNavegadores
+from .salida import SalidaStreaming
+from .servicio_navegadores import ClienteNavegador
+
+CAMPOS = ['category', 'position', 'label', 'title', 'rating', 'reviews_count', 'price']
+
 
 # Argumentos de línea de comandos
-parser = argparse.ArgumentParser(description='Scrapea "Más vendidos" de Mercado Libre por categorías')
-parser.add_argument('url', help='URL de la sección "Más vendidos" (ruta principal)')
-parser.add_argument('--output', default='ml_best_sellers.csv', help='Archivo CSV de salida')
-parser.add_argument('--limit', '--pages', dest='limit', type=int, default=10,
-                    help='Número máximo de productos a extraer por categoría (alias --pages)')
-args = parser.parse_args()
-
-base_url = args.url
-output_file = args.output
-max_per_category = args.limit
-
-# Configurar Selenium
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=webdriver.ChromeOptions()
-)
-wait = WebDriverWait(driver, 15)
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Scrapea "Más vendidos" de Mercado Libre por categorías')
+    parser.add_argument('url', help='URL de la sección "Más vendidos" (ruta principal)')
+    parser.add_argument('--output', default='ml_best_sellers.csv', help='Archivo de salida (.csv o .parquet)')
+    parser.add_argument('--limit', '--pages', dest='limit', type=int, default=10,
+                        help='Número máximo de productos a extraer por categoría (alias --pages)')
+    parser.add_argument('--backend', choices=BACKENDS, default='auto',
+                        help='Backend de descarga: HTTP, Selenium o auto (HTTP con respaldo en Chrome)')
+    parser.add_argument('--workers', type=int, default=1, help='Categorías descargadas en paralelo')
+    parser.add_argument('--max-por-dominio', type=int, default=None,
+                        help='Máximo de páginas simultáneas por dominio (por defecto = workers)')
+    parser.add_argument('--lote', type=int, default=100,
+                        help='Filas por lote al volcar la salida (.csv o .parquet según la extensión)')
+    parser.add_argument('--frontera', default=None,
+                        help='Archivo SQLite de la frontera; si existe un recorrido sin terminar se reanuda')
+    parser.add_argument('--incremental', default=None, metavar='INSTANTANEA',
+                        help='Archivo SQLite con la instantánea anterior; la salida pasa a ser solo '
+                             'los cambios (insert/update/delete) respecto de ella')
+    parser.add_argument('--registro-esperas', default=None,
+                        help='CSV opcional con la duración de cada espera de página')
+    argumentos_cache(parser)
+    argumentos_control(parser)
+    argumentos_navegador(parser)
+    return parser
+
+
+def campos(args):
+    """Columnas de la salida: los productos o, con --incremental, los deltas."""
+    return CAMPOS_DELTA if args.incremental else CAMPOS
+
 
 # Función para parsear productos de una categoría (HTML)
-def parse_products(html, category):
-    soup = BeautifulSoup(html, 'html.parser')
-    cards = soup.select('div.poly-card--grid-card')
-    results = []
-    for idx, card in enumerate(cards[:max_per_category], start=1):
-        label_tag = card.select_one('span.poly-component__highlight')
-        label = label_tag.get_text(strip=True) if label_tag else ''
-        title_tag = card.select_one('a.poly-component__title')
-        title = title_tag.get_text(strip=True) if title_tag else ''
-        rating_tag = card.select_one('span.poly-reviews__rating')
-        rating = rating_tag.get_text(strip=True) if rating_tag else ''
-        total_tag = card.select_one('span.poly-reviews__total')
-        reviews_count = total_tag.get_text(strip=True).strip('()') if total_tag else ''
-        price_tag = card.select_one('span.andes-money-amount__fraction')
-        price = price_tag.get_text(strip=True) if price_tag else ''
-        results.append({
-            'category': category,
-            'position': idx,
-            'label': label,
-            'title': title,
-            'rating': rating,
-            'reviews_count': reviews_count,
-            'price': price
-        })
-    return results
-
-# 1) Cargar página principal y extraer categorías
-print(f"Obteniendo categorías desde {base_url}")
-driver.get(base_url)
-wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'aside.ui-search-sidebar')))
-time.sleep(2)
-soup_main = BeautifulSoup(driver.page_source, 'html.parser')
-categories = []
-for li in soup_main.select('aside.ui-search-sidebar ul li.ui-search-filter-container'):
-    link = li.select_one('a.ui-search-link')
-    if link:
-        name = link.get_text(strip=True)
-        href = urljoin(base_url, link['href'])
-        categories.append((name, href))
-
-# 2) Iterar cada categoría y extraer productos
-all_data = []
-for name, href in categories:
-    print(f"Procesando categoría: {name}")
-    driver.get(href)
-    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.poly-card--grid-card')))
-    time.sleep(2)
-    all_data.extend(parse_products(driver.page_source, name))
-
-# Guardar CSV
-with open(output_file, 'w', newline='', encoding='utf-8') as f:
-    fieldnames = ['category', 'position', 'label', 'title', 'rating', 'reviews_count', 'price']
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in all_data:
-        writer.writerow(row)
-
-print(f"Scrape completado. {len(all_data)} productos guardados en {output_file}")
+def parse_products(html, category, max_per_category=None):
+    return parse_ml_mas_vendidos(html, category, max_per_category)
+
+
+def abrir_frontera(args):
+    # Sin --frontera se usa una frontera en memoria (sin reanudación)
+    return Frontera(args.frontera or ':memory:')
+
+
+def ejecutar(args, salida, frontera=None):
+    """Recorre las categorías y escribe sus productos (o deltas con --incremental) en `salida`.
+
+    Devuelve las páginas servidas por cada backend.
+    """
+    # Configurar Selenium (el navegador se abre solo si el backend lo necesita)
+    def crear_driver():
+        return crear_chrome(headless=args.workers > 1, liviano=not args.completo)
+
+    fetchers = []
+    # Con --servicio, las páginas que necesitan Chrome se piden al servicio de navegadores
+    crear_navegador = (lambda: ClienteNavegador(args.servicio)) if args.servicio else None
+    # Con --adaptativo, la concurrencia y la pausa por dominio las regula el control
+    control = crear_control(args)
+    crear_fetcher_cache = con_cache(lambda: controlado(crear_fetcher(args.backend, crear_driver, pausa_fija=2,
+                                                                     crear_navegador=crear_navegador,
+                                                                     reintentar_estados=control is None), control),
+                                    args.cache, args.replay)
+
+    def nuevo_fetcher():
+        fetcher = crear_fetcher_cache()
+        fetchers.append(fetcher)
+        return fetcher
+
+    if frontera is None:
+        frontera = abrir_frontera(args)
+
+    # 1) Cargar página principal y extraer categorías (no hace falta si se reanuda)
+    if frontera.reanudando:
+        categories = [(name, href) for href, name in frontera.pendientes()]
+        print(f"Reanudando recorrido anterior: {frontera.conteos()}")
+    else:
+        print(f"Obteniendo categorías desde {args.url}")
+        fetcher = nuevo_fetcher()
+        html_main = fetcher.fetch(args.url, 'aside.ui-search-sidebar')
+        categories = parse_ml_categorias(html_main, args.url)
+        fetcher.cerrar()
+        frontera.iniciar_recorrido([(href, name) for name, href in categories])
+
+    # 2) Iterar cada categoría y extraer productos (en paralelo si --workers > 1)
+    category_names = {href: name for name, href in categories}
+
+    # Con --incremental, las categorías cuya página no cambió no se parsean
+    instantanea = Instantanea(args.incremental) if args.incremental else None
+
+    def scrape_category(worker_fetcher, href):
+        name = category_names[href]
+        print(f"Procesando categoría: {name}")
+        html = worker_fetcher.fetch(href, 'div.poly-card--grid-card')
+        if instantanea is not None:
+            return instantanea.comparar(href, html, 'poly-card--grid-card',
+                                        lambda h: parse_products(h, name, args.limit))
+        return parse_products(html, name, args.limit)
+
+    # Con frontera persistente, los productos ya guardados no se repiten al reanudar
+    clave_producto = (lambda row: f"{row['category']}|{row['title']}") if args.frontera else None
+    with PoolNavegadores(nuevo_fetcher, workers=args.workers,
+                         limite_por_dominio=args.max_por_dominio) as pool:
+        for href, _, _ in recorrer(frontera, pool, scrape_category, salida, clave_item=clave_producto):
+            if instantanea is not None:
+                # Los deltas ya están en disco: recién ahora se actualiza la instantánea
+                instantanea.confirmar(href)
+        if instantanea is not None and not frontera.reanudando and not frontera.conteos().get('pendiente'):
+            # Categorías que desaparecieron del sitio: todos sus productos son bajas
+            salida.escribir(instantanea.retirar_paginas(category_names))
+            # Igual que con confirmar: la instantánea se actualiza con las bajas ya en disco
+            salida.flush()
+            instantanea.confirmar_retiro()
+    frontera.cerrar()
+    if control is not None:
+        control.imprimir()
+    if instantanea is not None:
+        instantanea.cerrar()
+    return sumar_estadisticas(fetchers)
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    frontera = abrir_frontera(args)
+    # Cada categoría se guarda apenas se parsea
+    with SalidaStreaming(args.output, campos(args), lote=args.lote, anexar=frontera.reanudando) as salida:
+        estadisticas = ejecutar(args, salida, frontera)
+
+    if args.incremental:
+        print(f"Scrape completado. {salida.total} cambios guardados en {args.output}")
+    else:
+        print(f"Scrape completado. {salida.total} productos guardados en {args.output}")
+    if estadisticas:
+        print(f"Páginas por backend: {estadisticas}")
+    REGISTRO.imprimir()
+    if args.registro_esperas:
+        REGISTRO.guardar_csv(args.registro_esperas)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import base64
+import functools
+import json
+import re
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+# Configuración única de Chrome para todos los scrapers. En modo liviano no se
+# descargan imágenes, fuentes, video ni rastreadores (bloqueados por DevTools),
+# lo que reduce los bytes por página y el tiempo de render. Con capturar_red
+# se pueden leer además las respuestas JSON que la página pide por XHR/fetch,
+# para sitios que arman la grilla desde una API interna.
+
+ARGUMENTOS_HEADLESS = ['--headless', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu',
+                       '--disable-software-rasterizer']
+
+# Patrones de Network.setBlockedURLs ('*' es comodín)
+RECURSOS_PESADOS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m3u8', '*.ts', '*.mp3', '*.ogg',
+]
+RASTREADORES = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*', '*criteo.com*',
+    '*scorecardresearch.com*', '*amazon-adsystem.com*', '*mercadolibre.com/tracks*', '*mlstatic.com/melidata*',
+]
+BLOQUEADOS = RECURSOS_PESADOS + RASTREADORES
+
+# Preferencias que evitan pedir imágenes y notificaciones aunque no pasen por el bloqueo
+PREFERENCIAS_LIVIANO = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def servicio_chrome():
+    """Ruta del chromedriver resuelta una sola vez por proceso.
+
+    Usa webdriver_manager si está instalado; si no, Selenium Manager la
+    resuelve al crear el driver.
+    """
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        return None
+    return ChromeDriverManager().install()
+
+
+def opciones_chrome(headless=True, liviano=True, capturar_red=False, maximizada=False):
+    options = webdriver.ChromeOptions()
+    if headless:
+        for argumento in ARGUMENTOS_HEADLESS:
+            options.add_argument(argumento)
+    elif maximizada:
+        options.add_argument('--start-maximized')
+    if liviano:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', PREFERENCIAS_LIVIANO)
+    if capturar_red:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def bloquear_recursos(driver, patrones=BLOQUEADOS):
+    """Bloquea por DevTools las URLs que coinciden con los patrones (vale para todas las páginas)."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patrones)})
+
+
+def crear_driver(headless=True, liviano=True, capturar_red=False, maximizada=False, bloqueados=BLOQUEADOS):
+    """Crea un Chrome con la configuración común de los scrapers.
+
+    - headless: sin ventana (los argumentos que ya usaban los scrapers).
+    - liviano: sin imágenes, fuentes, video ni rastreadores.
+    - capturar_red: registra el tráfico para leer respuestas JSON con `respuestas_json`
+      (desactivado por defecto: el registro de rendimiento tiene su costo).
+    """
+    ruta = servicio_chrome()
+    driver = webdriver.Chrome(service=Service(ruta) if ruta else Service(),
+                              options=opciones_chrome(headless, liviano, capturar_red, maximizada))
+    if liviano:
+        bloquear_recursos(driver, bloqueados)
+    elif capturar_red:
+        driver.execute_cdp_cmd('Network.enable', {})
+    return driver
+
+
+def respuestas_json(driver, patron_url=None):
+    """Respuestas JSON (XHR/fetch) recibidas desde la última llamada, como (url, datos).
+
+    Requiere un driver creado con capturar_red=True. Lee el registro de rendimiento
+    (que se vacía al leerlo) y pide cada cuerpo con Network.getResponseBody; las
+    respuestas que ya no están disponibles o no son JSON válido se omiten.
+    """
+    filtro = re.compile(patron_url) if patron_url else None
+    respuestas = []
+    for entrada in driver.get_log('performance'):
+        mensaje = json.loads(entrada['message'])['message']
+        if mensaje.get('method') != 'Network.responseReceived':
+            continue
+        params = mensaje['params']
+        respuesta = params['response']
+        if params.get('type') not in ('XHR', 'Fetch') or 'json' not in respuesta.get('mimeType', ''):
+            continue
+        if filtro is not None and not filtro.search(respuesta['url']):
+            continue
+        try:
+            cuerpo = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+            texto = cuerpo['body']
+            if cuerpo.get('base64Encoded'):
+                texto = base64.b64decode(texto).decode('utf-8')
+            respuestas.append((respuesta['url'], json.loads(texto)))
+        except Exception:
+            continue
+    return respuestas
+
+
+def argumentos_navegador(parser):
+    """Agrega --completo (desactiva el modo liviano) y --servicio a un ArgumentParser."""
+    parser.add_argument('--completo', action='store_true',
+                        help='Cargar imágenes, fuentes y rastreadores (perfil completo de Chrome)')
+    parser.add_argument('--servicio', nargs='?', const='127.0.0.1:8765', default=None, metavar='HOST:PUERTO',
+                        help='Usar los navegadores ya abiertos de servicio_navegadores.py en vez de abrir Chrome')
@@ -0,0 +1,107 @@
+import queue
+import threading
+from urllib.parse import urlparse
+
+_FIN = object()
+
+
+def cerrar_recurso(recurso):
+    """Cierra un driver de Selenium o un fetcher de descarga."""
+    if hasattr(recurso, 'cerrar'):
+        recurso.cerrar()
+    else:
+        recurso.quit()
+
+
+class PoolNavegadores:
+    """Reparte URLs entre N workers, cada uno con su propio navegador (o fetcher).
+
+    Los workers toman las URLs de una cola compartida y respetan un máximo de
+    páginas simultáneas por dominio. Los resultados se entregan en el mismo orden
+    de las URLs de entrada, así que el CSV queda igual que en la ejecución secuencial.
+    """
+
+    def __init__(self, crear_recurso, workers=1, limite_por_dominio=None):
+        self.crear_recurso = crear_recurso
+        self.workers = max(1, workers)
+        self.limite_por_dominio = limite_por_dominio or self.workers
+        self._semaforos = {}
+        self._lock = threading.Lock()
+        self._recursos = []
+
+    def _semaforo(self, url):
+        dominio = urlparse(url).netloc
+        with self._lock:
+            if dominio not in self._semaforos:
+                self._semaforos[dominio] = threading.BoundedSemaphore(self.limite_por_dominio)
+            return self._semaforos[dominio]
+
+    def _worker(self, funcion, tareas, resultados, listos):
+        recurso = None
+        while True:
+            tarea = tareas.get()
+            if tarea is _FIN:
+                break
+            idx, url = tarea
+            try:
+                if recurso is None:
+                    recurso = self.crear_recurso()
+                    with self._lock:
+                        self._recursos.append(recurso)
+                with self._semaforo(url):
+                    salida = (True, funcion(recurso, url))
+            except BaseException as e:
+                salida = (False, e)  # Se relanza en el hilo que consume los resultados
+            with listos:
+                resultados[idx] = salida
+                listos.notify_all()
+
+    def imap(self, funcion, urls):
+        """Aplica funcion(recurso, url) a cada URL y entrega los resultados en orden."""
+        urls = list(urls)
+        tareas = queue.Queue()
+        for tarea in enumerate(urls):
+            tareas.put(tarea)
+        n = min(self.workers, len(urls)) or 1
+        for _ in range(n):
+            tareas.put(_FIN)
+
+        resultados = {}
+        listos = threading.Condition()
+        hilos = [threading.Thread(target=self._worker, args=(funcion, tareas, resultados, listos),
+                                  daemon=True) for _ in range(n)]
+        for hilo in hilos:
+            hilo.start()
+        try:
+            for idx in range(len(urls)):
+                with listos:
+                    listos.wait_for(lambda: idx in resultados)
+                    ok, valor = resultados.pop(idx)
+                if not ok:
+                    raise valor
+                yield valor
+        finally:
+            # Vaciar la cola para que los workers terminen si se abortó la iteración
+            while True:
+                try:
+                    tareas.get_nowait()
+                except queue.Empty:
+                    break
+            for _ in hilos:
+                tareas.put(_FIN)
+            for hilo in hilos:
+                hilo.join()
+
+    def cerrar(self):
+        for recurso in self._recursos:
+            try:
+                cerrar_recurso(recurso)
+            except Exception:
+                pass
+        self._recursos = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
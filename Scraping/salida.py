@@ -0,0 +1,130 @@
+import csv
+import os
+
+
+class SalidaStreaming:
+    """Escribe las filas a CSV o Parquet a medida que se extraen, por lotes.
+
+    En CSV cada página se escribe apenas se parsea y el archivo se vuelca a disco
+    cada `lote` filas; en Parquet cada lote se guarda como un row group. Así un
+    fallo a mitad del scraping conserva lo ya extraído y la memoria no crece con
+    el número de páginas.
+
+    Con `anexar=True` (al reanudar un crawl) el CSV se continúa sin repetir el
+    encabezado; en Parquet se escribe un archivo nuevo `<nombre>.<n>.parquet`.
+    """
+
+    def __init__(self, ruta, campos, formato=None, lote=100, anexar=False):
+        self.ruta = ruta
+        self.campos = list(campos)
+        self.formato = formato or ('parquet' if ruta.endswith('.parquet') else 'csv')
+        self.lote = lote
+        self.total = 0
+        self._pendientes = []
+        self._sin_volcar = 0
+        if self.formato == 'csv':
+            continuar = anexar and os.path.exists(ruta) and os.path.getsize(ruta) > 0
+            self._archivo = open(ruta, 'a' if continuar else 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._archivo, fieldnames=self.campos)
+            if not continuar:
+                self._writer.writeheader()
+        elif self.formato == 'parquet':
+            if anexar and os.path.exists(ruta):
+                base, n = ruta[:-len('.parquet')], 1
+                while os.path.exists(f"{base}.{n}.parquet"):
+                    n += 1
+                self.ruta = f"{base}.{n}.parquet"
+            self._writer = None  # Se crea con el esquema del primer lote
+        else:
+            raise ValueError(f"Formato de salida desconocido: {self.formato}")
+
+    def _como_dict(self, fila):
+        return fila if isinstance(fila, dict) else dict(zip(self.campos, fila))
+
+    def escribir(self, filas):
+        """Agrega las filas de una página (dicts o listas en el orden de `campos`)."""
+        filas = [self._como_dict(f) for f in filas]
+        self.total += len(filas)
+        if self.formato == 'csv':
+            self._writer.writerows(filas)
+            self._sin_volcar += len(filas)
+            if self._sin_volcar >= self.lote:
+                self.flush()
+        else:
+            self._pendientes.extend(filas)
+            if len(self._pendientes) >= self.lote:
+                self.flush()
+
+    def flush(self):
+        if self.formato == 'csv':
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._sin_volcar = 0
+            return
+        if not self._pendientes:
+            return
+        import pyarrow as pa
+        columnas = {c: [f.get(c) for f in self._pendientes] for c in self.campos}
+        if self._writer is None:
+            self._abrir_parquet(pa.table(columnas).schema)
+        self._writer.write_table(pa.table(columnas, schema=self._writer.schema))
+        self._pendientes = []
+
+    def _abrir_parquet(self, esquema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        # Columnas sin valores en el primer lote se guardan como texto
+        esquema = pa.schema([pa.field(f.name, pa.string() if f.type == pa.null() else f.type)
+                             for f in esquema])
+        self._writer = pq.ParquetWriter(self.ruta, esquema)
+
+    def cerrar(self):
+        self.flush()
+        if self.formato == 'csv':
+            self._archivo.close()
+            return
+        if self._writer is None:
+            import pyarrow as pa
+            self._abrir_parquet(pa.schema([pa.field(c, pa.string()) for c in self.campos]))
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class SalidaEtiquetada:
+    """Vista de una salida compartida entre hilos que agrega columnas fijas a cada fila.
+
+    La usa el CLI que corre varios sitios a la vez sobre un único dataset: cada
+    sitio escribe con sus propios `campos` (dicts o listas) y se le agrega, por
+    ejemplo, la columna marketplace. Con `como_texto=True` los valores se guardan
+    como texto, para que un Parquet con columnas de distintos sitios tenga un
+    esquema único.
+    """
+
+    def __init__(self, salida, campos, fijos, lock, como_texto=False):
+        self.salida = salida
+        self.campos = list(campos)
+        self.fijos = fijos
+        self.lock = lock
+        self.como_texto = como_texto
+        self.total = 0
+
+    def _fila(self, fila):
+        fila = dict(fila if isinstance(fila, dict) else zip(self.campos, fila), **self.fijos)
+        if self.como_texto:
+            fila = {k: None if v is None else str(v) for k, v in fila.items()}
+        return fila
+
+    def escribir(self, filas):
+        filas = [self._fila(f) for f in filas]
+        with self.lock:
+            self.salida.escribir(filas)
+        self.total += len(filas)
+
+    def flush(self):
+        with self.lock:
+            self.salida.flush()
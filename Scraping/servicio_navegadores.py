@@ -0,0 +1,272 @@
+import argparse
+import ipaddress
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from .descarga import FetcherSelenium
+from .navegador import crear_driver
+
+# Servicio local de navegadores: mantiene sesiones de Chrome ya abiertas y atiende
+# pedidos de descarga por un socket local, así cada scraper evita resolver el
+# chromedriver y arrancar Chrome en cada ejecución.
+#
+#   python -m Scraping.servicio_navegadores --sesiones 3
+#   python -m Scraping.amazon URL --servicio
+
+DIRECCION = '127.0.0.1:8765'
+# Clave compartida entre servicio y clientes. La conexión usa pickle y permite
+# ejecutar JavaScript en los navegadores, así que no puede ser una clave fija:
+# se toma de SERVICIO_NAVEGADORES_CLAVE o se genera al azar la primera vez y se
+# guarda en un archivo que solo puede leer el usuario.
+VARIABLE_CLAVE = 'SERVICIO_NAVEGADORES_CLAVE'
+RUTA_CLAVE = os.path.join(os.path.expanduser('~'), '.servicio_navegadores_clave')
+
+
+def clave_compartida(ruta=RUTA_CLAVE):
+    """Clave del servicio: la variable de entorno o el archivo `ruta` (se crea con permisos 0600)."""
+    if os.environ.get(VARIABLE_CLAVE):
+        return os.environ[VARIABLE_CLAVE].encode()
+    try:
+        descriptor = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        if os.stat(ruta).st_mode & 0o077:
+            raise PermissionError(f"{ruta} lo pueden leer otros usuarios: use chmod 600")
+        with open(ruta, 'rb') as f:
+            return f.read().strip()
+    clave = secrets.token_hex(32).encode()
+    with os.fdopen(descriptor, 'wb') as f:
+        f.write(clave)
+    return clave
+
+
+def parsear_direccion(direccion):
+    host, _, puerto = direccion.rpartition(':')
+    return host or '127.0.0.1', int(puerto)
+
+
+def es_local(host):
+    """True si todas las direcciones de `host` son de loopback."""
+    try:
+        direcciones = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        return False
+    return all(ipaddress.ip_address(d.split('%')[0]).is_loopback for d in direcciones)
+
+
+def memoria_mb(pid):
+    """RSS en MB del proceso y todos sus descendientes (Linux); None si no hay /proc."""
+    hijos, rss = {}, {}
+    try:
+        pids = [int(p) for p in os.listdir('/proc') if p.isdigit()]
+    except FileNotFoundError:
+        return None
+    for p in pids:
+        try:
+            with open(f'/proc/{p}/stat') as f:
+                campos = f.read().rpartition(')')[2].split()
+        except OSError:
+            continue
+        hijos.setdefault(int(campos[1]), []).append(p)
+        rss[p] = int(campos[21])
+    total, pendientes = 0, [pid]
+    while pendientes:
+        p = pendientes.pop()
+        total += rss.get(p, 0)
+        pendientes.extend(hijos.get(p, []))
+    return total * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+class Sesion:
+    """Un Chrome abierto y la cantidad de páginas que lleva cargadas."""
+
+    def __init__(self, crear):
+        self.fetcher = FetcherSelenium(crear)
+        self.fetcher.driver  # Se abre ahora, antes de que llegue el primer pedido
+        self.paginas = 0
+
+    def memoria_mb(self):
+        proceso = getattr(self.fetcher.driver.service, 'process', None)
+        return memoria_mb(proceso.pid) if proceso is not None else None
+
+    def cerrar(self):
+        try:
+            self.fetcher.cerrar()
+        except Exception:
+            pass
+
+
+class ServicioNavegadores:
+    """Pool de sesiones calientes que se reciclan tras `max_paginas` o si superan `max_memoria_mb`.
+
+    Cada sesión reciclada se cierra y se reemplaza en segundo plano por una nueva,
+    de modo que siempre hay `sesiones` navegadores listos.
+    """
+
+    def __init__(self, crear, sesiones=2, max_paginas=100, max_memoria_mb=1500):
+        self.crear = crear
+        self.max_paginas = max_paginas
+        self.max_memoria_mb = max_memoria_mb
+        self._libres = queue.Queue()
+        self._lock = threading.Lock()
+        self.estadisticas = {'paginas': 0, 'errores': 0, 'recicladas': 0}
+        for _ in range(max(1, sesiones)):
+            self._calentar()
+
+    def _calentar(self):
+        def abrir():
+            try:
+                self._libres.put(Sesion(self.crear))
+            except Exception as e:
+                print(f"  ⚠️ No se pudo abrir un navegador: {e}")
+                time.sleep(5)
+                self._calentar()
+        threading.Thread(target=abrir, daemon=True).start()
+
+    def _reciclar(self, sesion):
+        with self._lock:
+            self.estadisticas['recicladas'] += 1
+        threading.Thread(target=sesion.cerrar, daemon=True).start()
+        self._calentar()
+
+    def _agotada(self, sesion):
+        if sesion.paginas >= self.max_paginas:
+            return True
+        memoria = sesion.memoria_mb() if self.max_memoria_mb else None
+        return memoria is not None and memoria > self.max_memoria_mb
+
+    def usar(self, tarea):
+        """Ejecuta tarea(fetcher) en una sesión libre y la devuelve al pool (o la recicla)."""
+        sesion = self._libres.get()
+        try:
+            resultado = tarea(sesion.fetcher)
+        except Exception:
+            # Un navegador que falló puede quedar en mal estado: se reemplaza
+            with self._lock:
+                self.estadisticas['errores'] += 1
+            self._reciclar(sesion)
+            raise
+        sesion.paginas += 1
+        with self._lock:
+            self.estadisticas['paginas'] += 1
+        if self._agotada(sesion):
+            self._reciclar(sesion)
+        else:
+            self._libres.put(sesion)
+        return resultado
+
+    def fetch(self, url, selector=None):
+        return self.usar(lambda fetcher: fetcher.fetch(url, selector))
+
+    def ejecutar_async(self, url, script, argumentos=(), timeout=120):
+        """Carga la URL y devuelve el resultado de un script asíncrono (ver aliexpress.py)."""
+        def tarea(fetcher):
+            fetcher.driver.get(url)
+            fetcher.driver.set_script_timeout(timeout)
+            return fetcher.driver.execute_async_script(script, *argumentos)
+        return self.usar(tarea)
+
+    def estado(self):
+        with self._lock:
+            return dict(self.estadisticas, libres=self._libres.qsize())
+
+    def atender(self, conn):
+        """Responde los pedidos de un cliente hasta que cierra la conexión."""
+        operaciones = {'fetch': self.fetch, 'ejecutar_async': self.ejecutar_async, 'estado': self.estado}
+        with conn:
+            while True:
+                try:
+                    op, argumentos = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send((True, operaciones[op](*argumentos)))
+                except Exception as e:
+                    conn.send((False, f"{type(e).__name__}: {e}"))
+
+    def servir(self, direccion=DIRECCION, clave=None, permitir_remoto=False):
+        """Atiende clientes en `direccion`; solo en loopback salvo con permitir_remoto."""
+        host, puerto = parsear_direccion(direccion)
+        if not permitir_remoto and not es_local(host):
+            raise ValueError(f"{host} no es una dirección local; use --permitir-remoto para escuchar en la red")
+        clave = clave or clave_compartida()
+        with Listener((host, puerto), authkey=clave) as listener:
+            print(f"Servicio de navegadores escuchando en {direccion}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"  ⚠️ Conexión rechazada: {e}")
+                    continue
+                threading.Thread(target=self.atender, args=(conn,), daemon=True).start()
+
+    def cerrar(self):
+        while True:
+            try:
+                self._libres.get_nowait().cerrar()
+            except queue.Empty:
+                break
+
+
+class ClienteNavegador:
+    """Fetcher que delega la descarga en el servicio; se usa igual que FetcherSelenium."""
+
+    def __init__(self, direccion=DIRECCION, clave=None):
+        self.direccion = direccion
+        self.clave = clave
+        self._conn = None
+
+    def _pedir(self, op, *argumentos):
+        if self._conn is None:
+            self._conn = Client(parsear_direccion(self.direccion), authkey=self.clave or clave_compartida())
+        self._conn.send((op, argumentos))
+        ok, valor = self._conn.recv()
+        if not ok:
+            raise RuntimeError(f"Servicio de navegadores: {valor}")
+        return valor
+
+    def fetch(self, url, selector=None):
+        return self._pedir('fetch', url, selector)
+
+    def ejecutar_async(self, url, script, argumentos=(), timeout=120):
+        return self._pedir('ejecutar_async', url, script, tuple(argumentos), timeout)
+
+    def estado(self):
+        return self._pedir('estado')
+
+    def cerrar(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servicio local de navegadores Chrome precalentados')
+    parser.add_argument('--direccion', default=DIRECCION, help='host:puerto donde escuchar')
+    parser.add_argument('--permitir-remoto', action='store_true',
+                        help='Aceptar una dirección que no sea de loopback (cualquiera con la clave controla los navegadores)')
+    parser.add_argument('--sesiones', type=int, default=2, help='Navegadores abiertos en simultáneo')
+    parser.add_argument('--max-paginas', type=int, default=100,
+                        help='Páginas por sesión antes de reemplazar el navegador')
+    parser.add_argument('--max-memoria-mb', type=float, default=1500,
+                        help='Memoria (Chrome y sus procesos) a partir de la cual se recicla la sesión')
+    parser.add_argument('--completo', action='store_true',
+                        help='Cargar imágenes, fuentes y rastreadores (perfil completo de Chrome)')
+    args = parser.parse_args()
+
+    # Se valida antes de abrir los navegadores
+    if not args.permitir_remoto and not es_local(parsear_direccion(args.direccion)[0]):
+        parser.error(f"{args.direccion} no es una dirección local; use --permitir-remoto")
+    servicio = ServicioNavegadores(lambda: crear_driver(headless=True, liviano=not args.completo),
+                                   sesiones=args.sesiones, max_paginas=args.max_paginas,
+                                   max_memoria_mb=args.max_memoria_mb)
+    try:
+        servicio.servir(args.direccion, permitir_remoto=args.permitir_remoto)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Cerrando navegadores: {servicio.estado()}")
+        servicio.cerrar()
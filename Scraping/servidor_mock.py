@@ -0,0 +1,212 @@
+import argparse
+import collections
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Servidor local que imita a los marketplaces con las páginas de fixtures/, para
+# probar el scraping sin tocar los sitios reales. Puede inyectar lentitud cuando
+# hay demasiadas solicitudes simultáneas y responder como un sitio que limita:
+# 429, página de captcha o grilla vacía.
+#
+# Las rutas se paginan como los sitios: ?page=N (Amazon, AliExpress) o el sufijo
+# _Desde_OFFSET de Mercado Libre; pasada la última página la grilla sale vacía.
+#
+#   python -m Scraping.servidor_mock --puerto 8800 --capacidad 4 --max-concurrentes 8 --tasa-max 20
+#   http://127.0.0.1:8800/amazon?page=3   http://127.0.0.1:8800/ml/listado_Desde_100
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Ruta -> fixture que se sirve
+RUTAS = {
+    '/amazon': 'amazon_busqueda.html',
+    '/ml/mas-vendidos': 'ml_mas_vendidos.html',
+    '/ml/listado': 'ml_listado.html',
+    '/aliexpress': 'aliexpress_productos.html',
+    # Página que arma su grilla pidiendo la API por fetch (para la captura de red)
+    '/xhr': 'xhr_productos.html',
+    '/api/productos': 'api_productos.json',
+}
+TIPOS = {'.html': 'text/html; charset=utf-8', '.json': 'application/json; charset=utf-8'}
+PAGINA_CAPTCHA = ('<html><head><title>Robot Check</title></head><body>'
+                  '<form action="/errors/validateCaptcha"><h4>Type the characters you see</h4></form>'
+                  '</body></html>')
+PAGINA_VACIA = '<html><head><title>Resultados</title></head><body><div id="resultados"></div></body></html>'
+EXCESOS = ('429', 'captcha', 'vacio')
+# Productos por página en los listados de Mercado Libre (_Desde_50 es la página 2)
+POR_PAGINA_ML = 50
+DESDE = re.compile(r'^(.*)_Desde_(\d+)$')
+
+
+def ruta_y_pagina(path, query=''):
+    """Separa la ruta base y el número de página (desde 1) de una URL del mock."""
+    ruta = path.rstrip('/') or '/'
+    desde = DESDE.match(ruta)
+    if desde:
+        return desde.group(1), int(desde.group(2)) // POR_PAGINA_ML + 1
+    try:
+        pagina = int(parse_qs(query).get('page', ['1'])[0])
+    except ValueError:
+        pagina = 1
+    return ruta, max(1, pagina)
+
+
+class ServidorMock:
+    """Sirve los fixtures con latencia configurable y limitación por concurrencia o tasa.
+
+    - latencia: segundos base por respuesta.
+    - paginas: páginas que tiene cada ruta; desde la siguiente se sirve la
+      grilla vacía (None = todas las páginas existen).
+    - capacidad: solicitudes simultáneas que atiende sin degradarse; cada una de
+      más agrega `penalizacion` segundos (así se simula un sitio que se pone lento).
+    - max_concurrentes / tasa_max: por encima de ese número de solicitudes en
+      curso, o de solicitudes en el último segundo, responde según `exceso`
+      ('429', 'captcha' o 'vacio').
+    """
+
+    def __init__(self, host='127.0.0.1', puerto=0, latencia=0.05, capacidad=4, penalizacion=0.25,
+                 max_concurrentes=None, tasa_max=None, exceso='429', paginas=None, fixtures=FIXTURES):
+        if exceso not in EXCESOS:
+            raise ValueError(f"Exceso desconocido: {exceso}")
+        self.latencia = latencia
+        self.capacidad = capacidad
+        self.penalizacion = penalizacion
+        self.max_concurrentes = max_concurrentes
+        self.tasa_max = tasa_max
+        self.exceso = exceso
+        self.paginas = paginas
+        self.contenidos = {}
+        self.tipos = {}
+        for ruta, archivo in RUTAS.items():
+            with open(os.path.join(fixtures, archivo), encoding='utf-8') as f:
+                self.contenidos[ruta] = f.read().encode('utf-8')
+            self.tipos[ruta] = TIPOS[os.path.splitext(archivo)[1]]
+        self.estadisticas = collections.Counter()
+        self._en_curso = 0
+        self._recientes = collections.deque()
+        self._lock = threading.Lock()
+        self._servidor = ThreadingHTTPServer((host, puerto), self._manejador())
+        self._servidor.daemon_threads = True
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def _entrar(self):
+        """Registra una solicitud; devuelve (en_curso, solicitudes en el último segundo)."""
+        with self._lock:
+            ahora = time.monotonic()
+            self._en_curso += 1
+            self._recientes.append(ahora)
+            while self._recientes and self._recientes[0] < ahora - 1:
+                self._recientes.popleft()
+            return self._en_curso, len(self._recientes)
+
+    def _salir(self):
+        with self._lock:
+            self._en_curso -= 1
+
+    def responder(self, ruta, pagina=1):
+        """(estado HTTP, cuerpo) para una página de una ruta, aplicando latencia y limitación."""
+        en_curso, tasa = self._entrar()
+        try:
+            excedido = (self.max_concurrentes is not None and en_curso > self.max_concurrentes) or \
+                       (self.tasa_max is not None and tasa > self.tasa_max)
+            time.sleep(self.latencia + self.penalizacion * max(0, en_curso - self.capacidad))
+            if ruta not in self.contenidos:
+                self.estadisticas['404'] += 1
+                return 404, b'no encontrado'
+            if excedido:
+                self.estadisticas[self.exceso] += 1
+                if self.exceso == '429':
+                    return 429, b'demasiadas solicitudes'
+                return 200, (PAGINA_CAPTCHA if self.exceso == 'captcha' else PAGINA_VACIA).encode('utf-8')
+            if self.paginas is not None and pagina > self.paginas:
+                self.estadisticas['fin'] += 1
+                return 200, PAGINA_VACIA.encode('utf-8')
+            self.estadisticas['ok'] += 1
+            return 200, self.contenidos[ruta]
+        finally:
+            self._salir()
+
+    def _manejador(self):
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                ruta, pagina = ruta_y_pagina(url.path, url.query)
+                estado, cuerpo = servidor.responder(ruta, pagina)
+                self.send_response(estado)
+                # Las páginas de error, captcha o grilla vacía siempre son HTML
+                fixture = cuerpo is servidor.contenidos.get(ruta)
+                self.send_header('Content-Type', servidor.tipos[ruta] if fixture else TIPOS['.html'])
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+        return Manejador
+
+    def servir(self):
+        """Atiende solicitudes en el hilo actual hasta que se interrumpe."""
+        try:
+            self._servidor.serve_forever()
+        finally:
+            self._servidor.server_close()
+
+    def iniciar(self):
+        """Arranca el servidor en un hilo y devuelve su URL base."""
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self.url
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description='Marketplace local con las páginas de fixtures/')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8800)
+    parser.add_argument('--latencia', type=float, default=0.05, help='Segundos base por respuesta')
+    parser.add_argument('--capacidad', type=int, default=4,
+                        help='Solicitudes simultáneas sin degradación')
+    parser.add_argument('--penalizacion', type=float, default=0.25,
+                        help='Segundos extra por cada solicitud simultánea por encima de la capacidad')
+    parser.add_argument('--max-concurrentes', type=int, default=None,
+                        help='Solicitudes simultáneas a partir de las cuales se limita')
+    parser.add_argument('--tasa-max', type=float, default=None,
+                        help='Solicitudes por segundo a partir de las cuales se limita')
+    parser.add_argument('--exceso', choices=EXCESOS, default='429',
+                        help='Respuesta al limitar: 429, página de captcha o grilla vacía')
+    parser.add_argument('--paginas', type=int, default=None,
+                        help='Páginas por ruta; desde la siguiente la grilla sale vacía')
+    return parser
+
+
+if __name__ == '__main__':
+    args = crear_parser().parse_args()
+    servidor = ServidorMock(args.host, args.puerto, args.latencia, args.capacidad, args.penalizacion,
+                            args.max_concurrentes, args.tasa_max, args.exceso, args.paginas)
+    print(f"Marketplace local en {servidor.url} (rutas: {', '.join(RUTAS)})")
+    try:
+        servidor.servir()
+    except KeyboardInterrupt:
+        pass
+    print(f"Respuestas: {dict(servidor.estadisticas)}")
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+from .descarga import CABECERAS, crear_sesion
+
+# Sesiones autenticadas guardadas en disco: cookies y localStorage del navegador
+# después del login, para reutilizarlas en las siguientes ejecuciones.
+
+# Campos de cookie que acepta driver.add_cookie
+CAMPOS_COOKIE = ('name', 'value', 'domain', 'path', 'expiry', 'secure', 'httpOnly', 'sameSite')
+
+
+class AlmacenSesion:
+    """Cookies, localStorage y User-Agent de un sitio en un JSON legible solo por el usuario."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def cargar(self):
+        """Datos guardados, o None si no hay archivo o está dañado."""
+        try:
+            with open(self.ruta, encoding='utf-8') as f:
+                datos = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return datos if isinstance(datos, dict) and datos.get('cookies') else None
+
+    def guardar(self, driver):
+        datos = datos_sesion(driver)
+        # Se escribe con permisos 600 y se reemplaza de forma atómica
+        temporal = f"{self.ruta}.tmp"
+        descriptor = os.open(temporal, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False)
+        os.replace(temporal, self.ruta)
+        return datos
+
+    def borrar(self):
+        try:
+            os.remove(self.ruta)
+        except FileNotFoundError:
+            pass
+
+
+def datos_sesion(driver):
+    """Cookies, localStorage y User-Agent actuales del navegador."""
+    return {
+        'guardada': time.time(),
+        'url': driver.current_url,
+        'user_agent': driver.execute_script('return navigator.userAgent'),
+        'cookies': driver.get_cookies(),
+        'local_storage': driver.execute_script('return Object.assign({}, window.localStorage);') or {},
+    }
+
+
+def vencida(datos, cookie):
+    """True si falta la cookie indicada o ya expiró según su fecha."""
+    for c in datos.get('cookies', []):
+        if c.get('name') == cookie:
+            return 'expiry' in c and c['expiry'] <= time.time()
+    return True
+
+
+def sesion_http(datos):
+    """Sesión de requests con las cookies y el User-Agent guardados."""
+    sesion = crear_sesion(reintentos=3)
+    sesion.headers['User-Agent'] = datos.get('user_agent') or CABECERAS['User-Agent']
+    for c in datos.get('cookies', []):
+        sesion.cookies.set(c['name'], c['value'], domain=c.get('domain'), path=c.get('path', '/'))
+    return sesion
+
+
+def restaurar(driver, datos, url_base):
+    """Carga cookies y localStorage en el navegador y vuelve a abrir `url_base` ya autenticado."""
+    # Las cookies solo se pueden agregar estando en el dominio
+    driver.get(url_base)
+    for c in datos.get('cookies', []):
+        try:
+            driver.add_cookie({k: v for k, v in c.items() if k in CAMPOS_COOKIE})
+        except Exception:
+            continue  # Cookies de otros subdominios que el navegador no acepta desde esta página
+    if datos.get('local_storage'):
+        driver.execute_script(
+            'for (const [k, v] of Object.entries(arguments[0])) window.localStorage.setItem(k, v);',
+            datos['local_storage'])
+    driver.get(url_base)
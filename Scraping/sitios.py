@@ -0,0 +1,62 @@
+import importlib
+import shlex
+
+# Registro de sitios: cada adaptador apunta al módulo que lo scrapea, que se
+# importa recién al usarlo. Todos los módulos exponen crear_parser(),
+# ejecutar(args, salida) y la lista de columnas que escriben.
+
+
+class Sitio:
+    """Adaptador de un sitio scrapeado por el módulo `modulo` del paquete."""
+
+    def __init__(self, nombre, modulo, marketplace, url=None, campos='CAMPOS'):
+        self.nombre = nombre
+        self._modulo = modulo
+        self.marketplace = marketplace
+        self.url = url
+        self._campos = campos
+
+    @property
+    def modulo(self):
+        return importlib.import_module(f'{__package__}.{self._modulo}')
+
+    @property
+    def campos(self):
+        return getattr(self.modulo, self._campos)
+
+    def columnas(self, args):
+        """Columnas que escribirá el scraper con estos argumentos."""
+        campos = getattr(self.modulo, 'campos', None)
+        return campos(args) if callable(campos) else self.campos
+
+    def opciones(self, url=None, argumentos='', **comunes):
+        """Argumentos del scraper: los por defecto, luego `argumentos` (texto de CLI) y `comunes`.
+
+        Solo se aplican las opciones comunes que el scraper conoce y que tienen valor.
+        """
+        argv = [url or self.url] if self.url else []
+        args = self.modulo.crear_parser().parse_args(argv + shlex.split(argumentos))
+        for clave, valor in comunes.items():
+            if valor is not None and valor is not False and hasattr(args, clave):
+                setattr(args, clave, valor)
+        return args
+
+    def ejecutar(self, args, salida):
+        return self.modulo.ejecutar(args, salida)
+
+
+SITIOS = {sitio.nombre: sitio for sitio in (
+    Sitio('aliexpress', 'aliexpress', 'AliExpress',
+          url='https://www.aliexpress.com/p/calp-plus/index.html'
+              '?spm=a2g0o.tm1000016012.allcategoriespc.19.74cd38f28ofDto&categoryTab=pet_supplies'),
+    Sitio('amazon', 'amazon', 'Amazon',
+          url='https://www.amazon.com/s?i=pets-intl-ship&bbn=16225013011&rh=n%3A2619533011%2Cn%3A16225013011'
+              '&s=exact-aware-popularity-rank&language=es'),
+    Sitio('mercado_libre', 'mercado_libre', 'Mercado Libre',
+          url='https://www.mercadolibre.com.co/mas-vendidos/MCO1071'),
+    Sitio('ml_listado', 'categoriamascotas', 'Mercado Libre', campos='columnas'),
+    Sitio('instagram', 'instagram', 'Instagram'),
+)}
+
+# Sitios que se corren si no se indica ninguno (Instagram necesita login con ventana)
+POR_DEFECTO = ['aliexpress', 'amazon', 'mercado_libre']
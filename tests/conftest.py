@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Los módulos de Procesamiento se importan entre sí por nombre (from parseo_valores import ...),
+# como cuando se corren los scripts desde esa carpeta
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'Procesamiento'))
+sys.path.insert(0, RAIZ)
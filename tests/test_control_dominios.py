@@ -0,0 +1,33 @@
+import pytest
+import requests
+from Scraping.control_dominios import ControlDominios, controlado
+from Scraping.descarga import crear_fetcher
+from Scraping.servidor_mock import ServidorMock
+
+SELECTOR = 'div.poly-card--grid-card'
+
+
+@pytest.mark.parametrize('backend', ['http', 'auto'])
+def test_429_es_bloqueo_a_la_primera(backend):
+    control = ControlDominios(concurrencia_inicial=4, maximo=4)
+    with ServidorMock(latencia=0, max_concurrentes=0) as servidor:
+        fetcher = controlado(crear_fetcher(backend, None, crear_navegador=lambda: None,
+                                           reintentar_estados=False), control)
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch(f"{servidor.url}/ml/mas-vendidos", SELECTOR)
+        # Una sola solicitud al sitio: el control espera, no urllib3
+        assert servidor.estadisticas['429'] == 1
+    estado, = control.estado().values()
+    assert (estado['bloqueo'], estado['error']) == (1, 0)
+    assert estado['concurrencia'] == control.minimo
+    assert estado['pausa'] == control.pausa_recorte * 4
+
+
+def test_pagina_sana_suma_concurrencia():
+    control = ControlDominios(concurrencia_inicial=2, maximo=4)
+    with ServidorMock(latencia=0) as servidor:
+        fetcher = controlado(crear_fetcher('http', None, reintentar_estados=False), control)
+        fetcher.fetch(f"{servidor.url}/ml/mas-vendidos", SELECTOR)
+    estado, = control.estado().values()
+    assert estado['ok'] == 1
+    assert estado['concurrencia'] == 2.5
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+from datasets import COMPETENCIA, Escritor, lotes
+from limpieza import limpiar
+
+AMAZON = ('title,price,reviews,sold,rating,category\n'
+          'comedero automático,10,162,300+ comprados el mes pasado,5,Gatos\n'
+          '2024,10.5,"2,576",40 K+ comprados el mes pasado,4.5,Perros\n')
+
+
+@pytest.mark.parametrize('extension', ['csv', 'parquet'])
+def test_salida_no_depende_del_lote(tmp_path, extension):
+    # Con una fila por lote, pd.read_csv infiere el precio 10 y el rating 5 como int
+    # y el título "2024" como número; la salida tiene que ser la misma
+    entrada = tmp_path / 'amazon.csv'
+    entrada.write_text(AMAZON, encoding='utf-8')
+    salidas = []
+    for filas_por_lote in (100, 1):
+        salida = tmp_path / f'limpio_{filas_por_lote}.{extension}'
+        limpiar(str(entrada), str(salida), 'Amazon', filas_por_lote=filas_por_lote)
+        # En Parquet cada lote es un row group: se comparan los datos, no los bytes
+        salidas.append(salida.read_bytes() if extension == 'csv' else pd.read_parquet(salida))
+        if extension == 'csv':
+            assert salida.read_text(encoding='utf-8').splitlines()[1:] == [
+                'comedero automático,40000.0,0,300,5.0,Gatos,Amazon',
+                '2024,42000.0,0,40000,4.5,Perros,Amazon']
+    if extension == 'csv':
+        assert salidas[0] == salidas[1]
+    else:
+        pd.testing.assert_frame_equal(salidas[0], salidas[1])
+
+
+def test_csv_con_enteros_faltantes(tmp_path):
+    salida = tmp_path / 'competencia.csv'
+    df = pd.DataFrame({'title': ['a', 'b'], 'price': [1.0, None], 'discount': [3, None], 'sold': [1, 2],
+                       'rating': [None, 4.0], 'category': ['Gatos', None], 'marketplace': 'Amazon'})
+    with Escritor(str(salida), COMPETENCIA) as escritor:
+        escritor.escribir(df)
+    assert salida.read_text(encoding='utf-8').splitlines()[1:] == ['a,1.0,3,1,,Gatos,Amazon', 'b,,,2,4.0,,Amazon']
+    leido, = lotes(str(salida), esquema=COMPETENCIA)
+    assert leido['discount'].isna().tolist() == [False, True]
@@ -0,0 +1,49 @@
+import pytest
+import requests
+from Scraping.descarga import FetcherHttp, FetcherHttpPrimero, crear_sesion
+from Scraping.servidor_mock import ServidorMock
+
+SELECTOR = 'div.poly-card--grid-card'
+
+
+class NavegadorFalso:
+    """Hace de Selenium: registra las URLs pedidas y devuelve una página fija."""
+
+    def __init__(self):
+        self.urls = []
+
+    def fetch(self, url, selector=None):
+        self.urls.append(url)
+        return '<html>renderizada</html>'
+
+    def cerrar(self):
+        pass
+
+
+def fetcher(**opciones):
+    return FetcherHttpPrimero(FetcherHttp(crear_sesion(**opciones)), NavegadorFalso())
+
+
+def test_pagina_completa_por_http():
+    with ServidorMock(latencia=0) as servidor:
+        f = fetcher()
+        html = f.fetch(f"{servidor.url}/ml/mas-vendidos", SELECTOR)
+    assert 'poly-card--grid-card' in html
+    assert f.estadisticas == {'http': 1, 'selenium': 0}
+
+
+def test_sin_tarjetas_recurre_a_selenium():
+    # Llega un 200 pero sin las tarjetas: la página necesita JavaScript
+    with ServidorMock(latencia=0, paginas=1) as servidor:
+        f = fetcher()
+        assert f.fetch(f"{servidor.url}/ml/mas-vendidos?page=2", SELECTOR) == '<html>renderizada</html>'
+    assert f.navegador.urls == [f"{servidor.url}/ml/mas-vendidos?page=2"]
+
+
+def test_limitacion_no_abre_chrome():
+    with ServidorMock(latencia=0, max_concurrentes=0) as servidor:
+        f = fetcher(reintentos=1)
+        with pytest.raises(requests.RequestException):
+            f.fetch(f"{servidor.url}/ml/mas-vendidos", SELECTOR)
+    assert f.navegador.urls == []
+    assert f.estadisticas == {'http': 0, 'selenium': 0}
@@ -0,0 +1,98 @@
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from duplicados import (VECINOS_POR_CUBETA, _candidatos, agrupar_duplicados, elegir_bandas, eliminar_duplicados,
+                        firmas_minhash, palabras_normalizadas)
+
+
+def variantes(semilla, grupos, por_grupo, largo, cambios):
+    """Títulos de `largo` palabras: por grupo, uno base y `por_grupo` copias con `cambios` palabras distintas."""
+    rng = random.Random(semilla)
+    titulos = []
+    for g in range(grupos):
+        base = [f"p{g}w{i}" for i in range(largo)]
+        titulos.append(' '.join(base))
+        for v in range(por_grupo):
+            copia = list(base)
+            for i in rng.sample(range(largo), cambios):
+                copia[i] = f"x{g}v{v}w{i}"
+            titulos.append(' '.join(copia))
+    return titulos
+
+
+def test_df_vacio():
+    df = pd.DataFrame({'title': pd.Series([], dtype=object), 'category': pd.Series([], dtype=object)})
+    grupos = agrupar_duplicados(df)
+    assert list(grupos.columns) == ['grupo', 'canonica', 'tamano']
+    assert len(grupos) == 0
+    assert len(eliminar_duplicados(df)) == 0
+
+
+@pytest.mark.parametrize('titulos', [[None, None], ['', ''], [None, '', '  ', '!!', np.nan]])
+def test_titulos_sin_palabras(titulos):
+    # Sin palabras no hay con qué comparar: cada fila es su propio grupo
+    df = pd.DataFrame({'title': titulos, 'category': 'Gatos'})
+    grupos = agrupar_duplicados(df)
+    assert grupos['grupo'].tolist() == list(range(len(df)))
+    assert (grupos['tamano'] == 1).all()
+    assert len(eliminar_duplicados(df)) == len(df)
+
+
+def test_candidatos_sin_filas_validas():
+    firmas = np.zeros((3, 8), dtype=np.uint32)
+    origenes, destinos = _candidatos(firmas, np.zeros(3, dtype=np.int64), np.zeros(3, dtype=bool), 4, 2)
+    assert len(origenes) == 0 and len(destinos) == 0
+
+
+def test_agrupa_casi_duplicados_dentro_del_bloque():
+    titulos = ['Rascador para gatos con hamaca y poste de sisal gris',
+               'rascador para gatos con hamaca y poste de sisal, gris',
+               'Comedero automático para perros 4 litros',
+               'Rascador para gatos con hamaca y poste de sisal gris']
+    df = pd.DataFrame({'title': titulos, 'category': ['Gatos', 'Gatos', 'Perros', 'Perros'],
+                       'price': [1.0, None, 2.0, 3.0]})
+    grupos = agrupar_duplicados(df)
+    assert grupos.loc[0, 'grupo'] == grupos.loc[1, 'grupo']
+    # Mismo título pero en otra categoría: no se compara
+    assert grupos.loc[3, 'grupo'] != grupos.loc[0, 'grupo']
+    # Se queda la fila con más campos completos
+    assert eliminar_duplicados(df).index.tolist() == [0, 2, 3]
+
+
+def test_candidatos_incluyen_todos_los_pares_de_cada_cubeta():
+    # Grupos de 4 títulos parecidos entre sí (Jaccard 0.82 a 0.9) en un solo bloque:
+    # las cubetas tienen más de dos filas y cada par que pasa la verificación
+    # con la firma completa tiene que haber sido candidato
+    titulos = variantes(0, 300, 3, 20, 1)
+    n = len(titulos)
+    filas, palabras, total = palabras_normalizadas(pd.Series(titulos))
+    firmas = firmas_minhash(filas, palabras, total, n)
+    origenes, destinos = _candidatos(firmas, np.zeros(n, dtype=np.int64), np.ones(n, dtype=bool),
+                                     *elegir_bandas(firmas.shape[1], 0.8))
+    candidatos = set(zip(np.minimum(origenes, destinos).tolist(), np.maximum(origenes, destinos).tolist()))
+    similares = [(i, j) for g in range(0, n, 4) for i in range(g, g + 4) for j in range(i + 1, g + 4)
+                 if (firmas[i] == firmas[j]).mean() >= 0.8]
+    assert len(similares) > 500
+    assert all(par in candidatos for par in similares)
+
+
+@pytest.mark.parametrize('largo,cambios,recall', [(20, 1, 0.98), (25, 2, 0.8)])
+def test_recall_cerca_del_umbral(largo, cambios, recall):
+    # Pares aislados con Jaccard 0.905 y 0.852; el resto de la pérdida es el error
+    # de estimar la similitud con 64 permutaciones
+    titulos = variantes(1, 500, 1, largo, cambios)
+    grupo = agrupar_duplicados(pd.DataFrame({'title': titulos, 'category': 'Gatos'}))['grupo'].to_numpy()
+    assert (grupo[0::2] == grupo[1::2]).mean() >= recall
+
+
+def test_cubeta_enorme_acotada():
+    # Muchos títulos idénticos: cada fila se compara con pocas, pero quedan en un solo grupo
+    n = 20 * VECINOS_POR_CUBETA
+    df = pd.DataFrame({'title': ['Arena aglomerante para gatos 10 kg'] * n, 'category': 'Gatos'})
+    filas, palabras, total = palabras_normalizadas(df['title'])
+    firmas = firmas_minhash(filas, palabras, total, n)
+    bandas, por_banda = elegir_bandas(firmas.shape[1], 0.8)
+    origenes, _ = _candidatos(firmas, np.zeros(n, dtype=np.int64), np.ones(n, dtype=bool), bandas, por_banda)
+    assert len(origenes) <= bandas * n * VECINOS_POR_CUBETA
+    assert agrupar_duplicados(df)['tamano'].eq(n).all()
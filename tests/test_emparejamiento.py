@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from emparejamiento import emparejar, vectorizar
+
+COLUMNAS = ['indice', 'marketplace', 'indice_match', 'marketplace_match', 'category', 'score', 'rango']
+
+
+@pytest.mark.parametrize('titulos', [[], [None, None], ['', '  ']])
+def test_vectorizar_sin_ngramas(titulos):
+    vectores = vectorizar(titulos)
+    assert vectores.shape == (len(titulos), 0)
+
+
+@pytest.mark.parametrize('df', [
+    pd.DataFrame({'title': [], 'category': [], 'marketplace': []}),
+    pd.DataFrame({'title': [None, '', None], 'category': 'Gatos', 'marketplace': ['Amazon', 'AliExpress', 'Amazon']}),
+])
+def test_sin_titulos_no_hay_emparejamientos(df):
+    matches = emparejar(df)
+    assert list(matches.columns) == COLUMNAS
+    assert len(matches) == 0
+
+
+def test_empareja_entre_marketplaces_de_la_misma_categoria():
+    df = pd.DataFrame({
+        'title': ['Rascador para gatos con hamaca', 'rascador gato con hamaca', 'Rascador para gatos con hamaca',
+                  'Collar antipulgas para perros'],
+        'category': ['Gatos', 'Gatos', 'Perros', 'Gatos'],
+        'marketplace': ['Amazon', 'AliExpress', 'AliExpress', 'AliExpress'],
+    })
+    # Con tan pocos títulos, max_df=0.5 descartaría los n-gramas que comparten
+    matches = emparejar(df, k=1, max_df=1.0)
+    assert sorted(matches[['indice', 'indice_match']].values.tolist()) == [[0, 1], [1, 0]]
+    assert (matches['rango'] == 1).all()
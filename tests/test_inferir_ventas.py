@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from Inferir_ventas import ModeloVentas, inferir_ventas
+
+COLUMNAS = 'category,position,label,title,rating,reviews_count,price\n'
+
+
+def test_precios_con_un_solo_separador_de_miles(tmp_path):
+    # Todos los precios por debajo de 1.000.000: leídos como número serían 84.9, 73.0...
+    entrada = tmp_path / 'mercado_libre.csv'
+    entrada.write_text(COLUMNAS +
+                       'Aves,1,1º MÁS VENDIDO,Incubadora,4.4,30,84.900\n'
+                       'Aves,2,2º MÁS VENDIDO,Comedero,4.9,1.234,73.000\n'
+                       'Peces,1,1º MÁS VENDIDO,Filtro,,,999.999\n', encoding='utf-8')
+    salida = tmp_path / 'salida.csv'
+    inferir_ventas(str(entrada), str(salida))
+    df = pd.read_csv(salida)
+    assert df['price'].tolist() == [84900.0, 73000.0, 999999.0]
+    assert df['reviews'].tolist()[:2] == [30.0, 1234.0]
+    # 1000 / 1 * (1 + 30 / 100), 1000 / 2 * (1 + 1234 / 100), 1000 / 1 * 0.7
+    assert df['sold'].tolist() == [1300, 6670, 700]
+
+
+def test_score_igual_a_la_version_fila_por_fila():
+    def estimar_ventas(row):
+        try:
+            ventas_base = 1000 / row['position']
+            if pd.notna(row['reviews_count']):
+                ventas_base *= (1 + row['reviews_count'] / 100)
+            else:
+                ventas_base *= 0.7
+            return round(ventas_base)
+        except:
+            return 0
+
+    rng = np.random.default_rng(0)
+    posiciones = rng.integers(-1, 40, 2000).astype(float)
+    posiciones[::37] = np.nan
+    posiciones[::53] = 0.5
+    resenas = rng.integers(0, 5000, 2000).astype(float)
+    resenas[::3] = np.nan
+    df = pd.DataFrame({'position': posiciones, 'reviews_count': resenas})
+    with np.errstate(divide='ignore'):
+        esperado = df.apply(estimar_ventas, axis=1).tolist()
+    assert ModeloVentas().score(df).tolist() == esperado
+
+
+def test_calibrar_recupera_los_parametros():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'position': rng.integers(1, 50, 5000),
+                       'reviews_count': np.where(rng.random(5000) < 0.3, np.nan, rng.integers(0, 10000, 5000))})
+    real = ModeloVentas(base=3000, escala_resenas=40, factor_sin_resenas=0.2)
+    df['sold'] = real.estimar(df) * np.exp(rng.normal(0, 0.05, len(df)))
+    modelo = ModeloVentas().calibrar(df)
+    assert abs(modelo.base / 3000 - 1) < 0.05
+    assert abs(modelo.escala_resenas / 40 - 1) < 0.05
+    assert abs(modelo.factor_sin_resenas / 0.2 - 1) < 0.05
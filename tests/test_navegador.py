@@ -0,0 +1,75 @@
+import json
+import shutil
+import pytest
+import requests
+from Scraping.navegador import BLOQUEADOS, bloquear_recursos, crear_driver, opciones_chrome, respuestas_json
+from Scraping.servidor_mock import ServidorMock
+
+CHROME = any(shutil.which(b) for b in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'))
+
+
+class DriverFalso:
+    """Repite el registro de rendimiento que dejaría Chrome al cargar /xhr del mock."""
+
+    def __init__(self, url_base):
+        self.cuerpos = {}
+        self.comandos = []
+        self.registro = []
+        for i, (ruta, tipo) in enumerate([('/xhr', 'Document'), ('/api/productos', 'Fetch'),
+                                          ('/api/productos', 'Image')]):
+            resp = requests.get(url_base + ruta)
+            self.cuerpos[str(i)] = resp.text
+            respuesta = {'url': url_base + ruta, 'mimeType': resp.headers['Content-Type'].split(';')[0]}
+            mensaje = {'method': 'Network.responseReceived',
+                       'params': {'requestId': str(i), 'type': tipo, 'response': respuesta}}
+            self.registro.append({'message': json.dumps({'message': mensaje})})
+        self.registro.append({'message': json.dumps({'message': {'method': 'Network.loadingFinished'}})})
+
+    def get_log(self, tipo):
+        registro, self.registro = self.registro, []
+        return registro
+
+    def execute_cdp_cmd(self, comando, parametros):
+        self.comandos.append((comando, parametros))
+        if comando == 'Network.getResponseBody':
+            return {'body': self.cuerpos[parametros['requestId']], 'base64Encoded': False}
+        return {}
+
+
+def test_captura_solo_si_se_pide():
+    assert 'goog:loggingPrefs' not in opciones_chrome().to_capabilities()
+    assert opciones_chrome(capturar_red=True).to_capabilities()['goog:loggingPrefs'] == {'performance': 'ALL'}
+
+
+def test_bloquear_recursos():
+    driver = DriverFalso.__new__(DriverFalso)
+    driver.comandos = []
+    bloquear_recursos(driver)
+    assert driver.comandos == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': BLOQUEADOS})]
+
+
+def test_respuestas_json_del_registro():
+    with ServidorMock(latencia=0) as servidor:
+        driver = DriverFalso(servidor.url)
+        esperado = requests.get(f"{servidor.url}/api/productos").json()
+    # Solo la respuesta JSON pedida por fetch; el documento y la imagen se ignoran
+    assert respuestas_json(driver, r'/api/') == [(f"{servidor.url}/api/productos", esperado)]
+    # El registro se vacía al leerlo
+    assert respuestas_json(driver) == []
+
+
+@pytest.mark.skipif(not CHROME, reason='Chrome no está instalado')
+def test_chrome_captura_json_y_bloquea_imagenes():
+    with ServidorMock(latencia=0) as servidor:
+        driver = crear_driver(headless=True, liviano=True, capturar_red=True)
+        try:
+            driver.get(f"{servidor.url}/xhr")
+            driver.implicitly_wait(5)
+            driver.find_element('css selector', 'div.tarjeta-xhr')
+            respuestas = respuestas_json(driver, r'/api/productos')
+        finally:
+            driver.quit()
+        esperado = requests.get(f"{servidor.url}/api/productos").json()
+        # La imagen (/logo.png) quedó bloqueada: nunca llegó al servidor
+        assert servidor.estadisticas['404'] == 0
+    assert respuestas == [(f"{servidor.url}/api/productos", esperado)]
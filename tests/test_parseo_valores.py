@@ -0,0 +1,185 @@
+import io
+import math
+import random
+import re
+import numpy as np
+import pandas as pd
+import pytest
+from parseo_valores import LOCALES, parsear_conteo, parsear_descuento, parsear_precio, parsear_vendidos
+
+# Paridad de las versiones vectorizadas con las funciones fila por fila que
+# usaban limpieza.py e Inferir_ventas.py (copiadas tal cual), sobre valores
+# generados al azar con semillas fijas.
+
+
+# --- Funciones originales ---
+
+def clean_price(price_str):
+    if isinstance(price_str, str):
+        price_str = price_str.replace("COP", "").replace(".", "").replace(",", ".").strip()
+    try:
+        return float(price_str)
+    except:
+        return None
+
+
+def clean_discount(discount_str):
+    if isinstance(discount_str, str):
+        match = re.search(r"-?(\d+)", discount_str)
+        return int(match.group(1)) if match else 0
+    return 0
+
+
+def clean_sold(sold_str):
+    if isinstance(sold_str, str):
+        sold_str = sold_str.lower()
+        if 'k' in sold_str:
+            match = re.search(r"([\d,.]+)", sold_str)
+            if match:
+                return int(float(match.group(1).replace(",", "").replace(".", "")) * 1000)
+        match = re.search(r"(\d+)", sold_str)
+        if match:
+            return int(match.group(1))
+    try:
+        return int(sold_str)
+    except:
+        return 0
+
+
+def limpiar_precio(precio):
+    if pd.isna(precio):
+        return None
+    try:
+        if isinstance(precio, str):
+            precio = precio.replace('.', '').replace(',', '.')
+        return float(precio)
+    except:
+        return None
+
+
+# --- Generación de valores ---
+
+PIEZAS = ['0', '1', '7', '25', '325', '13', '350', '84', '900', '000', '.', ',', ' ', '-', '+', '%',
+          'COP', 'k', 'K', ' K+', 'sold', ' comprados el mes pasado', 'e3', 'E-2', 'inf', 'nan',
+          'ñ', 'é', '٣', '(', ')', '\t']
+NO_TEXTO = [None, np.nan, 0, 7, -3, 2.5, 1e20, float('inf'), True]
+# Un número que no cabe en int64 manda toda la columna a la vía escalar: solo en algunos casos
+GRANDE = '99999999999999999999'
+
+
+def texto(rng):
+    return ''.join(rng.choice(PIEZAS) for _ in range(rng.randint(0, 6)))
+
+
+def valores(rng, n, repetidos, con_no_texto, grandes=False):
+    """n valores: textos al azar, con pocos distintos si `repetidos`, y a veces no textos o números enormes."""
+    base = [texto(rng) for _ in range(max(1, n // 20) if repetidos else n)]
+    if grandes:
+        base = [GRANDE + t if rng.random() < 0.1 else t for t in base]
+    salida = [rng.choice(base) for _ in range(n)]
+    if con_no_texto:
+        for i in rng.sample(range(n), n // 10):
+            salida[i] = rng.choice(NO_TEXTO)
+    return salida
+
+
+def lanza(funcion, valor):
+    try:
+        funcion(valor)
+    except Exception as e:
+        return type(e)
+    return None
+
+
+def mismos(a, b):
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if isinstance(x, float) and isinstance(y, float) and math.isnan(x) and math.isnan(y):
+            continue
+        if x != y:
+            return False
+    return True
+
+
+def comparar(funcion, vectorizada, serie):
+    """Mismo resultado que .apply(funcion) en los valores que la función acepta,
+    y la misma excepción cuando la serie trae alguno con el que falla."""
+    errores = [lanza(funcion, v) for v in serie]
+    validos = serie[[e is None for e in errores]]
+    resultado = vectorizada(validos)
+    assert resultado.index.equals(validos.index)
+    # None (precio inválido) queda como NaN
+    referencia = [np.nan if v is None else v for v in validos.apply(funcion)]
+    obtenido = [float(v) if isinstance(v, float) else v for v in resultado.tolist()]
+    assert mismos(obtenido, referencia), \
+        [(v, r, e) for v, r, e in zip(validos, obtenido, referencia) if not mismos([r], [e])][:5]
+    for posicion in [i for i, e in enumerate(errores) if e is not None][:5]:
+        with pytest.raises(errores[posicion]):
+            vectorizada(pd.concat([validos.iloc[:20], serie.iloc[[posicion]]]))
+
+
+CASOS = [(semilla, repetidos, con_no_texto, semilla % 5 == 0) for semilla in range(10)
+         for repetidos in (False, True) for con_no_texto in (False, True)]
+
+
+@pytest.mark.parametrize('semilla,repetidos,con_no_texto,grandes', CASOS)
+def test_precio_igual_a_clean_price(semilla, repetidos, con_no_texto, grandes):
+    rng = random.Random(semilla)
+    serie = pd.Series(valores(rng, 400, repetidos, con_no_texto, grandes), dtype=object)
+    comparar(clean_price, lambda s: parsear_precio(s, **LOCALES['AliExpress']), serie)
+
+
+@pytest.mark.parametrize('semilla,repetidos,con_no_texto,grandes', CASOS)
+def test_precio_igual_a_limpiar_precio(semilla, repetidos, con_no_texto, grandes):
+    rng = random.Random(100 + semilla)
+    serie = pd.Series(valores(rng, 400, repetidos, con_no_texto, grandes), dtype=object)
+    comparar(limpiar_precio, lambda s: parsear_precio(s, **LOCALES['Mercado Libre']), serie)
+
+
+@pytest.mark.parametrize('semilla,repetidos,con_no_texto,grandes', CASOS)
+def test_descuento_igual_a_clean_discount(semilla, repetidos, con_no_texto, grandes):
+    rng = random.Random(200 + semilla)
+    serie = pd.Series(valores(rng, 400, repetidos, con_no_texto, grandes), dtype=object)
+    comparar(clean_discount, parsear_descuento, serie)
+
+
+@pytest.mark.parametrize('semilla,repetidos,con_no_texto,grandes', CASOS)
+def test_vendidos_igual_a_clean_sold(semilla, repetidos, con_no_texto, grandes):
+    rng = random.Random(300 + semilla)
+    serie = pd.Series(valores(rng, 400, repetidos, con_no_texto, grandes), dtype=object)
+    comparar(clean_sold, parsear_vendidos, serie)
+
+
+@pytest.mark.parametrize('serie', [
+    pd.Series([1, 25, 0]),
+    pd.Series([1.5, np.nan, -2.0]),
+    pd.Series([True, False]),
+    pd.Series([], dtype=object),
+])
+def test_columnas_numericas(serie):
+    comparar(clean_price, parsear_precio, serie)
+    comparar(clean_discount, parsear_descuento, serie)
+    comparar(clean_sold, parsear_vendidos, serie)
+
+
+def test_formatos_de_cada_marketplace():
+    assert parsear_precio(pd.Series(['COP13.350,84']), **LOCALES['AliExpress']).tolist() == [13350.84]
+    assert parsear_precio(pd.Series(['84.900', '1.299.000']), **LOCALES['Mercado Libre']).tolist() == [84900, 1299000]
+    assert parsear_precio(pd.Series(['1,299.99']), **LOCALES['Amazon']).tolist() == [1299.99]
+    assert parsear_descuento(pd.Series(['-25%', None])).tolist() == [25, 0]
+    assert parsear_vendidos(pd.Series(['325 sold', '40 K+ comprados el mes pasado', '1.5k'])).tolist() == \
+        [325, 40000, 15000]
+    conteos = parsear_conteo(pd.Series(['2,576', '(1,234)', '300+', None, 'x']), miles=LOCALES['Amazon']['miles'])
+    assert mismos(conteos.tolist(), [2576.0, 1234.0, 300.0, np.nan, np.nan])
+
+
+def test_precio_leido_como_numero_no_se_reinterpreta():
+    # Una columna numérica se devuelve tal cual (como hacía limpiar_precio): si pandas
+    # ya leyó "84.900" como 84.9, el separador de miles se perdió antes de parsear.
+    # Por eso los precios con separadores se leen como texto (dtype={'price': str}).
+    csv = 'price\n84.900\n73.000\n'
+    como_numero = pd.read_csv(io.StringIO(csv))['price']
+    como_texto = pd.read_csv(io.StringIO(csv), dtype={'price': str})['price']
+    assert parsear_precio(como_numero, **LOCALES['Mercado Libre']).tolist() == [84.9, 73.0]
+    assert parsear_precio(como_texto, **LOCALES['Mercado Libre']).tolist() == [84900.0, 73000.0]
@@ -0,0 +1,27 @@
+import os
+import pytest
+from pipeline import MANUALES, RAIZ, Etapa, Pipeline, _rutas, dependencias, etapas
+
+
+def test_ninguna_etapa_escribe_los_datasets_corregidos_a_mano():
+    manuales = {os.path.join(RAIZ, r) for r in MANUALES}
+    for etapa in etapas():
+        assert not manuales & set(_rutas(etapa.salidas)), etapa.nombre
+    # Pero la limpieza sí los lee
+    entradas = {r for e in etapas() for r in _rutas(e.entradas)}
+    assert manuales <= entradas
+
+
+def test_dependencias_rechaza_salidas_protegidas(tmp_path):
+    protegida = str(tmp_path / 'aliexpress_con_categorias.csv')
+    lista = [Etapa('auto', 'Reasignar_nombres.reasignar_nombres', {'entrada': str(tmp_path / 'a.csv')},
+                   {'salida': protegida})]
+    with pytest.raises(ValueError, match='correcciones manuales'):
+        dependencias(lista, [protegida])
+
+
+def test_grafo_de_etapas():
+    previas = dependencias(etapas())
+    assert previas['unir'] == {'limpiar_aliexpress', 'limpiar_amazon', 'limpiar_mercado_libre'}
+    assert previas['limpiar_aliexpress'] == set()
+    assert Pipeline(etapas(), estado=os.devnull).previas == previas